@@ -0,0 +1,89 @@
+"""Approximate top-n cosine search over TF-IDF vectors with truncated impact-ordered postings.
+
+For every term the index keeps only the `depth` documents with the highest
+weight for it. A query is scored exactly against the union of the postings
+of its terms, so its cost grows with `depth` and its number of terms rather
+than with the number of documents. Documents that only share low-weight
+terms with the query can be missed; a larger `depth` raises recall and
+latency.
+"""
+import time
+
+import numpy as np
+
+
+def top_n(scores, n):
+    """Positions of the `n` highest scores, best first, without sorting every score"""
+    if n < len(scores):
+        positions = np.argpartition(-scores, n - 1)[:n]
+    else:
+        positions = np.arange(len(scores))
+    return positions[np.argsort(-scores[positions], kind='stable')]
+
+
+class ImpactIndex:
+    def __init__(self, matrix, depth=100):
+        self.matrix = matrix.tocsr()
+        self.depth = depth
+        columns = matrix.tocsc()
+        terms = np.repeat(np.arange(columns.shape[1]), np.diff(columns.indptr))
+        # Sort each term's postings by weight, highest first, and keep the first `depth`
+        order = np.lexsort((-columns.data, terms))
+        rank = np.arange(len(order)) - columns.indptr[terms[order]]
+        kept = order[rank < depth]
+        self.postings = columns.indices[kept]
+        self.indptr = np.concatenate(([0], np.cumsum(np.minimum(np.diff(columns.indptr), depth))))
+
+    def candidates(self, query):
+        """Row positions in the postings of any term of a (1 x features) query"""
+        hits = [self.postings[self.indptr[term]:self.indptr[term + 1]] for term in query.indices]
+        return np.unique(np.concatenate(hits)) if hits else np.empty(0, dtype=np.int64)
+
+    def query(self, query, n, mask=None):
+        """Approximate top-n `(positions, scores)` with a positive score; `mask` filters rows"""
+        positions = self.candidates(query)
+        if mask is not None:
+            positions = positions[mask[positions]]
+        scores = (self.matrix[positions] @ query.T).toarray().ravel()
+        best = top_n(scores, n)
+        best = best[scores[best] > 0]
+        return positions[best], scores[best]
+
+
+def recall_report(matrix, queries, n=10, depth_options=(25, 50, 100, 200, 500)):
+    """Recall@n and mean latency of the impact index against exact search, for each depth.
+
+    Recall counts an approximate result as correct when it scores at least
+    as well as the exact n-th result, so ties are not penalized.
+    """
+    exact = []
+    started = time.perf_counter()
+    for i in range(queries.shape[0]):
+        scores = (matrix @ queries[i].T).toarray().ravel()
+        best = top_n(scores, n)
+        exact.append(scores[best][scores[best] > 0])
+    report = [{
+        'depth': 'exact',
+        'recall': 1.0,
+        'candidates': float(matrix.shape[0]),
+        'ms_per_query': (time.perf_counter() - started) * 1000 / max(queries.shape[0], 1),
+    }]
+
+    for depth in depth_options:
+        index = ImpactIndex(matrix, depth)
+        found = expected = 0
+        started = time.perf_counter()
+        for i in range(queries.shape[0]):
+            _, scores = index.query(queries[i], n)
+            if len(exact[i]):
+                found += min(int(np.sum(scores >= exact[i][-1] - 1e-9)), len(exact[i]))
+                expected += len(exact[i])
+        elapsed = time.perf_counter() - started
+        candidates = sum(len(index.candidates(queries[i])) for i in range(queries.shape[0]))
+        report.append({
+            'depth': depth,
+            'recall': found / expected if expected else 1.0,
+            'candidates': candidates / max(queries.shape[0], 1),
+            'ms_per_query': elapsed * 1000 / max(queries.shape[0], 1),
+        })
+    return report
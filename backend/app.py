@@ -1,220 +1,410 @@
-from flask import Flask, request, jsonify
+import time
+
+# Module import counts toward worker startup time
+IMPORT_STARTED = time.perf_counter()
+
+from flask import Blueprint, Flask, Response, current_app, request, jsonify
 from flask_cors import CORS
-from supabase import create_client
-from config import SUPABASE_URL, SUPABASE_KEY
+from config import (SUPABASE_URL, SUPABASE_KEY, MATCH_INDEX_TTL, MATCH_SCORES_ENABLED, MATCH_TOP_K, MATCH_FAN_OUT,
+                    EXPLORE_PAGE_SIZE, MATCH_COUNT_TTL, ROW_CACHE_TTL, ROW_CACHE_MAX_ROWS, MEMBERSHIP_CACHE_TTL,
+                    SEMANTIC_MODEL_PATH, SEMANTIC_ANN_DEPTH, SEMANTIC_ANN_TOP_N)
+from cache import MembershipCache, RowCache
+from db import (fetch_all, fetch_in, count_rows, keyset_desc, any_column_contains, any_column_equals, parallel,
+                IN_CHUNK_SIZE)
+from match_index import MatchIndex, INDEXED_TABLES
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pagination import decode_cursor, encode_cursor, parse_limit, top_k
+import matching
+import metrics
+import passwords
+import supabase_pool
+import match_store
+import click
 import jwt
-import bcrypt
 from datetime import datetime, timedelta
 import os 
+import random
+import resource
+import threading
 
-app = Flask(__name__)
-
-# CORS configuration for production and development
-CORS(app, resources={
-    r"/api/*": {
-        "origins": [
-            "http://localhost:5173",
-            "http://localhost:3000",
-            "https://mentora3.onrender.com",
-            "https://*.onrender.com"
-        ],
-        "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"],
-        "supports_credentials": True
-    }
-})
+# Routes and CLI commands; create_app() attaches them to an app
+api = Blueprint('api', __name__, cli_group=None)
 
-# Production config
-supabase = create_client(
+# Production config; each worker opens its own connection pool on its first query
+supabase = metrics.instrument(supabase_pool.WorkerClient(
     os.environ.get('SUPABASE_URL', SUPABASE_URL),
     os.environ.get('SUPABASE_KEY', SUPABASE_KEY)
-)
+))
+
+match_index = MatchIndex(ttl=MATCH_INDEX_TTL)
+
+# Profile and project rows by user_id / id, kept current by this worker's writes
+row_cache = RowCache(ttl=ROW_CACHE_TTL, max_rows=ROW_CACHE_MAX_ROWS)
+PROFILE_KINDS = ('student', 'faculty', 'industry')
+
+# user_id -> {project_id: application or None} and requester_id -> {recipient_id: pending request or None}
+user_applications_cache = MembershipCache(ttl=MEMBERSHIP_CACHE_TTL)
+pending_requests_cache = MembershipCache(ttl=MEMBERSHIP_CACHE_TTL)
+
+# Semantic matcher, loaded from SEMANTIC_MODEL_PATH by the first semantic explore call
+semantic_matcher = None
+semantic_lock = threading.Lock()
+# Writes made while a background refresh builds the next matcher, replayed onto it; None when idle
+semantic_journal = None
+
+# One thread per worker applies writes to stored match lists in order, off the request thread
+fan_out_executor = None
+fan_out_lock = threading.Lock()
+
+# Seconds spent importing this module, in create_app() and in warm_up(), for /api/startup/stats
+startup = {}
+
+# Match counts from recent explore calls, reused by the dashboard: user_id -> (expires_at, count)
+recent_match_counts = OrderedDict()
+RECENT_MATCH_COUNTS_MAX = 10000
+# gthread and gevent workers update it from many requests at once
+recent_match_counts_lock = threading.Lock()
 
 
 # ============================================
 # MATCHING UTILITY FUNCTIONS
 # ============================================
 
-def calc_match_percent(set1, set2):
-    """Calculate percentage match between two lists of strings"""
-    set1 = set(s.lower().strip() for s in (set1 or []) if s)
-    set2 = set(s.lower().strip() for s in (set2 or []) if s)
-    if not set1 or not set2:
-        return 0
-    overlap = set1 & set2
-    if not overlap:
-        return 0
-    score = round((len(overlap) / max(len(set1), len(set2))) * 100)
-    return score
-
-
-def student_to_faculty(student_profile, faculty_profile):
-    """Calculate match score between student and faculty"""
-    skills_score = calc_match_percent(
-        student_profile.get('skills', []),
-        faculty_profile.get('expertise', [])  # Using 'expertise' not 'technical_expertise'
-    )
-    interests_score = calc_match_percent(
-        student_profile.get('interests', []),
-        faculty_profile.get('research_areas', [])
-    )
-    
-    why = []
-    if skills_score > 0:
-        overlap = set(student_profile.get('skills', [])) & set(faculty_profile.get('expertise', []))
-        why.append(f"Skills: {', '.join(overlap)}")
-    if interests_score > 0:
-        overlap = set(student_profile.get('interests', [])) & set(faculty_profile.get('research_areas', []))
-        why.append(f"Interests: {', '.join(overlap)}")
-    
-    match_score = round((skills_score + interests_score) / 2)
-    return {"match": match_score, "why": why}
-
-def student_to_industry(student_profile, industry_profile):
-    """Calculate match score between student and industry mentor"""
-    skills_score = calc_match_percent(
-        student_profile.get('skills', []),
-        industry_profile.get('expertise', [])
-    )
-    interests_score = calc_match_percent(
-        student_profile.get('interests', []),
-        industry_profile.get('mentoring_focus', [])
-    )
-    
-    why = []
-    if skills_score > 0:
-        overlap = set(student_profile.get('skills', [])) & set(industry_profile.get('expertise', []))
-        why.append(f"Skills: {', '.join(overlap)}")
-    if interests_score > 0:
-        overlap = set(student_profile.get('interests', [])) & set(industry_profile.get('mentoring_focus', []))
-        why.append(f"Interests: {', '.join(overlap)}")
-    
-    match_score = round((skills_score + interests_score) / 2)
-    return {"match": match_score, "why": why}
-
-def student_to_project(student_profile, project):
-    """Calculate match score between student and project"""
-    skills_score = calc_match_percent(
-        student_profile.get('skills', []),
-        project.get('required_skills', [])
-    )
-    expertise_score = calc_match_percent(
-        student_profile.get('interests', []),
-        project.get('required_expertise', [])
-    )
-    
-    why = []
-    if skills_score > 0:
-        overlap = set(student_profile.get('skills', [])) & set(project.get('required_skills', []))
-        why.append(f"Skills: {', '.join(overlap)}")
-    if expertise_score > 0:
-        overlap = set(student_profile.get('interests', [])) & set(project.get('required_expertise', []))
-        why.append(f"Interests: {', '.join(overlap)}")
-    
-    match_score = round((skills_score + expertise_score) / 2)
-    return {"match": match_score, "why": why}
-
-def faculty_to_student(faculty_profile, student_profile):
-    """Calculate match score between faculty and student"""
-    expertise_score = calc_match_percent(
-        faculty_profile.get('expertise', []),
-        student_profile.get('skills', [])
-    )
-    research_score = calc_match_percent(
-        faculty_profile.get('research_areas', []),
-        student_profile.get('interests', [])
-    )
-    
-    why = []
-    if expertise_score > 0:
-        overlap = set(faculty_profile.get('expertise', [])) & set(student_profile.get('skills', []))
-        why.append(f"Skills match: {', '.join(overlap)}")
-    if research_score > 0:
-        overlap = set(faculty_profile.get('research_areas', [])) & set(student_profile.get('interests', []))
-        why.append(f"Interest match: {', '.join(overlap)}")
-    
-    match_score = round((expertise_score + research_score) / 2)
-    return {"match": match_score, "why": why}
-
-
-def faculty_to_project(faculty_profile, project):
-    """Calculate match score between faculty and student project"""
-    expertise_score = calc_match_percent(
-        faculty_profile.get('expertise', []),
-        project.get('required_skills', [])
-    )
-    research_score = calc_match_percent(
-        faculty_profile.get('research_areas', []),
-        project.get('required_expertise', [])
-    )
-    
-    why = []
-    if expertise_score > 0:
-        overlap = set(faculty_profile.get('expertise', [])) & set(project.get('required_skills', []))
-        why.append(f"Skills: {', '.join(overlap)}")
-    if research_score > 0:
-        overlap = set(faculty_profile.get('research_areas', [])) & set(project.get('required_expertise', []))
-        why.append(f"Expertise: {', '.join(overlap)}")
-    
-    match_score = round((expertise_score + research_score) / 2)
-    return {"match": match_score, "why": why}
-
-def industry_to_student(industry_profile, student_profile):
-    """Calculate match score between industry mentor and student"""
-    expertise_score = calc_match_percent(
-        industry_profile.get('expertise', []),
-        student_profile.get('skills', [])
-    )
-    focus_score = calc_match_percent(
-        industry_profile.get('mentoring_focus', []),
-        student_profile.get('interests', [])
-    )
-    
-    why = []
-    if expertise_score > 0:
-        overlap = set(industry_profile.get('expertise', [])) & set(student_profile.get('skills', []))
-        why.append(f"Skills match: {', '.join(overlap)}")
-    if focus_score > 0:
-        overlap = set(industry_profile.get('mentoring_focus', [])) & set(student_profile.get('interests', []))
-        why.append(f"Interest match: {', '.join(overlap)}")
-    
-    match_score = round((expertise_score + focus_score) / 2)
-    return {"match": match_score, "why": why}
-
-
-def industry_to_project(industry_profile, project):
-    """Calculate match score between industry mentor and student project"""
-    expertise_score = calc_match_percent(
-        industry_profile.get('expertise', []),
-        project.get('required_skills', [])
-    )
-    focus_score = calc_match_percent(
-        industry_profile.get('mentoring_focus', []),
-        project.get('required_expertise', [])
+def scored_matches(user_type, profile):
+    """(kind, id, match) for each of a profile's matches, without loading candidate rows"""
+    with metrics.unbudgeted():
+        match_index.ensure_built(supabase)
+    return matching.scored_candidates(match_index, user_type, profile)
+
+
+def hydrate_matches(user_type, profile, page, stored_why=None):
+    """Load rows, owners and `why` text for one page of (kind, id, match) matches.
+
+    Returns (kind, candidate row, owner user, match) tuples in page order,
+    skipping candidates deleted or closed since they were scored. `why` comes
+    from `stored_why` when given, otherwise from the pairwise scorer.
+    """
+    kinds = list({kind for kind, _, _ in page})
+    loaded = parallel(*[
+        lambda kind=kind: cached_rows(kind, [entity_id for k, entity_id, _ in page if k == kind])
+        for kind in kinds
+    ])
+    rows = {
+        kind: {row[INDEXED_TABLES[kind][1]]: row for row in kind_rows}
+        for kind, kind_rows in zip(kinds, loaded)
+    }
+
+    owner_ids = {row["creator_id"] if kind == "project" else row["user_id"]
+                 for kind, kind_rows in rows.items() for row in kind_rows.values()}
+    owners = {
+        user.pop("id"): user
+        for user in fetch_in(supabase, 'users', 'id', owner_ids, 'id, full_name, email')
+    }
+
+    hydrated = []
+    for kind, entity_id, score in page:
+        row = rows[kind].get(entity_id)
+        if row is None or matching.is_stale(kind, row, user_type):
+            continue
+        if stored_why is not None:
+            why = stored_why[(kind, entity_id)]
+        else:
+            why = matching.scorer_for(user_type, kind)(profile, row)["why"]
+        match = {"match": score, "why": why}
+        owner = owners.get(row["creator_id"] if kind == "project" else row["user_id"])
+        hydrated.append((kind, row, owner, match))
+    return hydrated
+
+
+def cached_rows(kind, ids):
+    """Full profile or project rows by user_id / id, loading cache misses in one batch"""
+    table, id_col, _ = INDEXED_TABLES[kind]
+    return row_cache.get_many(table, id_col, ids, lambda missing: fetch_in(supabase, table, id_col, missing))
+
+
+def cached_row(kind, entity_id):
+    rows = cached_rows(kind, [entity_id])
+    return rows[0] if rows else None
+
+
+def count_matches(user_type, profile):
+    """Count a profile's matches without loading any candidate rows"""
+    with metrics.unbudgeted():
+        match_index.ensure_built(supabase)
+    return matching.count_matches(match_index, user_type, profile)
+
+
+def remember_match_count(user_id, count):
+    with recent_match_counts_lock:
+        recent_match_counts[user_id] = (time.monotonic() + MATCH_COUNT_TTL, count)
+        recent_match_counts.move_to_end(user_id)
+        while len(recent_match_counts) > RECENT_MATCH_COUNTS_MAX:
+            recent_match_counts.popitem(last=False)
+
+
+def recent_match_count(user_id):
+    """Match count from an explore call in the last MATCH_COUNT_TTL seconds, if any"""
+    with recent_match_counts_lock:
+        entry = recent_match_counts.get(user_id)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def stored_row(kind, entity_id):
+    """The matched columns of a profile or project as Supabase has them now, or None.
+
+    Read just before an update so stored matches are patched from what the
+    write replaced; the index may be up to MATCH_INDEX_TTL seconds behind.
+    Skipped when stored matches are not patched on writes.
+    """
+    if not (MATCH_SCORES_ENABLED and MATCH_FAN_OUT):
+        return None
+    table, id_col, fields = INDEXED_TABLES[kind]
+    columns = [id_col] + fields + (['status', 'creator_type'] if kind == 'project' else [])
+    rows = supabase.table(table).select(', '.join(columns)).eq(id_col, entity_id).execute().data
+    return rows[0] if rows else None
+
+
+def record_write(kind, row=None, entity_id=None, before=None):
+    """Keep cached rows and match state current after a profile or project write.
+
+    `before` is the row as it was before the write, None if the write created it.
+    """
+    table, id_col, _ = INDEXED_TABLES[kind]
+    entity_id = row[id_col] if row is not None else entity_id
+    with semantic_lock:
+        matcher = semantic_matcher
+        if semantic_journal is not None:
+            semantic_journal.append((kind, entity_id, row))
+    if row is not None:
+        row_cache.put(table, row[id_col], row)
+        match_index.upsert(kind, row)
+        if matcher is not None:
+            matcher.upsert(kind, row)
+    else:
+        row_cache.invalidate(table, entity_id)
+        match_index.remove(kind, entity_id)
+        if matcher is not None:
+            matcher.remove(kind, entity_id)
+    # Any user's match count may change, so drop them all
+    with recent_match_counts_lock:
+        recent_match_counts.clear()
+    if MATCH_SCORES_ENABLED and MATCH_FAN_OUT:
+        fan_out_write(kind, entity_id, row, before)
+
+
+def fan_out_write(kind, entity_id, row, before):
+    """Apply a write to the stored match lists in the background; returns the Future"""
+    global fan_out_executor
+
+    def apply():
+        try:
+            match_index.ensure_built(supabase)
+            fan_out = match_store.MatchFanOut(supabase, match_index, cached_rows, top_k=MATCH_TOP_K)
+            return fan_out.apply(kind, entity_id, row, before)
+        except Exception as e:
+            print("Error updating stored matches:", str(e))
+
+    with fan_out_lock:
+        if fan_out_executor is None:
+            fan_out_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='match-fan-out')
+    return fan_out_executor.submit(apply)
+
+
+def user_applications(user_id, project_ids):
+    """{project_id: the user's application to it, or None}, querying only projects not already known"""
+    def load(missing):
+        applications = {}
+        for row in fetch_in(supabase, 'applications', 'project_id', missing, filters={'applicant_id': user_id}):
+            applications.setdefault(row['project_id'], row)
+        return applications
+    return user_applications_cache.get_many(user_id, project_ids, load)
+
+
+def pending_requests(requester_id, recipient_ids):
+    """{recipient_id: the requester's pending mentorship request to them, or None}"""
+    def load(missing):
+        requests = {}
+        for row in fetch_in(supabase, 'mentorship_requests', 'recipient_id', missing,
+                            filters={'requester_id': requester_id, 'status': 'pending'}):
+            requests.setdefault(row['recipient_id'], row)
+        return requests
+    return pending_requests_cache.get_many(requester_id, recipient_ids, load)
+
+
+def get_semantic_matcher():
+    """The fitted semantic matcher, or None if no model has been saved.
+
+    Loaded and synced with Supabase on first use. Once it is older than
+    MATCH_INDEX_TTL, a background thread loads, syncs and indexes a fresh
+    copy and swaps it in; requests keep using the current one until then.
+    """
+    global semantic_matcher, semantic_journal
+    matcher = semantic_matcher
+    if matcher is None:
+        with semantic_lock:
+            if semantic_matcher is None:
+                if not os.path.exists(SEMANTIC_MODEL_PATH):
+                    return None
+                semantic_matcher = load_semantic_matcher()
+            return semantic_matcher
+    if time.monotonic() - matcher.synced_at > MATCH_INDEX_TTL:
+        with semantic_lock:
+            if semantic_journal is None:
+                semantic_journal = []
+                threading.Thread(target=refresh_semantic_matcher, name='semantic-refresh', daemon=True).start()
+    return matcher
+
+
+def load_semantic_matcher():
+    """The saved model with every current profile and open project vectorized and indexed"""
+    import model
+    matcher = model.SemanticMatcher.load(SEMANTIC_MODEL_PATH, ann_depth=SEMANTIC_ANN_DEPTH)
+    with metrics.unbudgeted():
+        matcher.sync(model.fetch_text_rows(supabase))
+    matcher.build_indexes()
+    return matcher
+
+
+def refresh_semantic_matcher():
+    """Build the next matcher off the request path, also picking up a refitted model file"""
+    global semantic_matcher, semantic_journal
+    try:
+        fresh = load_semantic_matcher()
+    except Exception as e:
+        print("Error refreshing semantic matcher:", str(e))
+        with semantic_lock:
+            semantic_journal = None
+        return
+    with semantic_lock:
+        for kind, entity_id, row in semantic_journal:
+            if row is not None:
+                fresh.upsert(kind, row)
+            else:
+                fresh.remove(kind, entity_id)
+        semantic_matcher = fresh
+        semantic_journal = None
+
+
+def stored_matches(user_id):
+    """Precomputed matches for a user, or None when they must be scored live"""
+    if not MATCH_SCORES_ENABLED:
+        return None
+    try:
+        return match_store.read_matches(supabase, user_id)
+    except Exception as e:
+        print("Error reading match store:", str(e))
+        return None
+
+
+@api.cli.command('recompute-matches')
+@click.option('--interval', default=0, help='Seconds between runs; 0 runs once and exits.')
+def recompute_matches_command(interval):
+    """Recompute stored top-K matches for users whose matches may have changed"""
+    recomputer = match_store.MatchRecomputer(supabase, top_k=MATCH_TOP_K)
+    while True:
+        started = time.monotonic()
+        summary = recomputer.run()
+        print(f"Recomputed matches: {summary} in {time.monotonic() - started:.1f}s")
+        if not interval:
+            break
+        time.sleep(interval)
+
+
+@api.cli.command('fit-semantic-model')
+@click.option('--refit', is_flag=True, help='Refit the vocabulary instead of updating the saved model.')
+@click.option('--featurizer', type=click.Choice(['tfidf', 'hashing']), default='tfidf',
+              help='hashing lets workers vectorize unseen terms without a refit; used with --refit or a new model.')
+def fit_semantic_model_command(refit, featurizer):
+    """Fit (or incrementally update) the TF-IDF model used by explore's semantic mode"""
+    import model
+    started = time.monotonic()
+    rows = model.fetch_text_rows(supabase)
+    if refit or not os.path.exists(SEMANTIC_MODEL_PATH):
+        matcher = model.SemanticMatcher.fit(rows, featurizer)
+        transformed = sum(len(kind_rows) for kind_rows in rows.values())
+    else:
+        matcher = model.SemanticMatcher.load(SEMANTIC_MODEL_PATH)
+        transformed = matcher.sync(rows)
+    matcher.save(SEMANTIC_MODEL_PATH)
+    print(f"Saved semantic model to {SEMANTIC_MODEL_PATH}: {transformed} documents vectorized "
+          f"in {time.monotonic() - started:.1f}s")
+
+
+@api.cli.command('semantic-recall')
+@click.option('--kind', default='project', help='Kind of document searched.')
+@click.option('--query-kind', default='student', help='Kind of document used as queries.')
+@click.option('--top-n', default=10, help='Results per query.')
+@click.option('--depths', default='25,50,100,200,500', help='Comma-separated postings depths to compare.')
+@click.option('--queries', default=200, help='Number of query documents sampled.')
+def semantic_recall_command(kind, query_kind, top_n, depths, queries):
+    """Compare approximate semantic search with exact cosine search on the saved model"""
+    import ann
+    import model
+    matcher = model.SemanticMatcher.load(SEMANTIC_MODEL_PATH)
+    query_matrix = matcher.vectors[query_kind].matrix
+    sample = sorted(random.Random(0).sample(range(query_matrix.shape[0]), min(queries, query_matrix.shape[0])))
+    report = ann.recall_report(
+        matcher.vectors[kind].matrix, query_matrix[sample], top_n,
+        [int(depth) for depth in depths.split(',')]
     )
-    
-    why = []
-    if expertise_score > 0:
-        overlap = set(industry_profile.get('expertise', [])) & set(project.get('required_skills', []))
-        why.append(f"Skills: {', '.join(overlap)}")
-    if focus_score > 0:
-        overlap = set(industry_profile.get('mentoring_focus', [])) & set(project.get('required_expertise', []))
-        why.append(f"Expertise: {', '.join(overlap)}")
-    
-    match_score = round((expertise_score + focus_score) / 2)
-    return {"match": match_score, "why": why}
+    print(f"{query_kind} -> {kind}: {matcher.vectors[kind].matrix.shape[0]} documents, "
+          f"{len(sample)} queries, recall@{top_n}")
+    for row in report:
+        print(f"  depth={row['depth']!s:>5} recall={row['recall']:.3f} "
+              f"candidates={row['candidates']:.0f} {row['ms_per_query']:.2f}ms/query")
 
 
 # ============================================
 # HEALTH & TEST ENDPOINTS
 # ============================================
 
-@app.route('/api/health', methods=['GET'])
+@api.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'OK', 'service': 'Mentora API'})
 
 
-@app.route('/api/test-db', methods=['GET'])
+@api.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Cache counters for this worker"""
+    return jsonify({'status': 'success', 'data': {
+        'rows': row_cache.stats(),
+        'applications': user_applications_cache.stats(),
+        'mentorship_requests': pending_requests_cache.stats(),
+    }})
+
+
+@api.route('/api/passwords/stats', methods=['GET'])
+def password_stats():
+    """Password hashing counts and latency for this worker"""
+    return jsonify({'status': 'success', 'data': passwords.stats()})
+
+
+@api.route('/api/supabase/stats', methods=['GET'])
+def supabase_stats():
+    """PostgREST connection pool use for this worker"""
+    return jsonify({'status': 'success', 'data': getattr(supabase, 'pool_stats', dict)()})
+
+
+@api.route('/api/startup/stats', methods=['GET'])
+def startup_stats():
+    """How long this worker took to start, and its peak memory so far"""
+    # ru_maxrss is in kilobytes on Linux
+    return jsonify({'status': 'success', 'data': {
+        **startup,
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }})
+
+
+@api.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Request latency and Supabase call metrics for this worker, in Prometheus text format"""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
+@api.route('/api/test-db', methods=['GET'])
 def test_database():
     try:
         result = supabase.table('users').select('*').limit(1).execute()
@@ -234,7 +424,7 @@ def test_database():
 # AUTHENTICATION ENDPOINTS
 # ============================================
 
-@app.route('/api/register', methods=['POST'])
+@api.route('/api/register', methods=['POST'])
 def register():
     try:
         data = request.json
@@ -244,7 +434,7 @@ def register():
         user_type = data.get('user_type')  # student, faculty, industry
         
         # Hash password
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        password_hash = passwords.hash_password(password)
         
         # Insert user
         result = supabase.table('users').insert({
@@ -262,7 +452,7 @@ def register():
             'email': email,
             'user_type': user_type,
             'exp': datetime.utcnow() + timedelta(days=7)
-        }, app.config.get('JWT_SECRET', 'your-secret'), algorithm='HS256')
+        }, current_app.config.get('JWT_SECRET', 'your-secret'), algorithm='HS256')
         
         return jsonify({
             'status': 'success',
@@ -276,6 +466,8 @@ def register():
             }
         }), 201
         
+    except passwords.PasswordPoolBusy as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -283,7 +475,7 @@ def register():
         }), 400
 
 
-@app.route('/api/login', methods=['POST'])
+@api.route('/api/login', methods=['POST'])
 def login():
     try:
         data = request.json
@@ -299,16 +491,25 @@ def login():
         user = result.data[0]
         
         # Check password
-        if not bcrypt.checkpw(password.encode('utf-8'), user['password_hash'].encode('utf-8')):
+        if not passwords.verify_password(password, user['password_hash']):
             return jsonify({'status': 'error', 'message': 'Invalid credentials'}), 401
         
+        # Upgrade the stored hash if BCRYPT_ROUNDS changed since it was made
+        if passwords.needs_rehash(user['password_hash']):
+            try:
+                supabase.table('users').update({
+                    'password_hash': passwords.hash_password(password)
+                }).eq('id', user['id']).execute()
+            except Exception as e:
+                print("Error rehashing password:", str(e))
+        
         # Generate JWT token
         token = jwt.encode({
             'user_id': user['id'],
             'email': user['email'],
             'user_type': user['user_type'],
             'exp': datetime.utcnow() + timedelta(days=7)
-        }, app.config.get('JWT_SECRET', 'your-secret'), algorithm='HS256')
+        }, current_app.config.get('JWT_SECRET', 'your-secret'), algorithm='HS256')
         
         return jsonify({
             'status': 'success',
@@ -322,6 +523,8 @@ def login():
             }
         })
         
+    except passwords.PasswordPoolBusy as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -333,7 +536,7 @@ def login():
 # PROFILE ENDPOINTS
 # ============================================
 
-@app.route('/api/profile/student', methods=['POST'])
+@api.route('/api/profile/student', methods=['POST'])
 def create_student_profile():
     try:
         data = request.json
@@ -356,6 +559,7 @@ def create_student_profile():
         }
         
         result = supabase.table('student_profiles').insert(profile_data).execute()
+        record_write('student', result.data[0])
         
         return jsonify({
             'status': 'success',
@@ -370,7 +574,7 @@ def create_student_profile():
         }), 400
 
 
-@app.route('/api/profile/faculty', methods=['POST'])
+@api.route('/api/profile/faculty', methods=['POST'])
 def create_faculty_profile():
     try:
         data = request.json
@@ -394,6 +598,7 @@ def create_faculty_profile():
         }
         
         result = supabase.table('faculty_profiles').insert(profile_data).execute()
+        record_write('faculty', result.data[0])
         
         return jsonify({
             'status': 'success',
@@ -408,7 +613,7 @@ def create_faculty_profile():
         }), 400
 
 
-@app.route('/api/profile/industry', methods=['POST'])
+@api.route('/api/profile/industry', methods=['POST'])
 def create_industry_profile():
     try:
         data = request.json
@@ -431,6 +636,7 @@ def create_industry_profile():
         }
         
         result = supabase.table('industry_profiles').insert(profile_data).execute()
+        record_write('industry', result.data[0])
         
         return jsonify({
             'status': 'success',
@@ -445,16 +651,21 @@ def create_industry_profile():
         }), 400
 
 
-@app.route('/api/profile/<user_type>/<user_id>', methods=['GET'])
+@api.route('/api/profile/<user_type>/<user_id>', methods=['GET'])
+@metrics.query_budget(2)
 def get_profile(user_type, user_id):
     try:
-        table_name = f"{user_type}_profiles"
-        result = supabase.table(table_name).select('*').eq('user_id', user_id).execute()
+        if user_type in PROFILE_KINDS:
+            profile = cached_row(user_type, user_id)
+        else:
+            table_name = f"{user_type}_profiles"
+            result = supabase.table(table_name).select('*').eq('user_id', user_id).execute()
+            profile = result.data[0] if result.data else None
         
-        if result.data:
+        if profile:
             return jsonify({
                 'status': 'success',
-                'data': result.data[0]
+                'data': profile
             })
         else:
             return jsonify({
@@ -473,141 +684,118 @@ def get_profile(user_type, user_id):
 # EXPLORE / MATCHING ENDPOINT
 # ============================================
 
-@app.route('/api/explore', methods=['GET'])
+@api.route('/api/explore', methods=['GET'])
+# A page of at most 100 matches hydrates in one query per candidate kind plus one for owners
+@metrics.query_budget(7)
 def explore():
     try:
         user_id = request.args.get("user_id")
         if not user_id:
             return jsonify({"status": "error", "message": "Missing user_id parameter"}), 400
-
-        # Get user info
-        user_result = supabase.table('users').select('*').eq('id', user_id).execute()
+        mode = request.args.get("mode", "skills")
+        if mode not in ("skills", "semantic"):
+            return jsonify({"status": "error", "message": "mode must be 'skills' or 'semantic'"}), 400
+        try:
+            limit = parse_limit(request.args.get("limit"), default=EXPLORE_PAGE_SIZE, maximum=100)
+            min_score = max(int(request.args.get("min_score", 1)), 1)
+            after = decode_cursor(request.args["cursor"]) if request.args.get("cursor") else None
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        # Get user info, and any precomputed matches alongside it
+        user_result, stored = parallel(
+            lambda: supabase.table('users').select('*').eq('id', user_id).execute(),
+            lambda: stored_matches(user_id) if mode == "skills" else None,
+        )
         if not user_result.data:
             return jsonify({"status": "error", "message": "User not found"}), 404
         
         user = user_result.data[0]
         user_type = user["user_type"]
 
-        # Get user's profile
-        profile_result = supabase.table(f"{user_type}_profiles").select('*').eq('user_id', user_id).execute()
-        if not profile_result.data:
-            return jsonify({"status": "error", "message": "Profile not found"}), 404
-        
-        profile = profile_result.data[0]
+        def paged(scored):
+            # Ties are broken by candidate kind then id, so paging is deterministic
+            return top_k((s for s in scored if s[2] >= min_score), matching.match_sort_key(user_type), limit, after)
+
+        def counted(scored):
+            """Matches the cursor can reach, i.e. those scoring at least min_score"""
+            return sum(1 for s in scored if s[2] >= min_score)
+
+        profile = None
+        stored_why = None
+        if mode == "semantic":
+            matcher = get_semantic_matcher()
+            if matcher is None:
+                return jsonify({"status": "error", "message": "Semantic matching is not available"}), 503
+            profile = cached_row(user_type, user_id)
+            if not profile:
+                return jsonify({"status": "error", "message": "Profile not found"}), 404
+            # Approximate search ranks only the top SEMANTIC_ANN_TOP_N of each kind
+            scored = matching.semantic_candidates(
+                matcher, user_type, profile, SEMANTIC_ANN_TOP_N if SEMANTIC_ANN_DEPTH else None
+            )
+            total = counted(scored)
+            page, next_cursor = paged(scored)
+        else:
+            page = None
+            if stored:
+                stored_scored = [(m["type"], m["id"], m["match"]) for m in stored["matches"]]
+                if min_score == 1:
+                    total = stored["match_count"]
+                elif (stored["match_count"] <= len(stored_scored)
+                      or (stored_scored and min(s[2] for s in stored_scored) < min_score)):
+                    # Only the top MATCH_TOP_K are stored; they hold every match scoring
+                    # min_score or more once the lowest of them is below it
+                    total = counted(stored_scored)
+                else:
+                    total = None
+                if total is not None:
+                    page, next_cursor = paged(stored_scored)
+                    stored_why = {(m["type"], m["id"]): m["why"] for m in stored["matches"]}
+                    # A page running past the stored matches is scored live,
+                    # and the live sort order continues from the same cursor
+                    if next_cursor is None and total > counted(stored_scored):
+                        page, stored_why = None, None
+            if page is None:
+                # Get user's profile
+                profile = cached_row(user_type, user_id)
+                if not profile:
+                    return jsonify({"status": "error", "message": "Profile not found"}), 404
+                scored = scored_matches(user_type, profile)
+                total = counted(scored)
+                page, next_cursor = paged(scored)
+            if min_score == 1:
+                # The dashboard counts every skill match
+                remember_match_count(user_id, total)
+
         results = []
 
-        # STUDENT MATCHING: Show faculty, industry mentors, AND projects
-        if user_type == "student":
-            # Match with Faculty
-            faculty_profiles = supabase.table("faculty_profiles").select('*').execute().data or []
-            for faculty in faculty_profiles:
-                match = student_to_faculty(profile, faculty)
-                if match["match"] > 0:
-                    faculty_user = supabase.table('users').select('full_name, email').eq('id', faculty['user_id']).execute()
-                    results.append({
-                        "type": "faculty",
-                        "profile": faculty,
-                        "user": faculty_user.data[0] if faculty_user.data else None,
-                        "match": match["match"],
-                        "why": match["why"]
-                    })
-            
-            # Match with Industry Mentors
-            industry_profiles = supabase.table("industry_profiles").select('*').execute().data or []
-            for industry in industry_profiles:
-                match = student_to_industry(profile, industry)
-                if match["match"] > 0:
-                    industry_user = supabase.table('users').select('full_name, email').eq('id', industry['user_id']).execute()
-                    results.append({
-                        "type": "industry",
-                        "profile": industry,
-                        "user": industry_user.data[0] if industry_user.data else None,
-                        "match": match["match"],
-                        "why": match["why"]
-                    })
-            
-            # Match with Projects (Faculty & Industry)
-            projects = supabase.table("projects").select('*').eq('status', 'open').execute().data or []
-            for project in projects:
-                if project['creator_type'] in ['faculty', 'industry']:
-                    match = student_to_project(profile, project)
-                    if match["match"] > 0:
-                        creator = supabase.table('users').select('full_name, email').eq('id', project['creator_id']).execute()
-                        results.append({
-                            "type": "project",
-                            "project": project,
-                            "creator": creator.data[0] if creator.data else None,
-                            "match": match["match"],
-                            "why": match["why"]
-                        })
-
-        # FACULTY MATCHING: Show students and student projects
-        elif user_type == "faculty":
-            # Match with Students
-            student_profiles = supabase.table("student_profiles").select('*').execute().data or []
-            for student in student_profiles:
-                match = faculty_to_student(profile, student)
-                if match["match"] > 0:
-                    student_user = supabase.table('users').select('full_name, email').eq('id', student['user_id']).execute()
-                    results.append({
-                        "type": "student",
-                        "profile": student,
-                        "user": student_user.data[0] if student_user.data else None,
-                        "match": match["match"],
-                        "why": match["why"]
-                    })
-            
-            # Match with Student Projects
-            projects = supabase.table("projects").select('*').eq('status', 'open').eq('creator_type', 'student').execute().data or []
-            for project in projects:
-                match = faculty_to_project(profile, project)
-                if match["match"] > 0:
-                    creator = supabase.table('users').select('full_name, email').eq('id', project['creator_id']).execute()
-                    results.append({
-                        "type": "project",
-                        "project": project,
-                        "creator": creator.data[0] if creator.data else None,
-                        "match": match["match"],
-                        "why": match["why"]
-                    })
-
-        # INDUSTRY MATCHING: Show students and student projects - NEW!
-        elif user_type == "industry":
-            # Match with Students
-            student_profiles = supabase.table("student_profiles").select('*').execute().data or []
-            for student in student_profiles:
-                match = industry_to_student(profile, student)
-                if match["match"] > 0:
-                    student_user = supabase.table('users').select('full_name, email').eq('id', student['user_id']).execute()
-                    results.append({
-                        "type": "student",
-                        "profile": student,
-                        "user": student_user.data[0] if student_user.data else None,
-                        "match": match["match"],
-                        "why": match["why"]
-                    })
-            
-            # Match with Student Projects
-            projects = supabase.table("projects").select('*').eq('status', 'open').eq('creator_type', 'student').execute().data or []
-            for project in projects:
-                match = industry_to_project(profile, project)
-                if match["match"] > 0:
-                    creator = supabase.table('users').select('full_name, email').eq('id', project['creator_id']).execute()
-                    results.append({
-                        "type": "project",
-                        "project": project,
-                        "creator": creator.data[0] if creator.data else None,
-                        "match": match["match"],
-                        "why": match["why"]
-                    })
-
-        # Sort by match score (highest first)
-        results.sort(key=lambda r: -r["match"])
-        
+        # Students see faculty, industry mentors and faculty/industry projects;
+        # faculty and industry mentors see students and student projects
+        for kind, candidate, owner, match in hydrate_matches(user_type, profile, page, stored_why):
+            if kind == "project":
+                results.append({
+                    "type": "project",
+                    "project": candidate,
+                    "creator": owner,
+                    "match": match["match"],
+                    "why": match["why"]
+                })
+            else:
+                results.append({
+                    "type": kind,
+                    "profile": candidate,
+                    "user": owner,
+                    "match": match["match"],
+                    "why": match["why"]
+                })
+
         return jsonify({
             "status": "success",
             "user_type": user_type,
-            "results": results
+            "results": results,
+            "total": total,
+            "next_cursor": next_cursor
         })
         
     except Exception as e:
@@ -624,7 +812,7 @@ def explore():
 # PROJECT ENDPOINTS
 # ============================================
 
-@app.route('/api/projects', methods=['POST'])
+@api.route('/api/projects', methods=['POST'])
 def create_project():
     try:
         data = request.json
@@ -654,6 +842,7 @@ def create_project():
         result = supabase.table('projects').insert(project_data).execute()
         
         print("Insert result:", result)
+        record_write('project', result.data[0])
         
         return jsonify({
             'status': 'success',
@@ -672,14 +861,47 @@ def create_project():
         }), 400
 
 
-@app.route('/api/projects', methods=['GET'])
+# Columns a list view may ask for with `fields=`
+PROJECT_FIELDS = [
+    'id', 'title', 'description', 'creator_id', 'creator_type', 'project_type',
+    'required_skills', 'required_expertise', 'student_count_needed', 'duration',
+    'time_commitment_hours', 'start_date', 'goals', 'deliverables',
+    'resources_available', 'domain', 'status', 'created_at', 'updated_at'
+]
+# Columns the `search` parameter of GET /api/projects looks in
+PROJECT_SEARCH_COLUMNS = ['title', 'description', 'domain']
+
+# (expiry, sorted domains of open projects)
+project_domains = (0.0, [])
+
+
+@api.route('/api/projects', methods=['GET'])
+@metrics.query_budget(2)
 def get_projects():
     try:
         creator_type = request.args.get('creator_type')
         status = request.args.get('status')
         domain = request.args.get('domain')
-        
-        query = supabase.table('projects').select('*')
+        search = request.args.get('search', '').strip()
+        fields = request.args.get('fields')
+        
+        try:
+            limit = parse_limit(request.args.get('limit'), maximum=100)
+            after = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        
+        columns = '*'
+        if fields:
+            requested = [f.strip() for f in fields.split(',') if f.strip()]
+            unknown = [f for f in requested if f not in PROJECT_FIELDS]
+            if unknown:
+                return jsonify({'status': 'error', 'message': f"Unknown fields: {', '.join(unknown)}"}), 400
+            # The cursor is built from created_at and id, so always return them
+            columns = ', '.join(dict.fromkeys(['id', 'created_at'] + requested))
+        
+        # The total only means something before the keyset filter, so the first page carries it
+        query = supabase.table('projects').select(columns, count=None if after else 'estimated')
         
         if creator_type:
             query = query.eq('creator_type', creator_type)
@@ -687,12 +909,25 @@ def get_projects():
             query = query.eq('status', status)
         if domain:
             query = query.eq('domain', domain)
-            
-        result = query.order('created_at', desc=True).execute()
+        if search:
+            query = any_column_contains(query, PROJECT_SEARCH_COLUMNS, search)
+        
+        query = keyset_desc(query, 'created_at', 'id', after)
+        if limit:
+            query = query.limit(limit + 1)
+        result = query.execute()
+        
+        projects = result.data
+        next_cursor = None
+        if limit and len(projects) > limit:
+            projects = projects[:limit]
+            next_cursor = encode_cursor((projects[-1]['created_at'], projects[-1]['id']))
         
         return jsonify({
             'status': 'success',
-            'data': result.data
+            'data': projects,
+            'total': result.count,
+            'next_cursor': next_cursor
         })
         
     except Exception as e:
@@ -702,15 +937,37 @@ def get_projects():
         }), 400
 
 
-@app.route('/api/projects/<project_id>', methods=['GET'])
+@api.route('/api/projects/domains', methods=['GET'])
+def get_project_domains():
+    """Distinct domains of open projects, for the browse page's domain filter"""
+    global project_domains
+    try:
+        expires, domains = project_domains
+        if time.monotonic() >= expires:
+            # Shared by every request on this worker, like the match index
+            with metrics.unbudgeted():
+                rows = fetch_all(lambda: supabase.table('projects').select('id, domain').eq('status', 'open').order('id'))
+            domains = sorted({row['domain'] for row in rows if row.get('domain')})
+            project_domains = (time.monotonic() + ROW_CACHE_TTL, domains)
+        return jsonify({'status': 'success', 'data': domains})
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+
+
+@api.route('/api/projects/<project_id>', methods=['GET'])
+@metrics.query_budget(2)
 def get_project(project_id):
     try:
-        result = supabase.table('projects').select('*').eq('id', project_id).execute()
+        project = cached_row('project', project_id)
         
-        if result.data:
+        if project:
             return jsonify({
                 'status': 'success',
-                'data': result.data[0]
+                'data': project
             })
         else:
             return jsonify({
@@ -725,14 +982,26 @@ def get_project(project_id):
         }), 400
 
 
-@app.route('/api/projects/user/<user_id>', methods=['GET'])
+@api.route('/api/projects/user/<user_id>', methods=['GET'])
+@metrics.query_budget(2)
 def get_user_projects(user_id):
+    """A user's projects; `with_stats=true` adds each one's `application_stats` in the same query"""
     try:
-        result = supabase.table('projects').select('*').eq('creator_id', user_id).order('created_at', desc=True).execute()
+        with_stats = request.args.get('with_stats', '').lower() in ('1', 'true')
+        if with_stats:
+            query = with_application_stats(supabase.table('projects').select(application_stats_columns('*')))
+        else:
+            query = supabase.table('projects').select('*')
+        result = query.eq('creator_id', user_id).order('created_at', desc=True).execute()
+        
+        projects = result.data or []
+        if with_stats:
+            for project in projects:
+                project['application_stats'] = pop_application_stats(project)
         
         return jsonify({
             'status': 'success',
-            'data': result.data
+            'data': projects
         })
         
     except Exception as e:
@@ -742,7 +1011,8 @@ def get_user_projects(user_id):
         }), 400
 
 
-@app.route('/api/projects/<project_id>/owner', methods=['GET'])
+@api.route('/api/projects/<project_id>/owner', methods=['GET'])
+@metrics.query_budget(3)
 def get_project_owner(project_id):
     try:
         project = supabase.table('projects').select('creator_id, creator_type').eq('id', project_id).execute()
@@ -755,19 +1025,13 @@ def get_project_owner(project_id):
         
         user = supabase.table('users').select('full_name, email, user_type').eq('id', creator_id).execute()
         
-        profile = None
-        if creator_type == 'student':
-            profile = supabase.table('student_profiles').select('*').eq('user_id', creator_id).execute()
-        elif creator_type == 'faculty':
-            profile = supabase.table('faculty_profiles').select('*').eq('user_id', creator_id).execute()
-        elif creator_type == 'industry':
-            profile = supabase.table('industry_profiles').select('*').eq('user_id', creator_id).execute()
+        profile = cached_row(creator_type, creator_id) if creator_type in PROFILE_KINDS else None
         
         return jsonify({
             'status': 'success',
             'data': {
                 'user': user.data[0] if user.data else None,
-                'profile': profile.data[0] if profile and profile.data else None
+                'profile': profile
             }
         })
         
@@ -782,7 +1046,7 @@ def get_project_owner(project_id):
         }), 400
 
 
-@app.route('/api/projects/<project_id>', methods=['PUT'])
+@api.route('/api/projects/<project_id>', methods=['PUT'])
 def update_project(project_id):
     try:
         data = request.json
@@ -800,7 +1064,10 @@ def update_project(project_id):
         
         update_data['updated_at'] = 'now()'
         
+        before = stored_row('project', project_id)
         result = supabase.table('projects').update(update_data).eq('id', project_id).execute()
+        if result.data:
+            record_write('project', result.data[0], before=before)
         
         return jsonify({
             'status': 'success',
@@ -819,12 +1086,14 @@ def update_project(project_id):
         }), 400
 
 
-@app.route('/api/projects/<project_id>', methods=['DELETE'])
+@api.route('/api/projects/<project_id>', methods=['DELETE'])
 def delete_project(project_id):
     try:
         print("Deleting project:", project_id)
         
+        # PostgREST returns the deleted row, which is what the write replaced
         result = supabase.table('projects').delete().eq('id', project_id).execute()
+        record_write('project', entity_id=project_id, before=result.data[0] if result.data else None)
         
         return jsonify({
             'status': 'success',
@@ -842,16 +1111,44 @@ def delete_project(project_id):
         }), 400
 
 
-@app.route('/api/projects/<project_id>/stats', methods=['GET'])
+APPLICATION_STAT_STATUSES = ('pending', 'accepted', 'rejected')
+
+
+def application_stats_columns(columns='id'):
+    """`columns` plus embedded application counts, one aliased `applications(count)` per status.
+
+    PostgREST computes the counts, so no application rows are transferred.
+    """
+    counts = ['total:applications(count)'] + [f'{status}:applications(count)' for status in APPLICATION_STAT_STATUSES]
+    return ', '.join([columns] + counts)
+
+
+def with_application_stats(query):
+    """Restrict each per-status embedded count to its status"""
+    for status in APPLICATION_STAT_STATUSES:
+        query = query.eq(f'{status}.status', status)
+    return query
+
+
+def pop_application_stats(project):
+    """Move the embedded counts of a project row into a stats dict"""
+    stats = {}
+    for name in ('total',) + APPLICATION_STAT_STATUSES:
+        embedded = project.pop(name, None) or [{}]
+        stats[name] = embedded[0].get('count', 0)
+    return stats
+
+
+@api.route('/api/projects/<project_id>/stats', methods=['GET'])
+@metrics.query_budget(1)
 def get_project_stats(project_id):
     try:
-        applications = supabase.table('applications').select('status').eq('project_id', project_id).execute()
+        project = with_application_stats(
+            supabase.table('projects').select(application_stats_columns())
+        ).eq('id', project_id).execute()
         
-        stats = {
-            'total': len(applications.data),
-            'pending': len([a for a in applications.data if a['status'] == 'pending']),
-            'accepted': len([a for a in applications.data if a['status'] == 'accepted']),
-            'rejected': len([a for a in applications.data if a['status'] == 'rejected'])
+        stats = pop_application_stats(project.data[0]) if project.data else {
+            'total': 0, 'pending': 0, 'accepted': 0, 'rejected': 0
         }
         
         return jsonify({
@@ -870,11 +1167,46 @@ def get_project_stats(project_id):
         }), 400
 
 
+@api.route('/api/projects/stats', methods=['POST'])
+@metrics.query_budget(1)
+def get_projects_stats():
+    """Application status counts for all of a creator's projects or for a list of project ids"""
+    try:
+        data = request.json or {}
+        creator_id = data.get('creator_id')
+        project_ids = data.get('project_ids')
+        if not creator_id and not isinstance(project_ids, list):
+            return jsonify({'status': 'error', 'message': 'creator_id or a project_ids list is required'}), 400
+        if not creator_id and len(project_ids) > IN_CHUNK_SIZE:
+            return jsonify({'status': 'error', 'message': f'At most {IN_CHUNK_SIZE} project_ids per request'}), 400
+        
+        columns = application_stats_columns()
+        if creator_id:
+            projects = with_application_stats(
+                supabase.table('projects').select(columns)
+            ).eq('creator_id', creator_id).execute().data or []
+        else:
+            filters = {f'{status}.status': status for status in APPLICATION_STAT_STATUSES}
+            projects = fetch_in(supabase, 'projects', 'id', project_ids, columns, filters=filters)
+        
+        return jsonify({
+            'status': 'success',
+            'data': {project['id']: pop_application_stats(project) for project in projects}
+        })
+        
+    except Exception as e:
+        print("Error fetching project stats:", str(e))
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+
+
 # ============================================
 # APPLICATION ENDPOINTS
 # ============================================
 
-@app.route('/api/applications', methods=['POST'])
+@api.route('/api/applications', methods=['POST'])
 def create_application():
     try:
         data = request.json
@@ -896,6 +1228,8 @@ def create_application():
         result = supabase.table('applications').insert(application_data).execute()
         
         print("Insert result:", result) 
+        application = result.data[0]
+        user_applications_cache.put(application['applicant_id'], application['project_id'], application)
         
         return jsonify({
             'status': 'success',
@@ -914,7 +1248,8 @@ def create_application():
         }), 400
 
 
-@app.route('/api/applications/user/<user_id>', methods=['GET'])
+@api.route('/api/applications/user/<user_id>', methods=['GET'])
+@metrics.query_budget(2)
 def get_user_applications(user_id):
     try:
         result = supabase.table('applications').select('*').eq('applicant_id', user_id).order('applied_at', desc=True).execute()
@@ -931,36 +1266,56 @@ def get_user_applications(user_id):
         }), 400
 
 
-@app.route('/api/applications/project/<project_id>', methods=['GET'])
+@api.route('/api/applications/project/<project_id>', methods=['GET'])
+@metrics.query_budget(5)
 def get_project_applications(project_id):
     try:
-        applications = supabase.table('applications').select('*').eq('project_id', project_id).order('applied_at', desc=True).execute()
+        status = request.args.get('status')
+        try:
+            limit = parse_limit(request.args.get('limit'), default=50, maximum=100)
+            after = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
         
-        applications_with_users = []
-        for app in applications.data:
-            applicant_id = app['applicant_id']
-            applicant_type = app['applicant_type']
-            
-            user = supabase.table('users').select('full_name, email, user_type').eq('id', applicant_id).execute()
-            
-            profile = None
-            if applicant_type == 'student':
-                profile = supabase.table('student_profiles').select('*').eq('user_id', applicant_id).execute()
-            elif applicant_type == 'faculty':
-                profile = supabase.table('faculty_profiles').select('*').eq('user_id', applicant_id).execute()
-            elif applicant_type == 'industry':
-                profile = supabase.table('industry_profiles').select('*').eq('user_id', applicant_id).execute()
-            
-            app_data = {
+        query = supabase.table('applications').select('*').eq('project_id', project_id)
+        if status:
+            query = query.eq('status', status)
+        query = keyset_desc(query, 'applied_at', 'id', after)
+        if limit:
+            query = query.limit(limit + 1)
+        applications = query.execute().data or []
+        
+        next_cursor = None
+        if limit and len(applications) > limit:
+            applications = applications[:limit]
+            next_cursor = encode_cursor((applications[-1]['applied_at'], applications[-1]['id']))
+        
+        # One users query plus one profile query per applicant type, however many applicants there are
+        applicant_types = ('student', 'faculty', 'industry')
+        applicant_ids = {t: {a['applicant_id'] for a in applications if a['applicant_type'] == t} for t in applicant_types}
+        user_rows, *profile_rows = parallel(
+            lambda: fetch_in(supabase, 'users', 'id', {a['applicant_id'] for a in applications}, 'id, full_name, email, user_type'),
+            *[lambda t=t: cached_rows(t, applicant_ids[t]) for t in applicant_types]
+        )
+        users = {user.pop('id'): user for user in user_rows}
+        profiles = {
+            (t, profile['user_id']): profile
+            for t, rows in zip(applicant_types, profile_rows) for profile in rows
+        }
+        
+        applications_with_users = [
+            {
                 **app,
-                'applicant': user.data[0] if user.data else None,
-                'applicant_profile': profile.data[0] if profile and profile.data else None
+                'applicant': users.get(app['applicant_id']),
+                'applicant_profile': profiles.get((app['applicant_type'], app['applicant_id']))
             }
-            applications_with_users.append(app_data)
+            for app in applications
+        ]
         
         return jsonify({
             'status': 'success',
-            'data': applications_with_users
+            'data': applications_with_users,
+            'next_cursor': next_cursor
         })
         
     except Exception as e:
@@ -974,13 +1329,16 @@ def get_project_applications(project_id):
         }), 400
 
 
-@app.route('/api/applications/<application_id>/status', methods=['PUT'])
+@api.route('/api/applications/<application_id>/status', methods=['PUT'])
 def update_application_status(application_id):
     try:
         data = request.json
         status = data.get('status')
         
         result = supabase.table('applications').update({'status': status}).eq('id', application_id).execute()
+        if result.data:
+            application = result.data[0]
+            user_applications_cache.put(application['applicant_id'], application['project_id'], application)
         
         return jsonify({
             'status': 'success',
@@ -995,16 +1353,17 @@ def update_application_status(application_id):
         }), 400
 
 
-@app.route('/api/applications/check/<project_id>/<user_id>', methods=['GET'])
+@api.route('/api/applications/check/<project_id>/<user_id>', methods=['GET'])
+@metrics.query_budget(1)
 def check_existing_application(project_id, user_id):
     try:
-        existing = supabase.table('applications').select('*').eq('project_id', project_id).eq('applicant_id', user_id).execute()
+        application = user_applications(user_id, [project_id])[project_id]
         
-        if existing.data and len(existing.data) > 0:
+        if application:
             return jsonify({
                 'status': 'success',
                 'exists': True,
-                'application': existing.data[0]
+                'application': application
             })
         else:
             return jsonify({
@@ -1023,11 +1382,37 @@ def check_existing_application(project_id, user_id):
             'message': str(e)
         }), 400
 
+
+@api.route('/api/applications/check', methods=['POST'])
+@metrics.query_budget(1)
+def check_existing_applications():
+    """Which of many projects a user has applied to, e.g. for every card on a browse page"""
+    try:
+        data = request.json or {}
+        user_id = data.get('user_id')
+        project_ids = data.get('project_ids')
+        if not user_id or not isinstance(project_ids, list):
+            return jsonify({'status': 'error', 'message': 'user_id and a project_ids list are required'}), 400
+        if len(project_ids) > IN_CHUNK_SIZE:
+            return jsonify({'status': 'error', 'message': f'At most {IN_CHUNK_SIZE} project_ids per request'}), 400
+        
+        return jsonify({
+            'status': 'success',
+            'data': user_applications(user_id, project_ids)
+        })
+        
+    except Exception as e:
+        print("Error checking applications:", str(e))
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+
 # ============================================
 # MENTORSHIP REQUEST ENDPOINTS
 # ============================================
 
-@app.route('/api/mentorship-requests', methods=['POST'])
+@api.route('/api/mentorship-requests', methods=['POST'])
 def create_mentorship_request():
     """Create a new mentorship request"""
     try:
@@ -1059,6 +1444,8 @@ def create_mentorship_request():
             'request_type': data['request_type'],
             'message': data.get('message', '')
         }).execute()
+        if result.data:
+            pending_requests_cache.put(data['requester_id'], data['recipient_id'], result.data[0])
         
         return jsonify({
             'status': 'success',
@@ -1071,26 +1458,92 @@ def create_mentorship_request():
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
-@app.route('/api/mentorship-requests/user/<user_id>', methods=['GET'])
+MENTORSHIP_DIRECTION_COLUMNS = {
+    'sent': ['requester_id'],
+    'received': ['recipient_id'],
+    'all': ['requester_id', 'recipient_id'],
+}
+MENTORSHIP_COUNT_STATUSES = ('pending', 'accepted', 'rejected', 'cancelled')
+
+
+def mentorship_requests_query(user_id, direction, columns, count=None):
+    query = supabase.table('mentorship_requests').select(columns, count=count)
+    return any_column_equals(query, MENTORSHIP_DIRECTION_COLUMNS[direction], user_id)
+
+
+def mentorship_counts(user_id):
+    """Total and per-status request counts in each direction.
+
+    One users query embeds an aliased `mentorship_requests(count)` per
+    direction and status, so PostgREST does the counting.
+    """
+    names = [(d, name) for d in ('received', 'sent') for name in ('total',) + MENTORSHIP_COUNT_STATUSES]
+    columns = ['id'] + [
+        f'{d}_{name}:mentorship_requests!mentorship_requests_{MENTORSHIP_DIRECTION_COLUMNS[d][0]}_fkey(count)'
+        for d, name in names
+    ]
+    query = supabase.table('users').select(', '.join(columns)).eq('id', user_id)
+    for d, name in names:
+        if name != 'total':
+            query = query.eq(f'{d}_{name}.status', name)
+    rows = query.execute().data
+    user = rows[0] if rows else {}
+    counts = {'received': {}, 'sent': {}}
+    for d, name in names:
+        embedded = user.get(f'{d}_{name}') or [{}]
+        counts[d][name] = embedded[0].get('count', 0)
+    return counts
+
+
+@api.route('/api/mentorship-requests/user/<user_id>', methods=['GET'])
+@metrics.query_budget(2)
 def get_user_mentorship_requests(user_id):
-    """Get all mentorship requests for a user (sent and received)"""
+    """Get a user's mentorship requests (sent and received), newest first.
+
+    Optional `direction` (sent, received or all), `status`, `limit` and
+    `cursor` parameters page through one combined query. The first page
+    also carries total and per-status counts for both directions.
+    """
     try:
-        # Get requests sent by user
-        sent_requests = supabase.table('mentorship_requests').select(
-            '*, recipient:users!mentorship_requests_recipient_id_fkey(full_name, email)'
-        ).eq('requester_id', user_id).execute()
-        
-        # Get requests received by user
-        received_requests = supabase.table('mentorship_requests').select(
-            '*, requester:users!mentorship_requests_requester_id_fkey(full_name, email)'
-        ).eq('recipient_id', user_id).execute()
+        direction = request.args.get('direction', 'all')
+        status = request.args.get('status')
+        if direction not in MENTORSHIP_DIRECTION_COLUMNS:
+            return jsonify({'status': 'error', 'message': 'direction must be sent, received or all'}), 400
+        try:
+            limit = parse_limit(request.args.get('limit'), maximum=100)
+            after = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        
+        def load_page():
+            query = mentorship_requests_query(
+                user_id, direction,
+                '*, requester:users!mentorship_requests_requester_id_fkey(full_name, email), '
+                'recipient:users!mentorship_requests_recipient_id_fkey(full_name, email)'
+            )
+            if status:
+                query = query.eq('status', status)
+            query = keyset_desc(query, 'created_at', 'id', after)
+            if limit:
+                query = query.limit(limit + 1)
+            return query.execute().data or []
+        
+        # Counts don't change between pages, so only the first page computes them
+        page, counts = parallel(load_page, lambda: None if after else mentorship_counts(user_id))
+        
+        next_cursor = None
+        if limit and len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor((page[-1]['created_at'], page[-1]['id']))
         
         return jsonify({
             'status': 'success',
             'data': {
-                'sent': sent_requests.data or [],
-                'received': received_requests.data or []
-            }
+                'sent': [r for r in page if r['requester_id'] == user_id],
+                'received': [r for r in page if r['recipient_id'] == user_id]
+            },
+            'counts': counts,
+            'next_cursor': next_cursor
         })
         
     except Exception as e:
@@ -1098,7 +1551,7 @@ def get_user_mentorship_requests(user_id):
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
-@app.route('/api/mentorship-requests/<request_id>/status', methods=['PUT'])
+@api.route('/api/mentorship-requests/<request_id>/status', methods=['PUT'])
 def update_mentorship_request_status(request_id):
     """Update mentorship request status (accept/reject)"""
     try:
@@ -1111,6 +1564,10 @@ def update_mentorship_request_status(request_id):
         result = supabase.table('mentorship_requests').update({
             'status': status
         }).eq('id', request_id).execute()
+        if result.data:
+            # Every allowed status ends the pending request
+            updated = result.data[0]
+            pending_requests_cache.put(updated['requester_id'], updated['recipient_id'], None)
         
         return jsonify({
             'status': 'success',
@@ -1123,132 +1580,111 @@ def update_mentorship_request_status(request_id):
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
-@app.route('/api/mentorship-requests/check/<requester_id>/<recipient_id>', methods=['GET'])
+@api.route('/api/mentorship-requests/check/<requester_id>/<recipient_id>', methods=['GET'])
+@metrics.query_budget(1)
 def check_mentorship_request_exists(requester_id, recipient_id):
     """Check if a mentorship request already exists between two users"""
     try:
-        result = supabase.table('mentorship_requests').select('*').eq(
-            'requester_id', requester_id
-        ).eq('recipient_id', recipient_id).eq('status', 'pending').execute()
+        pending = pending_requests(requester_id, [recipient_id])[recipient_id]
         
         return jsonify({
             'status': 'success',
-            'exists': len(result.data) > 0,
-            'data': result.data[0] if result.data else None
+            'exists': pending is not None,
+            'data': pending
         })
         
     except Exception as e:
         print(f"Error checking mentorship request: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+
+@api.route('/api/mentorship-requests/check', methods=['POST'])
+@metrics.query_budget(1)
+def check_mentorship_requests_exist():
+    """Which of many recipients a user already has a pending mentorship request with"""
+    try:
+        data = request.json or {}
+        requester_id = data.get('requester_id')
+        recipient_ids = data.get('recipient_ids')
+        if not requester_id or not isinstance(recipient_ids, list):
+            return jsonify({'status': 'error', 'message': 'requester_id and a recipient_ids list are required'}), 400
+        if len(recipient_ids) > IN_CHUNK_SIZE:
+            return jsonify({'status': 'error', 'message': f'At most {IN_CHUNK_SIZE} recipient_ids per request'}), 400
+        
+        return jsonify({
+            'status': 'success',
+            'data': pending_requests(requester_id, recipient_ids)
+        })
+        
+    except Exception as e:
+        print(f"Error checking mentorship requests: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
 # ============================================
 # DASHBOARD STATS ENDPOINTS
 # ============================================
 
-@app.route('/api/stats/dashboard/<user_id>', methods=['GET'])
+@api.route('/api/stats/dashboard/<user_id>', methods=['GET'])
+@metrics.query_budget(6)
 def get_dashboard_stats(user_id):
     """Get dashboard statistics for a user"""
     try:
-        # Get user info
-        user_result = supabase.table('users').select('*').eq('id', user_id).execute()
+        # Everything that needs only the user id runs alongside the user lookup
+        user_result, stored, open_projects, pending_count = parallel(
+            lambda: supabase.table('users').select('user_type').eq('id', user_id).execute(),
+            lambda: stored_matches(user_id),
+            # Get projects count
+            lambda: count_rows(
+                supabase.table('projects').select('id', count='exact').eq('creator_id', user_id).eq('status', 'open')
+            ),
+            # Get mentorship requests count (pending only)
+            lambda: count_rows(
+                supabase.table('mentorship_requests').select('id', count='exact').eq(
+                    'recipient_id', user_id
+                ).eq('status', 'pending')
+            ),
+        )
         if not user_result.data:
             return jsonify({"status": "error", "message": "User not found"}), 404
         
         user = user_result.data[0]
         user_type = user["user_type"]
         
-        stats = {
-            "matches": 0,
-            "applications": 0,
-            "projects": 0,
-            "requests": 0
-        }
-        
         # Get matches count (from explore endpoint logic)
         # For students: count faculty + industry mentors + projects with match > 0
         # For faculty/industry: count students + student projects with match > 0
-        profile_result = supabase.table(f"{user_type}_profiles").select('*').eq('user_id', user_id).execute()
-        if profile_result.data:
-            profile = profile_result.data[0]
-            match_count = 0
-            
-            if user_type == "student":
-                # Count faculty matches
-                faculty_profiles = supabase.table("faculty_profiles").select('*').execute().data or []
-                for faculty in faculty_profiles:
-                    match = student_to_faculty(profile, faculty)
-                    if match["match"] > 0:
-                        match_count += 1
-                
-                # Count industry matches
-                industry_profiles = supabase.table("industry_profiles").select('*').execute().data or []
-                for industry in industry_profiles:
-                    match = student_to_industry(profile, industry)
-                    if match["match"] > 0:
-                        match_count += 1
-                
-                # Count project matches
-                projects = supabase.table("projects").select('*').eq('status', 'open').execute().data or []
-                for project in projects:
-                    if project['creator_type'] in ['faculty', 'industry']:
-                        match = student_to_project(profile, project)
-                        if match["match"] > 0:
-                            match_count += 1
-            
-            elif user_type == "faculty":
-                # Count student matches
-                student_profiles = supabase.table("student_profiles").select('*').execute().data or []
-                for student in student_profiles:
-                    match = faculty_to_student(profile, student)
-                    if match["match"] > 0:
-                        match_count += 1
-                
-                # Count student project matches
-                projects = supabase.table("projects").select('*').eq('status', 'open').eq('creator_type', 'student').execute().data or []
-                for project in projects:
-                    match = faculty_to_project(profile, project)
-                    if match["match"] > 0:
-                        match_count += 1
-            
-            elif user_type == "industry":
-                # Count student matches
-                student_profiles = supabase.table("student_profiles").select('*').execute().data or []
-                for student in student_profiles:
-                    match = industry_to_student(profile, student)
-                    if match["match"] > 0:
-                        match_count += 1
-                
-                # Count student project matches
-                projects = supabase.table("projects").select('*').eq('status', 'open').eq('creator_type', 'student').execute().data or []
-                for project in projects:
-                    match = industry_to_project(profile, project)
-                    if match["match"] > 0:
-                        match_count += 1
-            
-            stats["matches"] = match_count
+        def match_count():
+            cached_count = recent_match_count(user_id)
+            if stored:
+                return stored["match_count"]
+            if cached_count is not None:
+                return cached_count
+            profile = cached_row(user_type, user_id)
+            if profile:
+                return count_matches(user_type, profile)
+            return 0
         
         # Get applications count
-        if user_type == "student":
-            # Count applications sent by student
-            applications = supabase.table('applications').select('id').eq('applicant_id', user_id).execute()
-            stats["applications"] = len(applications.data) if applications.data else 0
-        else:
-            # Count applications received on user's projects
-            user_projects = supabase.table('projects').select('id').eq('creator_id', user_id).execute()
-            if user_projects.data:
-                project_ids = [p['id'] for p in user_projects.data]
-                applications = supabase.table('applications').select('id').in_('project_id', project_ids).execute()
-                stats["applications"] = len(applications.data) if applications.data else 0
-        
-        # Get projects count
-        user_projects = supabase.table('projects').select('id').eq('creator_id', user_id).eq('status', 'open').execute()
-        stats["projects"] = len(user_projects.data) if user_projects.data else 0
-        
-        # Get mentorship requests count (pending only)
-        mentorship_requests = supabase.table('mentorship_requests').select('id').eq(
-            'recipient_id', user_id
-        ).eq('status', 'pending').execute()
-        stats["requests"] = len(mentorship_requests.data) if mentorship_requests.data else 0
+        def application_count():
+            if user_type == "student":
+                # Count applications sent by student
+                return count_rows(
+                    supabase.table('applications').select('id', count='exact').eq('applicant_id', user_id)
+                )
+            # Count applications received on user's projects, joined to their project instead of listing its ids
+            return count_rows(
+                supabase.table('applications').select('id, projects!inner(creator_id)', count='exact').eq(
+                    'projects.creator_id', user_id
+                )
+            )
+        
+        matches, applications = parallel(match_count, application_count)
+        stats = {
+            "matches": matches,
+            "applications": applications,
+            "projects": open_projects,
+            "requests": pending_count
+        }
         
         return jsonify({
             "status": "success",
@@ -1265,6 +1701,64 @@ def get_dashboard_stats(user_id):
         }), 500
 
 
+# ============================================
+# APP FACTORY & WARM-UP
+# ============================================
+
+def create_app():
+    """The Flask app. numpy, scipy, scikit-learn and supabase-py are imported by the first request that needs them"""
+    started = time.perf_counter()
+    app = Flask(__name__)
+
+    # CORS configuration for production and development
+    CORS(app, resources={
+        r"/api/*": {
+            "origins": [
+                "http://localhost:5173",
+                "http://localhost:3000",
+                "https://mentora3.onrender.com",
+                "https://*.onrender.com"
+            ],
+            "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+            "allow_headers": ["Content-Type", "Authorization"],
+            "supports_credentials": True
+        }
+    })
+
+    # Per-route latency and Supabase round trips, served at /api/metrics
+    metrics.init_app(app)
+    metrics.report_pool(lambda: getattr(supabase, 'pool_stats', dict)())
+
+    app.register_blueprint(api)
+    startup['create_app_seconds'] = round(time.perf_counter() - started, 4)
+    return app
+
+
+def preload():
+    """Import the heavy modules up front; run in the gunicorn master, forked workers share their memory"""
+    started = time.perf_counter()
+    import match_engine
+    if os.path.exists(SEMANTIC_MODEL_PATH):
+        import model
+    startup['preload_seconds'] = round(time.perf_counter() - started, 4)
+
+
+def warm_up():
+    """Build this worker's Supabase connections, match index and semantic matcher before it takes traffic"""
+    started = time.perf_counter()
+    preload()
+    with metrics.unbudgeted():
+        match_index.ensure_built(supabase)
+        for kind in INDEXED_TABLES:
+            match_index.scoring_matrix(kind)
+    get_semantic_matcher()
+    startup['warm_up_seconds'] = round(time.perf_counter() - started, 4)
+
+
+app = create_app()
+startup['import_seconds'] = round(time.perf_counter() - IMPORT_STARTED, 4)
+
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,348 @@
+"""Offline benchmarks of the API against an in-memory Supabase stand-in.
+
+`generate_campus(n_users)` builds a synthetic campus (users, profiles,
+projects, applications and mentorship requests) with skills drawn from a
+skewed vocabulary, so popular skills are shared by many profiles as they
+would be in production. `run_benchmarks()` replays requests against each
+endpoint through the Flask test client and reports latency and Supabase
+round trips per request. `--latency-ms` adds a fixed delay to every round
+trip to show what the query count costs over a real network.
+
+    python benchmark.py --users 1000 10000 --requests 50 --latency-ms 5
+
+`--throughput` instead serves the app with real gunicorn workers of each
+given class and drives a mix of endpoint requests at them from concurrent
+clients, so the sync, gthread and gevent serving modes can be compared on
+requests per second while Supabase latency dominates:
+
+    python benchmark.py --throughput sync gthread gevent --latency-ms 20 --concurrency 100
+"""
+import http.client
+import importlib
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import metrics
+from fake_supabase import FakeSupabase
+
+SKILLS = [
+    'python', 'machine learning', 'data analysis', 'sql', 'javascript', 'react', 'java', 'deep learning',
+    'statistics', 'c++', 'nlp', 'computer vision', 'web development', 'cloud computing', 'aws', 'docker',
+    'kubernetes', 'node.js', 'typescript', 'git', 'linux', 'tensorflow', 'pytorch', 'data visualization',
+    'cybersecurity', 'networking', 'embedded systems', 'iot', 'robotics', 'matlab', 'signal processing',
+    'blockchain', 'android', 'ios', 'flutter', 'ui design', 'ux research', 'product management', 'rust', 'go',
+    'big data', 'spark', 'hadoop', 'excel', 'power bi', 'tableau', 'r', 'bioinformatics', 'quantum computing',
+    'operations research', 'devops', 'mlops', 'reinforcement learning', 'graph algorithms', 'compilers',
+    'distributed systems', 'databases', 'mongodb', 'postgresql', 'firebase', 'game development', 'unity',
+    'ar/vr', 'fintech', 'healthcare analytics', 'renewable energy', 'cad', 'vlsi', 'control systems',
+    'technical writing', 'public speaking', 'research methods', 'entrepreneurship',
+]
+DOMAINS = ['AI/ML', 'Web Development', 'Data Science', 'Cybersecurity', 'IoT', 'Healthcare', 'FinTech', 'Robotics']
+DEPARTMENTS = ['Computer Science', 'Electrical', 'Mechanical', 'Mathematics', 'Physics', 'Biotechnology']
+PROJECT_TYPES = {'student': 'student_seeking_mentor', 'faculty': 'faculty_led', 'industry': 'industry_led'}
+SIZES = {'1k': 1000, '10k': 10000, '100k': 100000}
+
+
+def generate_campus(n_users, seed=0):
+    """Tables for `n_users` users: 75% students, 15% faculty and 10% industry mentors"""
+    rng = random.Random(seed)
+    # Zipf-like weights: the first skills are far more common than the last ones
+    weights = [1 / (rank + 1) for rank in range(len(SKILLS))]
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def skills(low, high):
+        return list(dict.fromkeys(rng.choices(SKILLS, weights, k=rng.randint(low, high))))
+
+    def timestamp():
+        return (start + timedelta(seconds=rng.randrange(365 * 24 * 3600))).isoformat()
+
+    tables = {name: [] for name in (
+        'users', 'student_profiles', 'faculty_profiles', 'industry_profiles',
+        'projects', 'applications', 'mentorship_requests',
+    )}
+    by_type = {'student': [], 'faculty': [], 'industry': []}
+    for i in range(n_users):
+        user_type = 'student' if i % 20 < 15 else 'faculty' if i % 20 < 18 else 'industry'
+        user_id = f'{user_type[:3]}-{i:07d}'
+        by_type[user_type].append(user_id)
+        tables['users'].append({
+            'id': user_id, 'email': f'{user_id}@campus.test', 'full_name': f'{user_type.title()} {i}',
+            'user_type': user_type, 'password_hash': '', 'created_at': timestamp(),
+        })
+        bio = 'Interested in ' + ', '.join(skills(2, 5))
+        if user_type == 'student':
+            tables['student_profiles'].append({
+                'id': f'sp-{i:07d}', 'user_id': user_id, 'department': rng.choice(DEPARTMENTS),
+                'year_of_study': rng.randint(1, 4), 'cgpa': round(rng.uniform(6, 10), 2),
+                'skills': skills(2, 8), 'interests': skills(1, 4), 'career_goals': [], 'bio': bio,
+            })
+        elif user_type == 'faculty':
+            tables['faculty_profiles'].append({
+                'id': f'fp-{i:07d}', 'user_id': user_id, 'department': rng.choice(DEPARTMENTS),
+                'designation': 'Professor', 'research_areas': skills(1, 4), 'expertise': skills(3, 8),
+                'mentoring_capacity': 3, 'open_to_student_ideas': True, 'bio': bio,
+            })
+        else:
+            tables['industry_profiles'].append({
+                'id': f'ip-{i:07d}', 'user_id': user_id, 'company': f'Company {i % 97}',
+                'industry_domain': rng.choice(DOMAINS), 'expertise': skills(3, 8), 'mentoring_focus': skills(1, 3),
+                'mentoring_capacity': 8, 'bio': bio,
+            })
+
+    for creator_type, creators in by_type.items():
+        for creator_id in creators:
+            count = rng.randint(0, 2) if creator_type != 'student' else int(rng.random() < 0.05)
+            for _ in range(count):
+                project_id = f'prj-{len(tables["projects"]):07d}'
+                required = skills(2, 6)
+                tables['projects'].append({
+                    'id': project_id, 'title': f'{rng.choice(DOMAINS)} project {project_id}',
+                    'description': 'Build something with ' + ', '.join(required),
+                    'creator_id': creator_id, 'creator_type': creator_type,
+                    'project_type': PROJECT_TYPES[creator_type], 'required_skills': required,
+                    'required_expertise': skills(0, 3), 'student_count_needed': rng.randint(1, 5),
+                    'domain': rng.choice(DOMAINS), 'status': rng.choice(['open', 'open', 'open', 'closed']),
+                    'created_at': timestamp(), 'updated_at': None,
+                })
+
+    project_ids = [project['id'] for project in tables['projects']]
+    mentors = by_type['faculty'] + by_type['industry']
+    statuses = ['pending', 'pending', 'accepted', 'rejected']
+    for student_id in by_type['student']:
+        for project_id in set(rng.sample(project_ids, min(rng.randint(0, 5), len(project_ids)))):
+            tables['applications'].append({
+                'id': f'app-{len(tables["applications"]):08d}', 'project_id': project_id,
+                'applicant_id': student_id, 'applicant_type': 'student', 'application_type': 'join',
+                'cover_letter': 'I would like to join.', 'status': rng.choice(statuses), 'applied_at': timestamp(),
+            })
+        for mentor_id in set(rng.sample(mentors, min(rng.randint(0, 2), len(mentors)))):
+            tables['mentorship_requests'].append({
+                'id': f'req-{len(tables["mentorship_requests"]):08d}', 'requester_id': student_id,
+                'requester_type': 'student', 'recipient_id': mentor_id,
+                'recipient_type': 'faculty' if mentor_id.startswith('fac') else 'industry',
+                'request_type': 'student_to_mentor', 'message': '', 'status': rng.choice(statuses),
+                'created_at': timestamp(),
+            })
+    return tables
+
+
+def load_app(client):
+    """A freshly imported app module (empty caches and indexes) that talks to `client`"""
+    # The module's own client connects lazily, so it is replaced before it ever opens a connection
+    os.environ.setdefault('SUPABASE_URL', 'http://localhost:54321')
+    os.environ.setdefault('SUPABASE_KEY', 'benchmark.benchmark.benchmark')
+    app_module = importlib.reload(sys.modules['app']) if 'app' in sys.modules else importlib.import_module('app')
+    app_module.supabase = metrics.instrument(client)
+    return app_module
+
+
+def endpoint_requests(tables, rng):
+    """Request paths per endpoint, picked from users and projects that have data"""
+    students = [p['user_id'] for p in tables['student_profiles']]
+    mentors = [p['user_id'] for p in tables['faculty_profiles']] + [p['user_id'] for p in tables['industry_profiles']]
+    creators = list({p['creator_id'] for p in tables['projects']})
+    projects = list({a['project_id'] for a in tables['applications']})
+    return {
+        'explore': lambda: f'/api/explore?user_id={rng.choice(students + mentors)}&limit=20',
+        'dashboard': lambda: f'/api/stats/dashboard/{rng.choice(students + mentors)}',
+        'project_applications': lambda: f'/api/applications/project/{rng.choice(projects)}',
+        'project_applications_page': lambda: f'/api/applications/project/{rng.choice(projects)}?limit=20',
+        'mentorship_inbox': lambda: f'/api/mentorship-requests/user/{rng.choice(mentors)}?direction=received&limit=20',
+        'user_projects_with_stats': lambda: f'/api/projects/user/{rng.choice(creators)}?with_stats=true',
+    }
+
+
+def fake_app():
+    """WSGI app backed by a generated campus, for `gunicorn 'benchmark:fake_app()'`"""
+    tables = generate_campus(int(os.environ.get('BENCHMARK_USERS', 1000)), seed=int(os.environ.get('BENCHMARK_SEED', 0)))
+    latency = float(os.environ.get('BENCHMARK_LATENCY_MS', 0)) / 1000
+    return load_app(FakeSupabase(tables, latency=latency)).app
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def run_benchmarks(tables, requests=50, latency=0.0, endpoints=None, seed=0):
+    """`{endpoint: stats}` with latency in milliseconds and Supabase round trips per request.
+
+    The first request to each endpoint is reported separately as `cold_ms`,
+    since it also builds the worker's caches and match index.
+    """
+    client = FakeSupabase(tables, latency=latency)
+    app_module = load_app(client)
+    test_client = app_module.app.test_client()
+    rng = random.Random(seed)
+    results = {}
+    for name, next_path in endpoint_requests(tables, rng).items():
+        if endpoints and name not in endpoints:
+            continue
+        timings, queries = [], []
+        for _ in range(requests + 1):
+            path = next_path()
+            client.reset_calls()
+            started = time.perf_counter()
+            response = test_client.get(path)
+            timings.append((time.perf_counter() - started) * 1000)
+            queries.append(client.calls)
+            if response.status_code != 200:
+                raise RuntimeError(f'{path} returned {response.status_code}: {response.get_data(as_text=True)[:200]}')
+        cold, timings, queries = timings[0], timings[1:], queries[1:]
+        results[name] = {
+            'requests': len(timings),
+            'cold_ms': round(cold, 2),
+            'mean_ms': round(statistics.mean(timings), 2),
+            'p50_ms': round(_percentile(timings, 0.5), 2),
+            'p95_ms': round(_percentile(timings, 0.95), 2),
+            'queries_mean': round(statistics.mean(queries), 2),
+            'queries_max': max(queries),
+        }
+    return results
+
+
+def _wait_for_server(port, server, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with status {server.returncode}')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/api/health')
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'gunicorn did not answer on port {port} within {timeout}s')
+
+
+def _drive(port, paths, concurrency, duration):
+    """Send `paths` round-robin from `concurrency` keep-alive clients for `duration` seconds"""
+    timings, errors = [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(offset):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        i = offset
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += concurrency
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                ok = False
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                (timings if ok else errors).append(elapsed)
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return timings, errors, time.perf_counter() - started
+
+
+def run_throughput(worker_class, n_users, latency=0.02, concurrency=100, duration=10.0, workers=2, seed=0,
+                   port=8799):
+    """Requests per second and latency of a mixed endpoint load on gunicorn with `worker_class` workers"""
+    tables = generate_campus(n_users, seed=seed)
+    rng = random.Random(seed)
+    paths = [next_path() for next_path in endpoint_requests(tables, rng).values() for _ in range(200)]
+    rng.shuffle(paths)
+    env = {
+        **os.environ, 'WORKER_CLASS': worker_class, 'WARM_UP': 'true', 'QUERY_BUDGET_MODE': 'off',
+        'BENCHMARK_USERS': str(n_users), 'BENCHMARK_SEED': str(seed), 'BENCHMARK_LATENCY_MS': str(latency * 1000),
+    }
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--workers', str(workers),
+         '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', 'benchmark:fake_app()'],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+    )
+    try:
+        _wait_for_server(port, server)
+        timings, errors, elapsed = _drive(port, paths, concurrency, duration)
+    finally:
+        server.terminate()
+        server.wait()
+    return {
+        'worker_class': worker_class,
+        'requests': len(timings),
+        'errors': len(errors),
+        'requests_per_s': round(len(timings) / elapsed, 1),
+        'p50_ms': round(_percentile(timings, 0.5), 2) if timings else None,
+        'p95_ms': round(_percentile(timings, 0.95), 2) if timings else None,
+    }
+
+
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Benchmark API endpoints against an in-memory Supabase.')
+    parser.add_argument('--users', nargs='+', default=['1k'],
+                        help='Campus sizes: 1k, 10k, 100k or a number of users.')
+    parser.add_argument('--requests', type=int, default=50, help='Requests per endpoint after the first.')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Delay added to every Supabase round trip.')
+    parser.add_argument('--endpoint', action='append', help='Only run this endpoint; may be repeated.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='Also write the results to this file.')
+    parser.add_argument('--throughput', nargs='+', metavar='WORKER_CLASS',
+                        help='Compare gunicorn worker classes (sync, gthread, gevent) on requests per second.')
+    parser.add_argument('--concurrency', type=int, default=100, help='Concurrent clients for --throughput.')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds of load per worker class.')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers for --throughput.')
+    args = parser.parse_args(argv)
+
+    report = {}
+    for size in args.users:
+        n_users = SIZES.get(size) or int(size)
+        if args.throughput:
+            print(f"{n_users} users, {args.workers} workers, {args.concurrency} clients, "
+                  f"{args.latency_ms:g} ms per Supabase call")
+            print(f"{'worker class':14} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+            report[str(n_users)] = {}
+            for worker_class in args.throughput:
+                stats = run_throughput(worker_class, n_users, args.latency_ms / 1000, args.concurrency,
+                                       args.duration, args.workers, args.seed)
+                report[str(n_users)][worker_class] = stats
+                print(f"{worker_class:14} {stats['requests']:9d} {stats['errors']:7d} "
+                      f"{stats['requests_per_s']:9.1f} {stats['p50_ms'] or 0:9.2f} {stats['p95_ms'] or 0:9.2f}")
+            print()
+            continue
+
+        started = time.perf_counter()
+        tables = generate_campus(n_users, seed=args.seed)
+        print(f"{n_users} users: {len(tables['projects'])} projects, {len(tables['applications'])} applications, "
+              f"{len(tables['mentorship_requests'])} mentorship requests (generated in "
+              f"{time.perf_counter() - started:.1f}s)")
+        results = run_benchmarks(tables, args.requests, args.latency_ms / 1000, args.endpoint, args.seed)
+        report[str(n_users)] = results
+        print(f"{'endpoint':28} {'cold ms':>9} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'max':>5}")
+        for name, stats in results.items():
+            print(f"{name:28} {stats['cold_ms']:9.2f} {stats['mean_ms']:9.2f} {stats['p50_ms']:9.2f} "
+                  f"{stats['p95_ms']:9.2f} {stats['queries_mean']:8.2f} {stats['queries_max']:5d}")
+        print()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f'Wrote results to {args.json}')
+
+
+if __name__ == '__main__':
+    main()
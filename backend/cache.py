@@ -0,0 +1,166 @@
+"""Process-wide TTL cache of profile and project rows with write-through updates.
+
+Rows are keyed by (table, key) and evicted least-recently-used once the
+cache holds `max_rows`. Each table has a version that every write bumps; a
+load that started before a write does not store its (possibly stale) rows.
+Writes on other workers are only picked up when entries expire, so `ttl`
+bounds how stale a read can be.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class RowCache:
+    def __init__(self, ttl=60, max_rows=50000):
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._rows = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_many(self, table, key_col, keys, load):
+        """Rows of `table` whose `key_col` is in `keys`, in key order.
+
+        Cached rows are served directly; the rest come from one call to
+        `load(missing_keys)` and are cached. Returned rows are copies.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._rows.get((table, key))
+                if entry is not None and entry[0] > now:
+                    self._rows.move_to_end((table, key))
+                    found[key] = entry[1]
+                    self.hits += 1
+                else:
+                    missing.append(key)
+                    self.misses += 1
+            version = self._versions.get(table, 0)
+
+        if missing:
+            loaded = load(missing)
+            with self._lock:
+                fresh = self._versions.get(table, 0) == version
+                for row in loaded:
+                    found[row[key_col]] = row
+                    if fresh:
+                        self._store(table, row[key_col], row)
+
+        return [dict(found[key]) for key in keys if key in found]
+
+    def put(self, table, key, row):
+        """Write-through after an insert or update"""
+        with self._lock:
+            self._versions[table] = self._versions.get(table, 0) + 1
+            self._store(table, key, row)
+
+    def invalidate(self, table, key):
+        with self._lock:
+            self._versions[table] = self._versions.get(table, 0) + 1
+            if self._rows.pop((table, key), None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._rows)
+            self._rows.clear()
+            for table in self._versions:
+                self._versions[table] += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._rows),
+                'max_rows': self.max_rows,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'versions': dict(self._versions),
+            }
+
+    def _store(self, table, key, row):
+        self._rows[(table, key)] = (time.monotonic() + self.ttl, dict(row))
+        self._rows.move_to_end((table, key))
+        while len(self._rows) > self.max_rows:
+            self._rows.popitem(last=False)
+            self.evictions += 1
+
+
+class MembershipCache:
+    """Per-owner answers to "is there a row for (owner, key)?", e.g. has a user applied to a project.
+
+    Each owner maps keys to their row, or to None once a key is known to have
+    no row, so repeated "not applied" checks cost nothing. Unknown keys are
+    loaded in one batch. An owner's answers expire together after `ttl`
+    seconds, and at most `max_owners` owners are kept.
+    """
+
+    def __init__(self, ttl=60, max_owners=10000):
+        self.ttl = ttl
+        self.max_owners = max_owners
+        self._owners = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, owner, keys, load):
+        """`{key: row or None}` for `keys`; `load(missing_keys)` returns `{key: row}` for keys that have one"""
+        keys = list(dict.fromkeys(keys))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._owners.get(owner)
+            if entry is None or entry[0] <= now:
+                entry = (now + self.ttl, {})
+                self._owners[owner] = entry
+            self._owners.move_to_end(owner)
+            while len(self._owners) > self.max_owners:
+                self._owners.popitem(last=False)
+                self.evictions += 1
+            known = entry[1]
+            found = {key: known[key] for key in keys if key in known}
+            missing = [key for key in keys if key not in known]
+            self.hits += len(found)
+            self.misses += len(missing)
+            version = self._versions.get(owner, 0)
+
+        if missing:
+            loaded = load(missing)
+            with self._lock:
+                fresh = self._versions.get(owner, 0) == version and self._owners.get(owner) is entry
+                for key in missing:
+                    found[key] = loaded.get(key)
+                    if fresh:
+                        known[key] = found[key]
+
+        return {key: dict(found[key]) if found[key] is not None else None for key in keys}
+
+    def put(self, owner, key, row):
+        """Write-through after a row for (owner, key) is created, changed or removed (row=None)"""
+        with self._lock:
+            self._versions[owner] = self._versions.get(owner, 0) + 1
+            entry = self._owners.get(owner)
+            if entry is not None:
+                entry[1][key] = dict(row) if row is not None else None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'owners': len(self._owners),
+                'max_owners': self.max_owners,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -6,3 +6,73 @@ load_dotenv()
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 JWT_SECRET = os.getenv('JWT_SECRET', 'your-secret-key')
+
+# Seconds before a worker rebuilds its match index from Supabase
+MATCH_INDEX_TTL = int(os.getenv('MATCH_INDEX_TTL', 300))
+
+# Serve explore and dashboard matches from the precomputed match_scores table
+MATCH_SCORES_ENABLED = os.getenv('MATCH_SCORES_ENABLED', 'false').lower() == 'true'
+MATCH_TOP_K = int(os.getenv('MATCH_TOP_K', 50))
+# Patch stored matches in the background after each profile or project write, instead of waiting for a recompute run
+MATCH_FAN_OUT = os.getenv('MATCH_FAN_OUT', 'true').lower() == 'true'
+
+# Matches explore returns per page when the request gives no limit
+EXPLORE_PAGE_SIZE = int(os.getenv('EXPLORE_PAGE_SIZE', 20))
+
+# Seconds a match count computed by explore is reused by the dashboard
+MATCH_COUNT_TTL = int(os.getenv('MATCH_COUNT_TTL', 60))
+
+# gunicorn worker class: sync serves one request at a time per worker; gthread and gevent (pip install gevent)
+# keep up to WORKER_CONCURRENCY requests in flight per worker while they wait on Supabase
+WORKER_CLASS = os.getenv('WORKER_CLASS', 'sync')
+WORKER_CONCURRENCY = int(os.getenv('WORKER_CONCURRENCY', 100))
+
+# Threads per worker for running independent Supabase queries concurrently; gthread and gevent workers
+# share them between many requests, so they get more by default
+QUERY_POOL_SIZE = int(os.getenv('QUERY_POOL_SIZE', 8 if WORKER_CLASS == 'sync' else 32))
+
+# Seconds profile and project rows are served from the per-worker row cache
+ROW_CACHE_TTL = int(os.getenv('ROW_CACHE_TTL', 60))
+ROW_CACHE_MAX_ROWS = int(os.getenv('ROW_CACHE_MAX_ROWS', 50000))
+# Seconds a worker trusts what it knows about a user's applications and pending mentorship requests
+MEMBERSHIP_CACHE_TTL = int(os.getenv('MEMBERSHIP_CACHE_TTL', 60))
+
+# Fitted TF-IDF model for explore's semantic mode (`flask fit-semantic-model`)
+SEMANTIC_MODEL_PATH = os.getenv(
+    'SEMANTIC_MODEL_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'semantic_model.joblib')
+)
+
+# Postings kept per term for approximate semantic search; higher raises recall and latency, 0 scores every document
+SEMANTIC_ANN_DEPTH = int(os.getenv('SEMANTIC_ANN_DEPTH', 0))
+# Candidates per kind returned by approximate semantic search
+SEMANTIC_ANN_TOP_N = int(os.getenv('SEMANTIC_ANN_TOP_N', 100))
+
+# bcrypt cost factor for new hashes; logins rehash passwords stored with a different cost
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+# Processes per worker for password hashing (0 hashes on the request thread)
+PASSWORD_POOL_SIZE = int(os.getenv('PASSWORD_POOL_SIZE', 2))
+# Password operations queued or running per worker before new ones are turned away
+PASSWORD_QUEUE_MAX = int(os.getenv('PASSWORD_QUEUE_MAX', 32))
+# Supabase round trips a request may make: off, log or raise when a route goes over its budget
+QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'off')
+# Budget for routes without their own @query_budget (0 for no limit)
+QUERY_BUDGET_DEFAULT = int(os.getenv('QUERY_BUDGET_DEFAULT', 10))
+
+# Connections each worker keeps to PostgREST; up to SUPABASE_MAX_KEEPALIVE stay open between requests
+SUPABASE_MAX_CONNECTIONS = int(os.getenv('SUPABASE_MAX_CONNECTIONS', 20 if WORKER_CLASS == 'sync' else 100))
+SUPABASE_MAX_KEEPALIVE = int(os.getenv('SUPABASE_MAX_KEEPALIVE', 10))
+# Seconds an idle keep-alive connection is kept before it is closed
+SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv('SUPABASE_KEEPALIVE_EXPIRY', 30))
+# Seconds to wait for a PostgREST response, and for a new connection
+SUPABASE_TIMEOUT = float(os.getenv('SUPABASE_TIMEOUT', 10))
+SUPABASE_CONNECT_TIMEOUT = float(os.getenv('SUPABASE_CONNECT_TIMEOUT', 5))
+# Retries of failed connections, and of reads answered 502/503/504, backing off from SUPABASE_RETRY_BACKOFF seconds
+SUPABASE_RETRIES = int(os.getenv('SUPABASE_RETRIES', 2))
+SUPABASE_RETRY_BACKOFF = float(os.getenv('SUPABASE_RETRY_BACKOFF', 0.2))
+# Talk HTTP/2 to PostgREST (needs the h2 package: pip install 'httpx[http2]')
+SUPABASE_HTTP2 = os.getenv('SUPABASE_HTTP2', 'false').lower() == 'true'
+
+# Import numpy/scipy (and scikit-learn when a semantic model exists) in the gunicorn master, shared by every worker
+PRELOAD_APP = os.getenv('PRELOAD_APP', 'false').lower() == 'true'
+# Build each worker's match index and Supabase connections before it serves its first request
+WARM_UP = os.getenv('WARM_UP', 'false').lower() == 'true'
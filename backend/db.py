@@ -0,0 +1,134 @@
+"""Supabase query helpers shared by the API and the matching modules"""
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import QUERY_POOL_SIZE
+
+# PostgREST caps every response at this many rows by default
+PAGE_SIZE = 1000
+
+# Keep `in.(...)` filters short enough to stay well under URL length limits
+IN_CHUNK_SIZE = 200
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_in_pool = contextvars.ContextVar('in_query_pool', default=False)
+
+
+def _run_in_pool(call):
+    _in_pool.set(True)
+    return call()
+
+
+def parallel(*calls):
+    """Run independent zero-argument callables concurrently; results come back in order.
+
+    Queries share one bounded pool per process, created on first use so it
+    never crosses a fork. Each call runs in a copy of the caller's context.
+    Nested calls run inline, so a full pool can never deadlock on itself.
+    """
+    global _executor
+    if len(calls) <= 1 or _in_pool.get():
+        return [call() for call in calls]
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=QUERY_POOL_SIZE, thread_name_prefix='supabase-query')
+    futures = [
+        _executor.submit(contextvars.copy_context().run, _run_in_pool, call)
+        for call in calls
+    ]
+    return [future.result() for future in futures]
+
+
+def fetch_all(build_query, page_size=PAGE_SIZE):
+    """Fetch every row of a query, paging past the PostgREST row cap.
+
+    `build_query` must return a fresh query builder on each call, since
+    postgrest builders are mutated by `.range()`.
+    """
+    rows = []
+    start = 0
+    while True:
+        page = build_query().range(start, start + page_size).execute().data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+
+def fetch_in(client, table, column, values, columns='*', chunk_size=IN_CHUNK_SIZE, filters=None):
+    """Fetch rows whose `column` is one of `values`, batching the `in_()` filter.
+
+    `filters` is an optional `{column: value}` of extra equality filters.
+    """
+    values = list(values)
+    chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+
+    def fetch_chunk(chunk):
+        query = client.table(table).select(columns).in_(column, chunk)
+        for filter_column, value in (filters or {}).items():
+            query = query.eq(filter_column, value)
+        return query.execute().data or []
+
+    pages = parallel(*[lambda chunk=chunk: fetch_chunk(chunk) for chunk in chunks])
+    return [row for page in pages for row in page]
+
+
+def count_rows(query):
+    """Exact row count of a `select(..., count='exact')` query without fetching its rows.
+
+    The pinned postgrest client drops the Content-Range count on HEAD
+    responses, so this asks for a single row and reads the count header.
+    """
+    return query.limit(1).execute().count or 0
+
+
+def _quote(value):
+    """Double-quote a value for use inside a PostgREST logic tree"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def or_filter(query, filters):
+    """Add an `or=(...)` filter; the pinned postgrest client has no `or_()`"""
+    query.params = query.params.add('or', f'({filters})')
+    return query
+
+
+def any_column_equals(query, columns, value):
+    """Keep rows where any of `columns` equals `value`.
+
+    Sent as an `and=(or(...))` tree so it combines with the `or` filter of
+    keyset_desc instead of replacing it.
+    """
+    conditions = ','.join(f'{column}.eq.{_quote(value)}' for column in columns)
+    query.params = query.params.add('and', f'(or({conditions}))')
+    return query
+
+
+def any_column_contains(query, columns, text):
+    """Keep rows where any of `columns` contains `text`, ignoring case.
+
+    LIKE wildcards in `text` are escaped and PostgREST's `*` wildcard is
+    dropped, so the rest is matched literally.
+    """
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_').replace('*', '')
+    conditions = ','.join(f'{column}.ilike.{_quote(f"*{escaped}*")}' for column in columns)
+    query.params = query.params.add('and', f'(or({conditions}))')
+    return query
+
+
+def keyset_desc(query, column, id_col='id', after=None):
+    """Order by (`column`, `id_col`) descending, starting strictly after the `after` key.
+
+    The pinned postgrest client emits one `order` parameter per `.order()`
+    call, so both sort columns go into a single call.
+    """
+    if after is not None:
+        value, last_id = after
+        query = or_filter(
+            query,
+            f'{column}.lt.{_quote(value)},and({column}.eq.{_quote(value)},{id_col}.lt.{_quote(last_id)})'
+        )
+    return query.order(f'{column}.desc,{id_col}', desc=True)
@@ -0,0 +1,512 @@
+"""In-memory stand-in for the Supabase client, for benchmarks and query-count tests.
+
+Implements the part of the postgrest query builder the backend uses: select
+(with `count`, embedded relations such as
+`requester:users!mentorship_requests_requester_id_fkey(full_name, email)` and
+`alias:table(count)` aggregates, `table!inner(...)` joins filtered through
+`table.column`), insert, upsert, update and delete, the
+eq/neq/gt/gte/lt/lte/in_ filters, `contains` on arrays and jsonb, `or`/`and` logic trees (which may use `ilike`) added through
+`query.params`, order, limit and range. Like PostgREST, responses are capped
+at `max_rows` rows. Every `execute()` is one round trip in `calls`, and
+`latency` seconds can be added to each one to model the network.
+
+Equality and `in_` filters are answered from per-column hash indexes,
+built on first use and dropped on every write to the table, so large
+synthetic datasets do not turn each query into a full scan.
+"""
+import copy
+import json
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+
+# Columns filled in by the database when an insert leaves them out
+TIMESTAMP_COLUMNS = {'applications': 'applied_at'}
+PRIMARY_KEYS = {'match_scores': 'user_id', 'match_fingerprints': 'kind,entity_id'}
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeParams(tuple):
+    """The `add()` part of httpx.QueryParams that the db helpers rely on"""
+
+    def add(self, key, value):
+        return FakeParams(self + ((key, value),))
+
+
+def _split(text):
+    """Split on top-level commas, outside parentheses and double quotes"""
+    parts, depth, current, quoted, escaped = [], 0, '', False, False
+    for ch in text:
+        if escaped:
+            current += ch
+            escaped = False
+            continue
+        if ch == '\\' and quoted:
+            escaped = True
+        elif ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == '(':
+            depth += 1
+        elif not quoted and ch == ')':
+            depth -= 1
+        if ch == ',' and depth == 0 and not quoted:
+            parts.append(current.strip())
+            current = ''
+        else:
+            current += ch
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def _unquote(value):
+    if value.startswith('"') and value.endswith('"'):
+        return value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+    return value
+
+
+def _coerce(row_value, value):
+    """Convert a filter value to the type of the column it is compared with"""
+    if row_value is None or not isinstance(value, str) or isinstance(row_value, str):
+        return value
+    if isinstance(row_value, bool):
+        return value.lower() == 'true'
+    if isinstance(row_value, (int, float)):
+        return type(row_value)(float(value)) if isinstance(row_value, int) else float(value)
+    return value
+
+
+def _contains(container, value):
+    """Postgres `@>`: every element of an array (or key of an object) in `value` is contained in `container`"""
+    if isinstance(value, dict):
+        return isinstance(container, dict) and all(
+            key in container and _contains(container[key], item) for key, item in value.items()
+        )
+    if isinstance(value, list):
+        return isinstance(container, list) and all(
+            any(_contains(element, item) for element in container) for item in value
+        )
+    return container == value
+
+
+def _like(pattern, ignore_case):
+    """Regex for a LIKE pattern; PostgREST also accepts `*` for `%`"""
+    parts = []
+    chars = iter(pattern)
+    for char in chars:
+        if char == '\\':
+            parts.append(re.escape(next(chars, '\\')))
+        elif char in '*%':
+            parts.append('.*')
+        elif char == '_':
+            parts.append('.')
+        else:
+            parts.append(re.escape(char))
+    return re.compile(''.join(parts), re.DOTALL | (re.IGNORECASE if ignore_case else 0))
+
+
+def _compare(op, row_value, value):
+    if op in ('like', 'ilike'):
+        return row_value is not None and _like(value, op == 'ilike').fullmatch(str(row_value)) is not None
+    if op == 'cs':
+        if value.startswith('{') and not value.startswith('{"'):
+            # Postgres array literal, as postgrest sends a list of strings
+            value = [_unquote(v) for v in _split(value[1:-1])] if value != '{}' else []
+        else:
+            value = json.loads(value)
+        return _contains(row_value, value)
+    if op == 'is':
+        return row_value is None if str(value).lower() == 'null' else row_value == _coerce(True, value)
+    if op == 'in':
+        return row_value in [_coerce(row_value, v) for v in value]
+    value = _coerce(row_value, value)
+    if op == 'eq':
+        return row_value == value
+    if op == 'neq':
+        return row_value != value
+    if row_value is None or value is None:
+        return False
+    return {'lt': row_value < value, 'lte': row_value <= value, 'gt': row_value > value, 'gte': row_value >= value}[op]
+
+
+def _condition(expr):
+    """Predicate for one PostgREST logic-tree term, e.g. `and(a.eq.1,or(b.lt.2,c.gt.3))`"""
+    for logic, combine in (('and', all), ('or', any)):
+        if expr.startswith(logic + '('):
+            terms = [_condition(term) for term in _split(expr[len(logic) + 1:-1])]
+            return lambda row: combine(term(row) for term in terms)
+    column, op, value = expr.split('.', 2)
+    if op == 'in':
+        value = [_unquote(v) for v in _split(value[1:-1])]
+    else:
+        value = _unquote(value)
+    return lambda row: _compare(op, row.get(column), value)
+
+
+def _index_key(value):
+    """Hash key under which a value and its string form (as sent in a filter) meet"""
+    if isinstance(value, bool):
+        return ('bool', value)
+    if isinstance(value, (int, float)):
+        return ('number', float(value))
+    if isinstance(value, str):
+        try:
+            return ('number', float(value))
+        except ValueError:
+            return value
+    return value
+
+
+def _tree_lookups(expr):
+    """`[(column, values)]` lookups whose union covers every row a logic tree can match, or None"""
+    for logic in ('and', 'or'):
+        if expr.startswith(logic + '('):
+            found = [_tree_lookups(term) for term in _split(expr[len(logic) + 1:-1])]
+            if logic == 'and':
+                return next((lookups for lookups in found if lookups is not None), None)
+            return None if None in found else [lookup for lookups in found for lookup in lookups]
+    column, op, value = expr.split('.', 2)
+    if op == 'eq':
+        return [(column, [_unquote(value)])]
+    if op == 'in':
+        return [(column, [_unquote(v) for v in _split(value[1:-1])])]
+    return None
+
+
+def _embed_target(target):
+    """`(table, fk hint, inner select)` of an embed such as `users!requester_fkey!inner(full_name)`"""
+    name, inner = target[:-1].split('(', 1)
+    table, *hints = name.split('!')
+    return table, next((hint for hint in hints if hint != 'inner'), ''), inner
+
+
+def _singular(table):
+    return table[:-1] if table.endswith('s') else table
+
+
+class FakeQuery:
+    def __init__(self, client, table, action, payload=None, columns='*', count=None, on_conflict=None):
+        self.client = client
+        self.table = table
+        self.action = action
+        self.payload = payload
+        self.columns = columns
+        self.count = count
+        self.on_conflict = on_conflict
+        self.params = FakeParams()
+        self._filters = []
+        self._lookups = []
+        self._embedded_filters = {}
+        self._orders = []
+        self._limit = None
+        self._range = None
+
+    # Filters
+
+    def _filter(self, column, op, value):
+        alias, _, field = column.rpartition('.')
+        predicate = (lambda row: _compare(op, row.get(field), value))
+        if alias:
+            # `alias.column` filters an embedded resource, not the rows themselves
+            self._embedded_filters.setdefault(alias, []).append(predicate)
+        else:
+            self._filters.append(predicate)
+            if op in ('eq', 'in'):
+                self._lookups.append([(field, value if op == 'in' else [value])])
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, 'eq', value)
+
+    def neq(self, column, value):
+        return self._filter(column, 'neq', value)
+
+    def gt(self, column, value):
+        return self._filter(column, 'gt', value)
+
+    def gte(self, column, value):
+        return self._filter(column, 'gte', value)
+
+    def lt(self, column, value):
+        return self._filter(column, 'lt', value)
+
+    def lte(self, column, value):
+        return self._filter(column, 'lte', value)
+
+    def in_(self, column, values):
+        return self._filter(column, 'in', list(values))
+
+    def contains(self, column, value):
+        if isinstance(value, str):
+            return self._filter(column, 'cs', value)
+        if isinstance(value, dict):
+            return self._filter(column, 'cs', json.dumps(value))
+        return self._filter(column, 'cs', '{' + ','.join(value) + '}')
+
+    # Modifiers
+
+    def order(self, column, desc=False, nullsfirst=False, **kwargs):
+        # Like postgrest 0.10.8, `desc` only applies to the last column of a comma-separated spec
+        spec = column + ('.desc' if desc else '')
+        for part in spec.split(','):
+            name, _, direction = part.partition('.')
+            self._orders.append((name, direction == 'desc'))
+        return self
+
+    def limit(self, size, **kwargs):
+        self._limit = size
+        return self
+
+    def range(self, start, end):
+        # postgrest 0.10.8 sends `Range: start-(end - 1)`
+        self._range = (start, end)
+        return self
+
+    # Execution
+
+    def execute(self):
+        if self.client.latency:
+            time.sleep(self.client.latency)
+        with self.client.lock:
+            self.client.calls += 1
+            self.client.calls_by_table[self.table] += 1
+            return self._execute()
+
+    def _matching(self, rows):
+        filters = list(self._filters)
+        options = list(self._lookups)
+        for key, value in self.params:
+            if key in ('or', 'and'):
+                terms = [_condition(term) for term in _split(value[1:-1])]
+                combine = any if key == 'or' else all
+                filters.append(lambda row, terms=terms, combine=combine: combine(term(row) for term in terms))
+                lookups = _tree_lookups(key + value)
+                if lookups is not None:
+                    options.append(lookups)
+        if options:
+            # Start from the most selective lookup; every filter is still applied below
+            rows = self.client._lookup(
+                self.table, min(options, key=lambda lookups: self.client._estimate(self.table, lookups))
+            )
+        return [row for row in rows if all(f(row) for f in filters)]
+
+    def _execute(self):
+        rows = self.client.tables.setdefault(self.table, [])
+        if self.action == 'insert':
+            return FakeResponse([copy.deepcopy(self.client._insert(self.table, item)) for item in self._items()])
+        if self.action == 'upsert':
+            return FakeResponse([
+                copy.deepcopy(self.client._upsert(self.table, item, self.on_conflict)) for item in self._items()
+            ])
+
+        presorted = self.action == 'select' and self._orders and not self._filters and not self.params
+        if presorted:
+            # Unfiltered ordered scans, e.g. fetch_all paging through a table
+            matched = self.client._ordered(self.table, tuple(self._orders))
+        else:
+            matched = self._matching(rows)
+        if self.action == 'update':
+            for row in matched:
+                row.update(copy.deepcopy(self.payload))
+            self.client._changed(self.table)
+            return FakeResponse(copy.deepcopy(matched))
+        if self.action == 'delete':
+            ids = {id(row) for row in matched}
+            rows[:] = [row for row in rows if id(row) not in ids]
+            self.client._changed(self.table)
+            return FakeResponse(copy.deepcopy(matched))
+
+        matched = self._inner_joined(matched)
+        if not presorted:
+            matched = self.client._sort(matched, self._orders)
+        total = len(matched)
+        if self._range is not None:
+            matched = matched[self._range[0]:self._range[1]]
+        if self._limit is not None:
+            matched = matched[:self._limit]
+        matched = matched[:self.client.max_rows]
+        return FakeResponse([self._project(row) for row in matched], total if self.count else None)
+
+    def _items(self):
+        return self.payload if isinstance(self.payload, list) else [self.payload]
+
+    def _project(self, row):
+        """Apply the select list to a row, resolving embedded resources"""
+        out = {}
+        for item in _split(self.columns):
+            if item == '*':
+                out.update(copy.deepcopy(row))
+                continue
+            alias, _, target = item.rpartition(':')
+            if '(' not in target:
+                out[alias or target] = copy.deepcopy(row.get(target))
+                continue
+            table, hint, inner = _embed_target(target)
+            out[alias or table] = self._embed(row, alias or table, table, hint, inner)
+        return out
+
+    def _inner_joined(self, rows):
+        """Drop rows whose `table!inner(...)` embeds match nothing, as PostgREST's inner joins do"""
+        for item in _split(self.columns):
+            alias, _, target = item.rpartition(':')
+            if '(' in target and '!inner' in target.partition('(')[0]:
+                table, hint, inner = _embed_target(target)
+                rows = [row for row in rows if self._embed(row, alias or table, table, hint, inner)]
+        return rows
+
+    def _embed(self, row, alias, table, hint, inner):
+        filters = self._embedded_filters.get(alias, [])
+        back = f'{_singular(self.table)}_id'
+        if hint.endswith('_fkey') and hint.startswith(f'{self.table}_'):
+            to_one = hint[len(self.table) + 1:-len('_fkey')]
+        elif hint.endswith('_fkey'):
+            # A foreign key of the embedded table pointing back at this row
+            to_one, back = None, hint[len(table) + 1:-len('_fkey')]
+        else:
+            to_one = f'{_singular(table)}_id' if f'{_singular(table)}_id' in row else None
+
+        if to_one:
+            for target in self.client._lookup(table, [('id', [row.get(to_one)])]):
+                if all(f(target) for f in filters):
+                    return self._columns(target, inner)
+            return None
+
+        related = [t for t in self.client._lookup(table, [(back, [row.get('id')])]) if all(f(t) for f in filters)]
+        if inner.strip() == 'count':
+            return [{'count': len(related)}]
+        return [self._columns(target, inner) for target in related]
+
+    @staticmethod
+    def _columns(row, inner):
+        columns = _split(inner)
+        if '*' in columns:
+            return copy.deepcopy(row)
+        return {column: copy.deepcopy(row.get(column)) for column in columns}
+
+
+class FakeTable:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def select(self, *columns, count=None):
+        return FakeQuery(self.client, self.name, 'select', columns=','.join(columns) or '*', count=count)
+
+    def insert(self, payload, **kwargs):
+        return FakeQuery(self.client, self.name, 'insert', payload)
+
+    def upsert(self, payload, on_conflict=None, **kwargs):
+        return FakeQuery(self.client, self.name, 'upsert', payload, on_conflict=on_conflict)
+
+    def update(self, payload, **kwargs):
+        return FakeQuery(self.client, self.name, 'update', payload)
+
+    def delete(self, **kwargs):
+        return FakeQuery(self.client, self.name, 'delete')
+
+
+class FakeSupabase:
+    """`tables` maps table names to lists of row dicts and is used in place, not copied"""
+
+    def __init__(self, tables=None, latency=0.0, max_rows=1000):
+        self.tables = tables if tables is not None else {}
+        self.latency = latency
+        self.max_rows = max_rows
+        self.lock = threading.RLock()
+        self.calls = 0
+        self.calls_by_table = Counter()
+        self._indexes = {}
+
+    def table(self, table_name):
+        return FakeTable(self, table_name)
+
+    def reset_calls(self):
+        with self.lock:
+            self.calls = 0
+            self.calls_by_table.clear()
+
+    def _lookup(self, table, lookups):
+        """Candidate rows of `table` matching any `(column, values)` lookup, in table order; filters still apply"""
+        rows = self.tables.get(table, [])
+        positions = set()
+        for column, values in lookups:
+            index = self._index(table, column)
+            if index is None:
+                return list(rows)
+            for value in values:
+                try:
+                    positions.update(index.get(_index_key(value), ()))
+                except TypeError:
+                    continue
+        return [rows[position] for position in sorted(positions)]
+
+    def _index(self, table, column):
+        """`{key: [positions]}` for a column, or None if it holds unhashable values"""
+        key = (table, column)
+        if key not in self._indexes:
+            index = {}
+            for position, row in enumerate(self.tables.get(table, [])):
+                try:
+                    index.setdefault(_index_key(row.get(column)), []).append(position)
+                except TypeError:
+                    # Arrays and other unhashable columns are not indexed
+                    index = None
+                    break
+            self._indexes[key] = index
+        return self._indexes[key]
+
+    def _estimate(self, table, lookups):
+        """Upper bound on the rows `_lookup` returns, without building the candidate list"""
+        total = 0
+        for column, values in lookups:
+            index = self._index(table, column)
+            if index is None:
+                return len(self.tables.get(table, []))
+            for value in values:
+                try:
+                    total += len(index.get(_index_key(value), ()))
+                except TypeError:
+                    continue
+        return total
+
+    @staticmethod
+    def _sort(rows, orders):
+        for column, desc in reversed(orders):
+            # Postgres puts nulls last ascending and first descending
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        return rows
+
+    def _ordered(self, table, orders):
+        key = (table, 'order', orders)
+        if key not in self._indexes:
+            self._indexes[key] = self._sort(list(self.tables.get(table, [])), orders)
+        return self._indexes[key]
+
+    def _changed(self, table):
+        for key in [key for key in self._indexes if key[0] == table]:
+            del self._indexes[key]
+
+    def _insert(self, table, item):
+        row = copy.deepcopy(item)
+        row.setdefault('id', str(uuid.uuid4()))
+        row.setdefault(TIMESTAMP_COLUMNS.get(table, 'created_at'), datetime.now(timezone.utc).isoformat())
+        self.tables.setdefault(table, []).append(row)
+        self._changed(table)
+        return row
+
+    def _upsert(self, table, item, on_conflict=None):
+        keys = (on_conflict or PRIMARY_KEYS.get(table, 'id')).split(',')
+        for row in self.tables.setdefault(table, []):
+            if all(k in item and row.get(k) == item[k] for k in keys):
+                row.update(copy.deepcopy(item))
+                self._changed(table)
+                return row
+        return self._insert(table, item)
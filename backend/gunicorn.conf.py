@@ -0,0 +1,37 @@
+"""gunicorn settings, read from the working directory by `gunicorn app:app`"""
+from config import PRELOAD_APP, WARM_UP, WORKER_CLASS, WORKER_CONCURRENCY
+
+if WORKER_CLASS == 'gevent':
+    # Patch before the app is imported, so with PRELOAD_APP its locks and sockets are cooperative too.
+    # Patching removes select.epoll, which httpcore's optional trio support imports; trio must not be installed.
+    from gevent import monkey
+    monkey.patch_all()
+
+worker_class = WORKER_CLASS
+if WORKER_CLASS == 'gthread':
+    # Request threads; idle keep-alive connections are held beyond these, up to gunicorn's worker_connections
+    threads = WORKER_CONCURRENCY
+elif WORKER_CLASS == 'gevent':
+    # Requests served at once, one greenlet each
+    worker_connections = WORKER_CONCURRENCY
+
+# Load the app once in the master; workers are forked from it and share its imported modules
+preload_app = PRELOAD_APP
+
+
+def when_ready(server):
+    if PRELOAD_APP:
+        import app
+        app.preload()
+        server.log.info('Preloaded heavy modules in %.2fs', app.startup['preload_seconds'])
+
+
+def post_worker_init(worker):
+    import app
+    if WARM_UP:
+        try:
+            app.warm_up()
+        except Exception:
+            # The first requests will build what warm-up could not
+            worker.log.exception('Warm-up failed')
+    worker.log.info('Worker %s started: %s', worker.pid, app.startup)
@@ -0,0 +1,66 @@
+"""Vectorized match scoring over sparse binary token matrices.
+
+Each kind of candidate is encoded once as a CSR matrix with one column
+block per token field. Scoring a user against every candidate of that kind
+is then a single sparse product, and reproduces calc_match_percent and the
+pairwise scorers exactly (same float operations, same half-even rounding).
+"""
+import numpy as np
+from scipy import sparse
+
+
+class ScoringMatrix:
+    """Binary (candidate x field token) matrix for one kind of candidate"""
+
+    def __init__(self, ids, docs, fields, creator_types=None):
+        self.ids = np.array(ids, dtype=object)
+        self.fields = fields
+        self.columns = {}
+        indices = []
+        indptr = [0]
+        self.sizes = np.zeros((len(ids), len(fields)))
+        for i, doc in enumerate(docs):
+            for f, field in enumerate(fields):
+                tokens = doc[field]
+                self.sizes[i, f] = len(tokens)
+                for token in tokens:
+                    indices.append(self.columns.setdefault((field, token), len(self.columns)))
+            indptr.append(len(indices))
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(len(ids), len(self.columns)),
+        )
+        self.creator_types = np.array(creator_types, dtype=object) if creator_types is not None else None
+
+    def scores(self, user_tokens, target_fields):
+        """Match score of every row against a user, as the pairwise scorers compute it.
+
+        `user_tokens[p]` is the user's normalized token set compared with
+        `target_fields[p]`; the score averages the per-pair percentages.
+        """
+        user_rows, user_cols = [], []
+        for p, (tokens, target_field) in enumerate(zip(user_tokens, target_fields)):
+            for token in tokens:
+                col = self.columns.get((target_field, token))
+                if col is not None:
+                    user_rows.append(p)
+                    user_cols.append(col)
+        user = sparse.csr_matrix(
+            (np.ones(len(user_cols)), (user_rows, user_cols)),
+            shape=(len(target_fields), len(self.columns)),
+        )
+        overlap = (self.matrix @ user.T).toarray()
+
+        target_sizes = self.sizes[:, [self.fields.index(field) for field in target_fields]]
+        denominator = np.maximum(target_sizes, np.array([len(tokens) for tokens in user_tokens]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percents = np.where(overlap > 0, np.round((overlap / denominator) * 100), 0)
+        return np.round(percents.sum(axis=1) / len(target_fields))
+
+    def matches(self, user_tokens, target_fields, creator_types=None):
+        """Ids and scores of rows with a positive score, optionally filtered by creator type"""
+        scores = self.scores(user_tokens, target_fields)
+        mask = scores > 0
+        if creator_types is not None and self.creator_types is not None:
+            mask &= np.isin(self.creator_types, creator_types)
+        return list(self.ids[mask]), scores[mask].astype(int)
@@ -0,0 +1,186 @@
+"""In-process inverted index from match tokens to profile and project ids.
+
+Explore only needs to score candidates that share at least one normalized
+token with the caller; every other candidate scores 0 in calc_match_percent.
+The index is built from Supabase on first use and patched in place by the
+write endpoints. Every `ttl` seconds (so workers pick up each other's
+writes) a background thread builds a fresh copy and swaps it in, while
+requests keep using the current one.
+"""
+import threading
+import time
+
+from db import fetch_all, parallel
+
+# kind -> (table, id column, token fields)
+INDEXED_TABLES = {
+    'student': ('student_profiles', 'user_id', ['skills', 'interests']),
+    'faculty': ('faculty_profiles', 'user_id', ['expertise', 'research_areas']),
+    'industry': ('industry_profiles', 'user_id', ['expertise', 'mentoring_focus']),
+    'project': ('projects', 'id', ['required_skills', 'required_expertise']),
+}
+
+
+def normalize_tokens(values):
+    """Normalize a list of strings exactly the way calc_match_percent does"""
+    return set(s.lower().strip() for s in (values or []) if s)
+
+
+def indexed_columns(kind):
+    """Columns needed to index and score one kind of candidate"""
+    _, id_col, fields = INDEXED_TABLES[kind]
+    return ', '.join([id_col] + fields + (['creator_type', 'status'] if kind == 'project' else []))
+
+
+def fetch_indexed_rows(client):
+    """Load the id and token columns of every indexed table, open projects only"""
+    def load(kind):
+        table, id_col, _ = INDEXED_TABLES[kind]
+        columns = indexed_columns(kind)
+        if kind == 'project':
+            return fetch_all(lambda: client.table(table).select(columns).eq('status', 'open').order('id'))
+        return fetch_all(lambda: client.table(table).select(columns).order(id_col))
+
+    kinds = list(INDEXED_TABLES)
+    return dict(zip(kinds, parallel(*[lambda kind=kind: load(kind) for kind in kinds])))
+
+
+class MatchIndex:
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.built_at = None
+        self._lock = threading.RLock()
+        self._postings = {}
+        self._docs = {}
+        self._creator_types = {}
+        self._matrices = {}
+        # Writes made while a background refresh runs, replayed onto the fresh copy; None when idle
+        self._journal = None
+
+    def ensure_built(self, client):
+        """Build the index if it is missing; refresh it in the background once older than the TTL"""
+        if self.built_at is None:
+            with self._lock:
+                if self.built_at is None:
+                    self.rebuild(client)
+        elif time.monotonic() - self.built_at > self.ttl:
+            with self._lock:
+                if self._journal is not None:
+                    return
+                self._journal = []
+            threading.Thread(target=self._refresh, args=(client,), name='match-index-refresh', daemon=True).start()
+
+    def rebuild(self, client):
+        self.load(fetch_indexed_rows(client))
+
+    def _refresh(self, client):
+        try:
+            fresh = MatchIndex(self.ttl)
+            fresh.load(fetch_indexed_rows(client))
+            # Matrices in use are rebuilt here, not by the first request after the swap
+            for kind in list(self._matrices):
+                fresh.scoring_matrix(kind)
+        except Exception as e:
+            print("Error refreshing match index:", str(e))
+            with self._lock:
+                self._journal = None
+            return
+        with self._lock:
+            for op, kind, value in self._journal:
+                if op == 'upsert':
+                    fresh.upsert(kind, value)
+                else:
+                    fresh.remove(kind, value)
+            self._postings, self._docs = fresh._postings, fresh._docs
+            self._creator_types, self._matrices = fresh._creator_types, fresh._matrices
+            self.built_at = fresh.built_at
+            self._journal = None
+
+    def load(self, rows_by_kind):
+        """Replace the index contents with `{kind: rows}`"""
+        with self._lock:
+            self._postings = {kind: {field: {} for field in spec[2]} for kind, spec in INDEXED_TABLES.items()}
+            self._docs = {kind: {} for kind in INDEXED_TABLES}
+            self._creator_types = {}
+            self._matrices = {}
+            for kind, rows in rows_by_kind.items():
+                for row in rows:
+                    self._add(kind, row)
+            self.built_at = time.monotonic()
+
+    def upsert(self, kind, row):
+        """Reindex one profile or project row after a write"""
+        with self._lock:
+            if self.built_at is None:
+                return
+            if self._journal is not None:
+                self._journal.append(('upsert', kind, row))
+            id_col = INDEXED_TABLES[kind][1]
+            self._remove(kind, row[id_col])
+            if kind == 'project' and row.get('status', 'open') != 'open':
+                return
+            self._add(kind, row)
+
+    def remove(self, kind, entity_id):
+        with self._lock:
+            if self.built_at is not None:
+                if self._journal is not None:
+                    self._journal.append(('remove', kind, entity_id))
+                self._remove(kind, entity_id)
+
+    def tokens(self, kind, entity_id):
+        """Indexed `{field: tokens}` of one entity, or None if it is not indexed"""
+        with self._lock:
+            return self._docs[kind].get(entity_id)
+
+    def ids_with_tokens(self, kind, field, tokens):
+        """Ids of `kind` whose `field` contains any of `tokens`"""
+        with self._lock:
+            ids = set()
+            postings = self._postings[kind][field]
+            for token in tokens:
+                ids.update(postings.get(token, ()))
+            return ids
+
+    def scoring_matrix(self, kind):
+        """Sparse token matrix of every indexed `kind`, rebuilt lazily after writes"""
+        with self._lock:
+            matrix = self._matrices.get(kind)
+            if matrix is None:
+                # numpy and scipy load with the first scoring call, not with every worker
+                from match_engine import ScoringMatrix
+                docs = self._docs[kind]
+                ids = list(docs)
+                creator_types = [self._creator_types.get(i) for i in ids] if kind == 'project' else None
+                matrix = ScoringMatrix(ids, [docs[i] for i in ids], INDEXED_TABLES[kind][2], creator_types)
+                self._matrices[kind] = matrix
+            return matrix
+
+    def _add(self, kind, row):
+        self._matrices.pop(kind, None)
+        _, id_col, fields = INDEXED_TABLES[kind]
+        entity_id = row[id_col]
+        doc = {field: normalize_tokens(row.get(field)) for field in fields}
+        self._docs[kind][entity_id] = doc
+        for field, tokens in doc.items():
+            postings = self._postings[kind][field]
+            for token in tokens:
+                postings.setdefault(token, set()).add(entity_id)
+        if kind == 'project':
+            self._creator_types[entity_id] = row.get('creator_type')
+
+    def _remove(self, kind, entity_id):
+        doc = self._docs[kind].pop(entity_id, None)
+        if doc is None:
+            return
+        self._matrices.pop(kind, None)
+        for field, tokens in doc.items():
+            postings = self._postings[kind][field]
+            for token in tokens:
+                ids = postings.get(token)
+                if ids is not None:
+                    ids.discard(entity_id)
+                    if not ids:
+                        del postings[token]
+        if kind == 'project':
+            self._creator_types.pop(entity_id, None)
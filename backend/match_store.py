@@ -0,0 +1,292 @@
+"""Materialized top-K matches per user, recomputed in the background.
+
+Matches are stored one row per user in the `match_scores` table:
+
+    create table match_scores (
+        user_id uuid primary key references users(id) on delete cascade,
+        user_type text not null,
+        matches jsonb not null default '[]',   -- [{type, id, match, why}], best first
+        match_count integer not null default 0, -- matches before the top-K cut
+        computed_at timestamptz not null default now()
+    );
+
+    create table match_fingerprints (
+        kind text not null,                     -- student, faculty, industry or project
+        entity_id text not null,
+        fingerprint text not null,              -- hash of the row's indexed columns
+        tokens jsonb not null default '{}',     -- {field: [normalized tokens]}
+        primary key (kind, entity_id)
+    );
+
+Run `flask --app app recompute-matches --interval 600` as a background
+worker. Each run reloads the token columns of every profile and open
+project and rescores only users whose own profile changed, or who share a
+token with a candidate that was added, edited or removed since the last run.
+What each run saw is kept in `match_fingerprints`, so a restarted worker or
+a one-off run carries on from the previous run; only the very first run
+recomputes everyone.
+
+Between runs, `MatchFanOut` applies each profile or project write to the
+stored lists it changes as the write happens, so explore reads stay a
+single lookup and new matches show up without waiting for the next run.
+"""
+import hashlib
+import json
+from datetime import datetime, timezone
+
+from db import fetch_all, fetch_in
+from match_index import INDEXED_TABLES, MatchIndex, fetch_indexed_rows, normalize_tokens
+import matching
+from pagination import top_k
+
+TABLE = 'match_scores'
+FINGERPRINTS_TABLE = 'match_fingerprints'
+
+UPSERT_BATCH_SIZE = 500
+
+
+def read_matches(client, user_id):
+    """Stored matches for a user, or None if they have not been computed yet"""
+    result = client.table(TABLE).select('matches, match_count, computed_at').eq('user_id', user_id).execute()
+    return result.data[0] if result.data else None
+
+
+def match_record(user_type, user_id, profile, best, match_count, rows, computed_at):
+    """A `match_scores` row from a user's top (kind, id, match) list; `rows` holds `{kind: {id: row}}` for each"""
+    return {
+        'user_id': user_id,
+        'user_type': user_type,
+        'matches': [
+            {'type': kind, 'id': entity_id, 'match': score,
+             'why': matching.scorer_for(user_type, kind)(profile, rows[kind][entity_id])['why']}
+            for kind, entity_id, score in best
+            if entity_id in rows[kind]
+        ],
+        'match_count': match_count,
+        'computed_at': computed_at,
+    }
+
+
+def _fingerprint(row):
+    return hashlib.sha1(json.dumps(row, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class MatchRecomputer:
+    """Keeps `match_scores` current, rescoring only users affected by changes"""
+
+    def __init__(self, client, top_k=50):
+        self.client = client
+        self.top_k = top_k
+        self.index = MatchIndex()
+        self._fingerprints = None
+        self._tokens = None
+
+    def run(self):
+        """Recompute stale users; returns a summary of the run"""
+        if self._fingerprints is None:
+            self._load_fingerprints()
+        rows_by_kind = fetch_indexed_rows(self.client)
+        self.index.load(rows_by_kind)
+        rows = {
+            kind: {row[INDEXED_TABLES[kind][1]]: row for row in kind_rows}
+            for kind, kind_rows in rows_by_kind.items()
+        }
+
+        fingerprints = {}
+        tokens = {}
+        for kind, kind_rows in rows.items():
+            for entity_id, row in kind_rows.items():
+                fingerprints[(kind, entity_id)] = _fingerprint(row)
+                tokens[(kind, entity_id)] = self.index.tokens(kind, entity_id)
+
+        changed = {key for key in fingerprints.keys() | self._fingerprints.keys()
+                   if fingerprints.get(key) != self._fingerprints.get(key)}
+        dirty = self._affected_users(changed, tokens)
+
+        now = datetime.now(timezone.utc).isoformat()
+        records = []
+        for user_type, user_id in dirty:
+            profile = rows[user_type].get(user_id)
+            if profile is None:
+                continue
+            scored = matching.scored_candidates(self.index, user_type, profile)
+            best, _ = top_k(scored, matching.match_sort_key(user_type), self.top_k)
+            records.append(match_record(user_type, user_id, profile, best, len(scored), rows, now))
+
+        for i in range(0, len(records), UPSERT_BATCH_SIZE):
+            self.client.table(TABLE).upsert(records[i:i + UPSERT_BATCH_SIZE]).execute()
+
+        removed_users = [entity_id for kind, entity_id in changed
+                         if kind != 'project' and (kind, entity_id) not in fingerprints]
+        if removed_users:
+            for i in range(0, len(removed_users), UPSERT_BATCH_SIZE):
+                self.client.table(TABLE).delete().in_('user_id', removed_users[i:i + UPSERT_BATCH_SIZE]).execute()
+
+        # Saved last, so an interrupted run is repeated in full rather than skipped
+        self._save_fingerprints(changed, fingerprints, tokens)
+        self._fingerprints = fingerprints
+        self._tokens = tokens
+        return {'changed': len(changed), 'recomputed': len(records), 'removed': len(removed_users)}
+
+    def _load_fingerprints(self):
+        saved = fetch_all(lambda: self.client.table(FINGERPRINTS_TABLE)
+                          .select('kind, entity_id, fingerprint, tokens').order('kind').order('entity_id'))
+        self._fingerprints = {(row['kind'], row['entity_id']): row['fingerprint'] for row in saved}
+        self._tokens = {
+            (row['kind'], row['entity_id']): {field: set(values) for field, values in (row['tokens'] or {}).items()}
+            for row in saved
+        }
+
+    def _save_fingerprints(self, changed, fingerprints, tokens):
+        upserts = [
+            {'kind': kind, 'entity_id': entity_id, 'fingerprint': fingerprints[(kind, entity_id)],
+             'tokens': {field: sorted(values) for field, values in (tokens[(kind, entity_id)] or {}).items()}}
+            for kind, entity_id in changed if (kind, entity_id) in fingerprints
+        ]
+        for i in range(0, len(upserts), UPSERT_BATCH_SIZE):
+            self.client.table(FINGERPRINTS_TABLE).upsert(upserts[i:i + UPSERT_BATCH_SIZE]).execute()
+
+        removed = {}
+        for kind, entity_id in changed:
+            if (kind, entity_id) not in fingerprints:
+                removed.setdefault(kind, []).append(entity_id)
+        for kind, entity_ids in removed.items():
+            for i in range(0, len(entity_ids), UPSERT_BATCH_SIZE):
+                (self.client.table(FINGERPRINTS_TABLE).delete()
+                 .eq('kind', kind).in_('entity_id', entity_ids[i:i + UPSERT_BATCH_SIZE]).execute())
+
+    def _affected_users(self, changed, tokens):
+        """Users whose profile changed or who share a token with a changed candidate"""
+        dirty = set()
+        for kind, entity_id in changed:
+            if kind != 'project' and (kind, entity_id) in tokens:
+                dirty.add((kind, entity_id))
+
+            # Tokens the candidate has now or had at the last run
+            before = self._tokens.get((kind, entity_id)) or {}
+            after = tokens.get((kind, entity_id)) or {}
+            for user_type, targets in matching.MATCH_TARGETS.items():
+                for target_kind, _, field_pairs, _ in targets:
+                    if target_kind != kind:
+                        continue
+                    for user_field, candidate_field in field_pairs:
+                        shared = before.get(candidate_field, set()) | after.get(candidate_field, set())
+                        for user_id in self.index.ids_with_tokens(user_type, user_field, shared):
+                            dirty.add((user_type, user_id))
+        return dirty
+
+
+
+class MatchFanOut:
+    """Applies one profile or project write to the stored match lists it changes.
+
+    The scorers are symmetric in their token sets, so the written entity is
+    scored against every user who matches against its kind with one sparse
+    product per user type, before and after the write. Lists it enters,
+    leaves or moves in are patched in place and `match_count` is adjusted;
+    a list it drops out of while more matches exist than were stored is
+    rescored in full, since its next best match was never stored. A written
+    profile's own list is rebuilt from the index.
+    """
+
+    def __init__(self, client, index, load_rows, top_k=50):
+        self.client = client
+        self.index = index
+        # (kind, ids) -> full profile or project rows
+        self.load_rows = load_rows
+        self.top_k = top_k
+
+    def apply(self, kind, entity_id, row=None, before=None):
+        """Patch stored lists after `entity_id` changed from `before` to `row`.
+
+        Both are rows as stored in Supabase, None when the entity did not
+        exist before the write or was deleted by it.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        records = {}
+        rescore = set()
+        if kind in matching.MATCH_TARGETS:
+            if row is None:
+                self.client.table(TABLE).delete().eq('user_id', entity_id).execute()
+            else:
+                rescore.add((kind, entity_id))
+
+        for user_type, targets in matching.MATCH_TARGETS.items():
+            if not any(target[0] == kind for target in targets):
+                continue
+            after = self._reverse_scores(user_type, kind, row)
+            previous = self._reverse_scores(user_type, kind, before)
+            stored = {
+                record['user_id']: record
+                for record in fetch_in(self.client, TABLE, 'user_id', after.keys() | previous.keys(),
+                                       'user_id, user_type, matches, match_count')
+            }
+
+            entering = {}
+            for user_id, record in stored.items():
+                listed = self._listed(record, kind, entity_id)
+                rest = [match for match in record['matches'] if match is not listed]
+                score = after.get(user_id, 0)
+                count = record['match_count'] + (user_id in after) - (user_id in previous)
+                if listed is not None and score < listed['match'] and record['match_count'] > len(record['matches']):
+                    rescore.add((user_type, user_id))
+                elif score > 0 and self._makes_list(user_type, rest, kind, entity_id, score):
+                    entering[user_id] = (rest, score, count)
+                elif listed is not None or count != record['match_count']:
+                    records[user_id] = {**record, 'matches': rest, 'match_count': count, 'computed_at': now}
+
+            if entering:
+                profiles = self._rows(user_type, entering)
+                scorer = matching.scorer_for(user_type, kind)
+                sort_key = matching.match_sort_key(user_type)
+                for user_id, (rest, score, count) in entering.items():
+                    profile = profiles.get(user_id)
+                    if profile is None:
+                        continue
+                    match = {'type': kind, 'id': entity_id, 'match': score, 'why': scorer(profile, row)['why']}
+                    matches = sorted(rest + [match], key=lambda m: sort_key((m['type'], m['id'], m['match'])))
+                    records[user_id] = {'user_id': user_id, 'user_type': user_type,
+                                        'matches': matches[:self.top_k], 'match_count': count, 'computed_at': now}
+
+        for user_type, user_id in rescore:
+            profile = row if (user_type, user_id) == (kind, entity_id) else self._rows(user_type, [user_id]).get(user_id)
+            if profile is not None:
+                records[user_id] = self._rebuild(user_type, user_id, profile, now)
+
+        batch = list(records.values())
+        for i in range(0, len(batch), UPSERT_BATCH_SIZE):
+            self.client.table(TABLE).upsert(batch[i:i + UPSERT_BATCH_SIZE]).execute()
+        return {'updated': len(records), 'rescored': len(rescore)}
+
+    def _reverse_scores(self, user_type, kind, row):
+        """{user_id: match} of every `user_type` user matching `row`"""
+        if row is None:
+            return {}
+        _, _, field_pairs, creator_types = next(t for t in matching.MATCH_TARGETS[user_type] if t[0] == kind)
+        if kind == 'project' and (row.get('status', 'open') != 'open' or row.get('creator_type') not in creator_types):
+            return {}
+        tokens = [normalize_tokens(row.get(candidate_field)) for _, candidate_field in field_pairs]
+        ids, scores = self.index.scoring_matrix(user_type).matches(tokens, [field for field, _ in field_pairs])
+        return dict(zip(ids, scores.tolist()))
+
+    @staticmethod
+    def _listed(record, kind, entity_id):
+        return next((m for m in record['matches'] if m['type'] == kind and m['id'] == entity_id), None)
+
+    def _makes_list(self, user_type, rest, kind, entity_id, score):
+        if len(rest) < self.top_k:
+            return True
+        sort_key = matching.match_sort_key(user_type)
+        worst = max(sort_key((m['type'], m['id'], m['match'])) for m in rest)
+        return sort_key((kind, entity_id, score)) < worst
+
+    def _rows(self, kind, ids):
+        id_col = INDEXED_TABLES[kind][1]
+        return {row[id_col]: row for row in self.load_rows(kind, list(ids))}
+
+    def _rebuild(self, user_type, user_id, profile, computed_at):
+        scored = matching.scored_candidates(self.index, user_type, profile)
+        best, _ = top_k(scored, matching.match_sort_key(user_type), self.top_k)
+        rows = {kind: self._rows(kind, [entity_id for k, entity_id, _ in best if k == kind])
+                for kind in {kind for kind, _, _ in best}}
+        return match_record(user_type, user_id, profile, best, len(scored), rows, computed_at)
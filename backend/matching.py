@@ -0,0 +1,261 @@
+"""Skill-overlap match scoring shared by the API and the match store"""
+from match_index import normalize_tokens
+
+
+def calc_match_percent(set1, set2):
+    """Calculate percentage match between two lists of strings"""
+    set1 = set(s.lower().strip() for s in (set1 or []) if s)
+    set2 = set(s.lower().strip() for s in (set2 or []) if s)
+    if not set1 or not set2:
+        return 0
+    overlap = set1 & set2
+    if not overlap:
+        return 0
+    score = round((len(overlap) / max(len(set1), len(set2))) * 100)
+    return score
+
+
+def listed(values):
+    """The non-empty entries of a token column, which may be null or hold nulls"""
+    return set(s for s in (values or []) if s)
+
+
+def student_to_faculty(student_profile, faculty_profile):
+    """Calculate match score between student and faculty"""
+    skills_score = calc_match_percent(
+        student_profile.get('skills', []),
+        faculty_profile.get('expertise', [])  # Using 'expertise' not 'technical_expertise'
+    )
+    interests_score = calc_match_percent(
+        student_profile.get('interests', []),
+        faculty_profile.get('research_areas', [])
+    )
+    
+    why = []
+    if skills_score > 0:
+        overlap = listed(student_profile.get('skills')) & listed(faculty_profile.get('expertise'))
+        why.append(f"Skills: {', '.join(overlap)}")
+    if interests_score > 0:
+        overlap = listed(student_profile.get('interests')) & listed(faculty_profile.get('research_areas'))
+        why.append(f"Interests: {', '.join(overlap)}")
+    
+    match_score = round((skills_score + interests_score) / 2)
+    return {"match": match_score, "why": why}
+
+def student_to_industry(student_profile, industry_profile):
+    """Calculate match score between student and industry mentor"""
+    skills_score = calc_match_percent(
+        student_profile.get('skills', []),
+        industry_profile.get('expertise', [])
+    )
+    interests_score = calc_match_percent(
+        student_profile.get('interests', []),
+        industry_profile.get('mentoring_focus', [])
+    )
+    
+    why = []
+    if skills_score > 0:
+        overlap = listed(student_profile.get('skills')) & listed(industry_profile.get('expertise'))
+        why.append(f"Skills: {', '.join(overlap)}")
+    if interests_score > 0:
+        overlap = listed(student_profile.get('interests')) & listed(industry_profile.get('mentoring_focus'))
+        why.append(f"Interests: {', '.join(overlap)}")
+    
+    match_score = round((skills_score + interests_score) / 2)
+    return {"match": match_score, "why": why}
+
+def student_to_project(student_profile, project):
+    """Calculate match score between student and project"""
+    skills_score = calc_match_percent(
+        student_profile.get('skills', []),
+        project.get('required_skills', [])
+    )
+    expertise_score = calc_match_percent(
+        student_profile.get('interests', []),
+        project.get('required_expertise', [])
+    )
+    
+    why = []
+    if skills_score > 0:
+        overlap = listed(student_profile.get('skills')) & listed(project.get('required_skills'))
+        why.append(f"Skills: {', '.join(overlap)}")
+    if expertise_score > 0:
+        overlap = listed(student_profile.get('interests')) & listed(project.get('required_expertise'))
+        why.append(f"Interests: {', '.join(overlap)}")
+    
+    match_score = round((skills_score + expertise_score) / 2)
+    return {"match": match_score, "why": why}
+
+def faculty_to_student(faculty_profile, student_profile):
+    """Calculate match score between faculty and student"""
+    expertise_score = calc_match_percent(
+        faculty_profile.get('expertise', []),
+        student_profile.get('skills', [])
+    )
+    research_score = calc_match_percent(
+        faculty_profile.get('research_areas', []),
+        student_profile.get('interests', [])
+    )
+    
+    why = []
+    if expertise_score > 0:
+        overlap = listed(faculty_profile.get('expertise')) & listed(student_profile.get('skills'))
+        why.append(f"Skills match: {', '.join(overlap)}")
+    if research_score > 0:
+        overlap = listed(faculty_profile.get('research_areas')) & listed(student_profile.get('interests'))
+        why.append(f"Interest match: {', '.join(overlap)}")
+    
+    match_score = round((expertise_score + research_score) / 2)
+    return {"match": match_score, "why": why}
+
+
+def faculty_to_project(faculty_profile, project):
+    """Calculate match score between faculty and student project"""
+    expertise_score = calc_match_percent(
+        faculty_profile.get('expertise', []),
+        project.get('required_skills', [])
+    )
+    research_score = calc_match_percent(
+        faculty_profile.get('research_areas', []),
+        project.get('required_expertise', [])
+    )
+    
+    why = []
+    if expertise_score > 0:
+        overlap = listed(faculty_profile.get('expertise')) & listed(project.get('required_skills'))
+        why.append(f"Skills: {', '.join(overlap)}")
+    if research_score > 0:
+        overlap = listed(faculty_profile.get('research_areas')) & listed(project.get('required_expertise'))
+        why.append(f"Expertise: {', '.join(overlap)}")
+    
+    match_score = round((expertise_score + research_score) / 2)
+    return {"match": match_score, "why": why}
+
+def industry_to_student(industry_profile, student_profile):
+    """Calculate match score between industry mentor and student"""
+    expertise_score = calc_match_percent(
+        industry_profile.get('expertise', []),
+        student_profile.get('skills', [])
+    )
+    focus_score = calc_match_percent(
+        industry_profile.get('mentoring_focus', []),
+        student_profile.get('interests', [])
+    )
+    
+    why = []
+    if expertise_score > 0:
+        overlap = listed(industry_profile.get('expertise')) & listed(student_profile.get('skills'))
+        why.append(f"Skills match: {', '.join(overlap)}")
+    if focus_score > 0:
+        overlap = listed(industry_profile.get('mentoring_focus')) & listed(student_profile.get('interests'))
+        why.append(f"Interest match: {', '.join(overlap)}")
+    
+    match_score = round((expertise_score + focus_score) / 2)
+    return {"match": match_score, "why": why}
+
+
+def industry_to_project(industry_profile, project):
+    """Calculate match score between industry mentor and student project"""
+    expertise_score = calc_match_percent(
+        industry_profile.get('expertise', []),
+        project.get('required_skills', [])
+    )
+    focus_score = calc_match_percent(
+        industry_profile.get('mentoring_focus', []),
+        project.get('required_expertise', [])
+    )
+    
+    why = []
+    if expertise_score > 0:
+        overlap = listed(industry_profile.get('expertise')) & listed(project.get('required_skills'))
+        why.append(f"Skills: {', '.join(overlap)}")
+    if focus_score > 0:
+        overlap = listed(industry_profile.get('mentoring_focus')) & listed(project.get('required_expertise'))
+        why.append(f"Expertise: {', '.join(overlap)}")
+    
+    match_score = round((expertise_score + focus_score) / 2)
+    return {"match": match_score, "why": why}
+
+
+# What each user type is matched against:
+# (candidate kind, scorer, (user field, candidate field) pairs, allowed project creator types)
+MATCH_TARGETS = {
+    "student": [
+        ("faculty", student_to_faculty, [("skills", "expertise"), ("interests", "research_areas")], None),
+        ("industry", student_to_industry, [("skills", "expertise"), ("interests", "mentoring_focus")], None),
+        ("project", student_to_project, [("skills", "required_skills"), ("interests", "required_expertise")], ["faculty", "industry"]),
+    ],
+    "faculty": [
+        ("student", faculty_to_student, [("expertise", "skills"), ("research_areas", "interests")], None),
+        ("project", faculty_to_project, [("expertise", "required_skills"), ("research_areas", "required_expertise")], ["student"]),
+    ],
+    "industry": [
+        ("student", industry_to_student, [("expertise", "skills"), ("mentoring_focus", "interests")], None),
+        ("project", industry_to_project, [("expertise", "required_skills"), ("mentoring_focus", "required_expertise")], ["student"]),
+    ],
+}
+
+
+def _matched_ids(index, user_type, profile):
+    """(kind, scorer, ids, scores) of every candidate kind, keeping only ids with match > 0"""
+    for kind, scorer, field_pairs, creator_types in MATCH_TARGETS.get(user_type, []):
+        user_tokens = [normalize_tokens(profile.get(source_field)) for source_field, _ in field_pairs]
+        target_fields = [target_field for _, target_field in field_pairs]
+        ids, scores = index.scoring_matrix(kind).matches(user_tokens, target_fields, creator_types)
+        yield kind, scorer, ids, scores
+
+
+def scorer_for(user_type, kind):
+    """The pairwise scorer used to match `user_type` against `kind`"""
+    for target_kind, scorer, _, _ in MATCH_TARGETS[user_type]:
+        if target_kind == kind:
+            return scorer
+    raise KeyError(kind)
+
+
+def scored_candidates(index, user_type, profile):
+    """(kind, id, match) for every indexed candidate with match > 0, without loading any rows"""
+    return [
+        (kind, entity_id, int(score))
+        for kind, _, ids, scores in _matched_ids(index, user_type, profile)
+        for entity_id, score in zip(ids, scores)
+    ]
+
+
+def semantic_candidates(matcher, user_type, profile, n=None):
+    """(kind, id, match) for every candidate whose free text is similar to the profile's.
+
+    `match` is the TF-IDF cosine similarity as a 0-100 percentage. With `n`,
+    only the `n` most similar candidates of each kind are returned.
+    """
+    scored = []
+    for kind, _, _, creator_types in MATCH_TARGETS.get(user_type, []):
+        if n is None:
+            ids, similarities = matcher.similarities(kind, user_type, profile, creator_types)
+        else:
+            ids, similarities = matcher.nearest(kind, user_type, profile, n, creator_types)
+        scored.extend(
+            (kind, entity_id, int(match))
+            for entity_id, match in zip(ids, (similarities * 100).round())
+            if match > 0
+        )
+    return scored
+
+
+def match_sort_key(user_type):
+    """Sort key for (kind, id, match): best match first, ties by candidate kind then id"""
+    kind_rank = {target[0]: i for i, target in enumerate(MATCH_TARGETS[user_type])}
+    return lambda scored: (-scored[2], kind_rank[scored[0]], str(scored[1]))
+
+
+def is_stale(kind, row, user_type):
+    """Whether a loaded candidate no longer qualifies, e.g. a project closed on another worker"""
+    if kind != "project":
+        return False
+    creator_types = next(t[3] for t in MATCH_TARGETS[user_type] if t[0] == kind)
+    return row.get("status") != "open" or row.get("creator_type") not in creator_types
+
+
+def count_matches(index, user_type, profile):
+    """Number of matches scored_candidates would return"""
+    return sum(len(ids) for _, _, ids, _ in _matched_ids(index, user_type, profile))
@@ -0,0 +1,319 @@
+"""Request latency and Supabase round-trip metrics in Prometheus text format.
+
+`instrument(client)` wraps a Supabase client so every `execute()` is timed
+per table and counted against the current request. `init_app(app)` records
+latency per route and the number of Supabase calls each request made, which
+is where N+1 query loops show up. Every worker process keeps its own
+metrics, so each worker has to be scraped separately. `report_pool()`
+adds the worker's PostgREST connection pool use to every scrape.
+
+Routes can declare how many round trips a request may make with
+`@query_budget(n)`; others get QUERY_BUDGET_DEFAULT. With QUERY_BUDGET_MODE
+set to `log` or `raise`, a request over its budget is logged with the stack
+of its first query over budget, or fails with QueryBudgetExceeded. Tests can
+also bound any block of code with `max_queries(n)`.
+"""
+import contextvars
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+from flask import current_app, g, request
+
+from config import QUERY_BUDGET_DEFAULT, QUERY_BUDGET_MODE
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            # One count per bucket, then the sum and the total count
+            series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self._series.items()):
+            label_text = _labels(self.label_names, labels)
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{_labels(self.label_names + ("le",), labels + (_number(bound),))} {count}')
+            lines.append(f'{self.name}_bucket{_labels(self.label_names + ("le",), labels + ("+Inf",))} {series[-1]}')
+            lines.append(f'{self.name}_sum{label_text} {series[-2]}')
+            lines.append(f'{self.name}_count{label_text} {series[-1]}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values = {}
+
+    def inc(self, labels, amount=1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for labels, value in sorted(self._values.items()):
+            lines.append(f'{self.name}{_labels(self.label_names, labels)} {value}')
+        return lines
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+
+_lock = threading.Lock()
+request_duration = Histogram(
+    'mentora_http_request_duration_seconds', 'Request latency by route.', ('route', 'method'), LATENCY_BUCKETS
+)
+requests_total = Counter('mentora_http_requests_total', 'Requests by route and status.', ('route', 'method', 'status'))
+request_queries = Histogram(
+    'mentora_supabase_queries_per_request', 'Supabase round trips made by one request.', ('route', 'method'),
+    QUERY_COUNT_BUCKETS
+)
+query_duration = Histogram(
+    'mentora_supabase_query_duration_seconds', 'Supabase round-trip latency by table.', ('table',), LATENCY_BUCKETS
+)
+query_errors = Counter('mentora_supabase_query_errors_total', 'Supabase calls that raised, by table.', ('table',))
+budget_exceeded = Counter(
+    'mentora_query_budget_exceeded_total', 'Requests that made more Supabase calls than their route allows.',
+    ('route', 'method')
+)
+
+# Returns the current PostgREST pool stats, rendered with every scrape
+_pool_stats = dict
+POOL_GAUGES = {
+    'in_flight': 'Supabase requests in flight in this worker.',
+    'connections': 'Open PostgREST connections in this worker.',
+    'idle_connections': 'Idle keep-alive PostgREST connections in this worker.',
+    'max_in_flight': 'Most Supabase requests in flight at once in this worker.',
+}
+POOL_COUNTERS = {
+    'requests': 'HTTP requests sent to PostgREST, retries included once.',
+    'retries': 'PostgREST requests retried after a failed connection or gateway error.',
+    'errors': 'PostgREST requests that failed after their retries.',
+}
+
+# Round trips made so far by the current request; worker threads share it through copied contexts
+_request_calls = contextvars.ContextVar('supabase_request_calls', default=None)
+_unbudgeted = contextvars.ContextVar('supabase_unbudgeted', default=False)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class _CallCount:
+    """Round trips made inside a request or `max_queries` block; nested counts also count toward outer ones"""
+
+    def __init__(self, budget=None, parent=None):
+        self.budget = budget
+        self.parent = parent
+        self.calls = 0
+        self.budgeted = 0
+        self.over_budget_stack = None
+        self.lock = threading.Lock()
+
+    def add(self, budgeted):
+        with self.lock:
+            self.calls += 1
+            if budgeted:
+                self.budgeted += 1
+                if self.budget and self.budgeted == self.budget + 1:
+                    self.over_budget_stack = ''.join(traceback.format_stack(limit=16)[:-3])
+        if self.parent is not None:
+            self.parent.add(budgeted)
+
+    def exceeded(self):
+        return bool(self.budget) and self.budgeted > self.budget
+
+
+def query_budget(limit):
+    """Declare the most Supabase round trips one request to this view may make"""
+    def decorate(view):
+        view.query_budget = limit
+        return view
+    return decorate
+
+
+@contextmanager
+def unbudgeted():
+    """Queries in this block are measured but not charged to the request, e.g. worker-wide cache rebuilds"""
+    token = _unbudgeted.set(True)
+    try:
+        yield
+    finally:
+        _unbudgeted.reset(token)
+
+
+@contextmanager
+def max_queries(limit):
+    """Raise QueryBudgetExceeded if the block, including requests made in it, makes more than `limit` calls"""
+    calls = _CallCount(limit, parent=_request_calls.get())
+    token = _request_calls.set(calls)
+    try:
+        yield calls
+    finally:
+        _request_calls.reset(token)
+    if calls.exceeded():
+        raise QueryBudgetExceeded(
+            f'{calls.budgeted} Supabase queries, budget {limit}; first query over budget:\n{calls.over_budget_stack}'
+        )
+
+
+def record_query(table, seconds, failed=False):
+    calls = _request_calls.get()
+    if calls is not None:
+        calls.add(not _unbudgeted.get())
+    with _lock:
+        query_duration.observe((table,), seconds)
+        if failed:
+            query_errors.inc((table,))
+
+
+def current_query_count():
+    """Supabase round trips made so far by the current request, or None outside a request"""
+    calls = _request_calls.get()
+    return calls.calls if calls is not None else None
+
+
+class _InstrumentedQuery:
+    """Proxy for a postgrest request builder that times `execute()`"""
+
+    def __init__(self, builder, table):
+        object.__setattr__(self, '_builder', builder)
+        object.__setattr__(self, '_table', table)
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if result is self._builder:
+                return self
+            if hasattr(result, 'execute'):
+                return _InstrumentedQuery(result, self._table)
+            return result
+        return call
+
+    def __setattr__(self, name, value):
+        # db helpers assign `query.params` directly
+        setattr(self._builder, name, value)
+
+    def execute(self):
+        started = time.perf_counter()
+        try:
+            result = self._builder.execute()
+        except Exception:
+            record_query(self._table, time.perf_counter() - started, failed=True)
+            raise
+        record_query(self._table, time.perf_counter() - started)
+        return result
+
+
+class InstrumentedClient:
+    """Supabase client whose table queries are timed and counted"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def table(self, table_name):
+        return _InstrumentedQuery(self.client.table(table_name), table_name)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def instrument(client):
+    return client if isinstance(client, InstrumentedClient) else InstrumentedClient(client)
+
+
+def init_app(app):
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+        budget = None
+        if current_app.config.get('QUERY_BUDGET_MODE', QUERY_BUDGET_MODE) != 'off':
+            view = current_app.view_functions.get(request.endpoint)
+            budget = getattr(view, 'query_budget', current_app.config.get('QUERY_BUDGET_DEFAULT', QUERY_BUDGET_DEFAULT))
+        g.metrics_calls_token = _request_calls.set(_CallCount(budget, parent=_request_calls.get()))
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop('metrics_started', None)
+        token = g.pop('metrics_calls_token', None)
+        if started is None:
+            return response
+        calls = _request_calls.get()
+        if token is not None:
+            _request_calls.reset(token)
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        with _lock:
+            request_duration.observe((route, request.method), time.perf_counter() - started)
+            requests_total.inc((route, request.method, str(response.status_code)))
+            request_queries.observe((route, request.method), calls.calls if calls is not None else 0)
+            if calls is not None and calls.exceeded():
+                budget_exceeded.inc((route, request.method))
+
+        if calls is not None and calls.exceeded():
+            message = (f'{request.method} {route} made {calls.budgeted} Supabase queries, budget {calls.budget}; '
+                       f'first query over budget:\n{calls.over_budget_stack}')
+            if current_app.config.get('QUERY_BUDGET_MODE', QUERY_BUDGET_MODE) == 'raise':
+                raise QueryBudgetExceeded(message)
+            current_app.logger.warning(message)
+        return response
+
+
+def report_pool(read_pool_stats):
+    """Render the PostgREST pool stats returned by `read_pool_stats()` with every scrape"""
+    global _pool_stats
+    _pool_stats = read_pool_stats
+
+
+def _render_pool():
+    stats = _pool_stats() or {}
+    lines = []
+    for kind, suffix, descriptions in (('gauge', '', POOL_GAUGES), ('counter', '_total', POOL_COUNTERS)):
+        for key, help_text in descriptions.items():
+            if key in stats:
+                name = f'mentora_supabase_pool_{key}{suffix}'
+                lines.extend([f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {stats[key]}'])
+    return lines
+
+
+def render():
+    """All metrics of this process in Prometheus text exposition format"""
+    with _lock:
+        lines = []
+        for metric in (request_duration, requests_total, request_queries, query_duration, query_errors, budget_exceeded):
+            lines.extend(metric.render())
+    lines.extend(_render_pool())
+    return '\n'.join(lines) + '\n'
@@ -1,24 +1,44 @@
+"""TF-IDF matching on the free text of profiles and projects.
+
+The vectorizer is fitted once (`flask fit-semantic-model`) and saved along
+with every document's vector. Workers load that file on first use and only
+transform documents that are new or changed since, so no worker pays the
+fit cost at boot. Run `python model.py` for the original CSV demo.
+"""
+import hashlib
+import itertools
 import os
 import re
-import pandas as pd 
+import threading
+import time
+
+import joblib
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from ann import ImpactIndex, top_n
+from db import fetch_all, parallel
+from match_index import INDEXED_TABLES
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 students_path = os.path.join(BASE_DIR, "students.csv")
 projects_path = os.path.join(BASE_DIR, "projects.csv")
 faculty_path = os.path.join(BASE_DIR,"faculty.csv")
 
-#testing bruhh!! 
-#print(student.head)
-#print (projects.head)
-#loading 
-students = pd.read_csv(students_path)   # Student_ID, Name, Profile
-projects = pd.read_csv(projects_path) 
-faculty= pd.read_csv(faculty_path)
+# kind -> columns whose text is vectorized; list columns are joined
+TEXT_FIELDS = {
+    'student': ['skills', 'interests', 'bio'],
+    'faculty': ['expertise', 'research_areas', 'bio'],
+    'industry': ['expertise', 'mentoring_focus', 'bio'],
+    'project': ['title', 'description', 'required_skills', 'required_expertise'],
+}
+
+
 # ---------- cleaning function ----------
 def clean_text(text):
-    if pd.isna(text):
+    if text is None or (isinstance(text, float) and np.isnan(text)):
         return ""
     text = str(text).lower()
     # remove punctuation (commas, dots, parentheses, etc.) and keep alphanum + spaces
@@ -26,43 +46,557 @@ def clean_text(text):
     # collapse multiple spaces
     text = re.sub(r'\s+', ' ', text).strip()
     return text
-# ---------- prepare cleaned text columns ----------
-students['clean_profile'] = students['Profile'].apply(clean_text)
-projects['clean_skills'] = projects['Required_Skills'].apply(clean_text)
-faculty['clean_expertise'] = faculty['Expertise'].apply(clean_text)
-
-student_txt = students['clean_profile']
-project_txt = projects['clean_skills']
-faculty_txt = faculty['clean_expertise']
-
-
-
-all_txt = pd. concat([student_txt, project_txt, faculty_txt])
-vt = TfidfVectorizer()
-vt.fit(all_txt)
-#vector formation
-student_vectors = vt.transform(student_txt)   # num_students x num_features
-project_vectors = vt.transform(project_txt)
-faculty_vectors = vt.transform(faculty_txt)
-#similarity
-similarity_matrix = cosine_similarity(student_vectors, project_vectors)
-student_faculty_sim = cosine_similarity(student_vectors, faculty_vectors)
-
-top_n = 2
-for i, student_row in students.iterrows():
-    scores = similarity_matrix[i]                 # similarity of student i with all projects
-    top_idx = np.argsort(-scores)[:top_n]         # indices of top projects
-    print(f"\n👩‍🎓 Student: {student_row['Name']} ({student_row['Profile']})")
-    print("Top Project Matches:")
-    for proj_idx in top_idx:
-        proj_row = projects.iloc[proj_idx]
-        score = scores[proj_idx]
-        print(f"  - {proj_row['Title']} (Skills: {proj_row['Required_Skills']}) | Score: {score:.2f}")
-
- # --- Faculty ---
-    top_faculty_idx = np.argsort(-student_faculty_sim[i])[:top_n]
-    print("Top Faculty Matches:")
-    for j in top_faculty_idx:
-        fac = faculty.iloc[j]
-        score = student_faculty_sim[i][j]
-        print(f"  - {fac['Name']} (Expertise: {fac['Expertise']}) | Score: {score:.2f}")
\ No newline at end of file
+
+
+def document_text(kind, row):
+    """Cleaned free text of one profile or project row"""
+    parts = []
+    for field in TEXT_FIELDS[kind]:
+        value = row.get(field)
+        if isinstance(value, (list, tuple)):
+            parts.extend(str(v) for v in value if v)
+        elif value:
+            parts.append(str(value))
+    return clean_text(' '.join(parts))
+
+
+def text_columns(kind):
+    _, id_col, _ = INDEXED_TABLES[kind]
+    return ', '.join([id_col] + TEXT_FIELDS[kind] + (['creator_type', 'status'] if kind == 'project' else []))
+
+
+def fetch_text_rows(client):
+    """Load the text columns of every profile and open project"""
+    def load(kind):
+        table, id_col, _ = INDEXED_TABLES[kind]
+        columns = text_columns(kind)
+        if kind == 'project':
+            return fetch_all(lambda: client.table(table).select(columns).eq('status', 'open').order('id'))
+        return fetch_all(lambda: client.table(table).select(columns).order(id_col))
+
+    kinds = list(TEXT_FIELDS)
+    return dict(zip(kinds, parallel(*[lambda kind=kind: load(kind) for kind in kinds])))
+
+
+class HashingTfidf:
+    """TF-IDF over hashed terms, with document frequencies counted alongside.
+
+    There is no vocabulary to refit: any worker maps any text, including
+    terms never seen before, to the same columns in O(tokens). Document
+    frequencies are kept up to date as documents are added, replaced and
+    removed (`add_documents`/`remove_documents` with their raw `counts`), so
+    new terms get a real idf without a refit. Tokenization and idf weighting
+    match TfidfVectorizer's defaults.
+    """
+
+    def __init__(self, n_features=2 ** 20):
+        self.n_features = n_features
+        self.hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+        self.df = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+        # Bumped on every document frequency change, so stored vectors know when to be reweighed
+        self.generation = 0
+        self._idf = None
+
+    def fit(self, texts, batch_size=10000):
+        """Count the document frequencies of `texts`, any iterable of strings, from scratch"""
+        self.df[:] = 0
+        self.n_docs = 0
+        texts = iter(texts)
+        while True:
+            batch = list(itertools.islice(texts, batch_size))
+            if not batch:
+                break
+            self.add_documents(self.counts(batch))
+        return self
+
+    def counts(self, texts):
+        """Raw hashed term counts of `texts`, one row per text"""
+        counts = self.hasher.transform(texts)
+        counts.sum_duplicates()
+        return counts
+
+    def add_documents(self, counts):
+        self._count(counts, 1)
+
+    def remove_documents(self, counts):
+        """Take back the document frequencies added for `counts`, e.g. of a document being replaced"""
+        self._count(counts, -1)
+
+    def _count(self, counts, sign):
+        if counts.shape[0]:
+            if counts.nnz * 64 < self.n_features:
+                # A few documents, e.g. one written row: touch only their terms
+                np.add.at(self.df, counts.indices, sign)
+            else:
+                self.df += sign * np.bincount(counts.indices, minlength=self.n_features)
+            self.n_docs += sign * counts.shape[0]
+            self.generation += 1
+            self._idf = None
+
+    @property
+    def idf(self):
+        if self._idf is None:
+            self._idf = np.log((1 + self.n_docs) / (1 + self.df)) + 1
+        return self._idf
+
+    def weigh(self, counts):
+        """Normalized TF-IDF vectors of raw `counts` under the current document frequencies"""
+        weighted = counts.astype(np.float64)
+        if self._idf is None and counts.nnz * 64 < self.n_features:
+            # Right after a document frequency change, only the idf of these terms is computed
+            weighted.data *= np.log((1 + self.n_docs) / (1 + self.df[counts.indices])) + 1
+        else:
+            weighted.data *= self.idf[counts.indices]
+        return normalize(weighted)
+
+    def transform(self, texts):
+        return self.weigh(self.counts(texts))
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_idf'] = None
+        return state
+
+
+FEATURIZERS = {'tfidf': TfidfVectorizer, 'hashing': HashingTfidf}
+
+
+def feature_count(vectorizer):
+    if isinstance(vectorizer, HashingTfidf):
+        return vectorizer.n_features
+    return len(vectorizer.vocabulary_)
+
+
+def _zero_row(matrix, row):
+    """Blank one row of a CSR matrix in place, keeping its shape and every other row"""
+    matrix.data[matrix.indptr[row]:matrix.indptr[row + 1]] = 0
+
+
+class DocumentVectors:
+    """TF-IDF vectors of one kind of document, with a digest per document to spot changes.
+
+    Documents written since the last `compact` are appended in small tail
+    blocks after the compacted `matrix`, and a replaced or removed
+    document's row is zeroed in place, its id set to None; a write never
+    copies the whole matrix. `SemanticMatcher.sync` compacts.
+
+    With `keep_counts` (hashing featurizer), the raw term counts of every
+    document are kept too, so its document frequencies can be taken back
+    when it is replaced or removed and every vector can be reweighed.
+    """
+
+    def __init__(self, n_features, keep_counts=False):
+        self.ids = []
+        self.digests = []
+        self.tags = []
+        self.matrix = sparse.csr_matrix((0, n_features))
+        self.counts = sparse.csr_matrix((0, n_features), dtype=np.int64) if keep_counts else None
+        # Document frequency generation every vector was last weighed under
+        self.weighed_at = None
+        # (vectors, counts) blocks appended since the last compaction, at positions after `matrix`
+        self._tail = []
+        self._tail_matrix = None
+        self._positions = {}
+        # Tag masks over the compacted rows
+        self._masks = {}
+
+    def update(self, vectorizer, docs, remove_missing=False):
+        """Apply `(id, text, tag)` docs, transforming only new or changed ones.
+
+        With `remove_missing`, documents not in `docs` are dropped. Returns
+        the number of documents transformed.
+        """
+        incoming = {}
+        for entity_id, text, tag in docs:
+            digest = hashlib.sha1(f'{tag}\0{text}'.encode('utf-8')).hexdigest()
+            incoming[entity_id] = (digest, text, tag)
+
+        changed = [
+            entity_id for entity_id, (digest, _, _) in incoming.items()
+            if entity_id not in self._positions or self.digests[self._positions[entity_id]] != digest
+        ]
+        stale = [self._positions[entity_id] for entity_id in changed if entity_id in self._positions]
+        if remove_missing:
+            stale += [position for entity_id, position in self._positions.items() if entity_id not in incoming]
+        self._drop(vectorizer, stale)
+        if changed:
+            texts = [incoming[entity_id][1] for entity_id in changed]
+            if self.counts is not None:
+                counts = vectorizer.counts(texts)
+                vectorizer.add_documents(counts)
+                self._append(changed, vectorizer.weigh(counts), incoming, counts)
+            else:
+                self._append(changed, vectorizer.transform(texts), incoming)
+        return len(changed)
+
+    def remove(self, vectorizer, entity_id):
+        if entity_id in self._positions:
+            self._drop(vectorizer, [self._positions[entity_id]])
+
+    def compact(self):
+        """Fold the tail into `matrix` and drop zeroed rows; O(size of every vector)"""
+        if not self._tail and len(self._positions) == len(self.ids):
+            return
+        alive = [position for position, entity_id in enumerate(self.ids) if entity_id is not None]
+        self.matrix = sparse.vstack([self.matrix] + [vectors for vectors, _ in self._tail], format='csr')[alive]
+        if self.counts is not None:
+            self.counts = sparse.vstack([self.counts] + [counts for _, counts in self._tail], format='csr')[alive]
+        self.ids = [self.ids[i] for i in alive]
+        self.digests = [self.digests[i] for i in alive]
+        self.tags = [self.tags[i] for i in alive]
+        self._positions = {entity_id: position for position, entity_id in enumerate(self.ids)}
+        self._tail = []
+        self._tail_matrix = None
+        self._masks = {}
+
+    def reweigh(self, vectorizer):
+        """Recompute every vector from its counts under the vectorizer's current document frequencies"""
+        if self.counts is not None and self.weighed_at != vectorizer.generation:
+            self.compact()
+            self.matrix = vectorizer.weigh(self.counts)
+            self.weighed_at = vectorizer.generation
+
+    @property
+    def compacted_rows(self):
+        return self.matrix.shape[0]
+
+    def tail_scores(self, query):
+        """Dot products of a (1 x features) query with the tail rows, at positions after `compacted_rows`"""
+        if not self._tail:
+            return np.zeros(0)
+        if self._tail_matrix is None:
+            self._tail_matrix = sparse.vstack([vectors for vectors, _ in self._tail], format='csr')
+        return (self._tail_matrix @ query.T).toarray().ravel()
+
+    def scores(self, query):
+        """Dot products of a (1 x features) query with every position; zeroed rows score 0"""
+        return np.concatenate([(self.matrix @ query.T).toarray().ravel(), self.tail_scores(query)])
+
+    def tag_mask(self, tags):
+        """Whether each position's tag is in `tags`"""
+        key = tuple(tags)
+        if key not in self._masks:
+            self._masks[key] = np.isin(np.array(self.tags[:self.compacted_rows], dtype=object), key)
+        tail = np.array([tag in key for tag in self.tags[self.compacted_rows:]], dtype=bool)
+        return np.concatenate([self._masks[key], tail])
+
+    def _append(self, changed, vectors, incoming, counts=None):
+        for entity_id in changed:
+            self._positions[entity_id] = len(self.ids)
+            self.ids.append(entity_id)
+            self.digests.append(incoming[entity_id][0])
+            self.tags.append(incoming[entity_id][2])
+        self._tail.append((vectors, counts))
+        self._tail_matrix = None
+
+    def _drop(self, vectorizer, positions):
+        """Zero the rows at `positions` in place and take back their document frequencies"""
+        if not positions:
+            return
+        located = [self._locate(position) for position in positions]
+        if self.counts is not None:
+            vectorizer.remove_documents(sparse.vstack([counts[row] for _, counts, row in located], format='csr'))
+        for position, (vectors, counts, row) in zip(positions, located):
+            _zero_row(vectors, row)
+            if counts is not None:
+                _zero_row(counts, row)
+            del self._positions[self.ids[position]]
+            self.ids[position] = None
+        self._tail_matrix = None
+
+    def _locate(self, position):
+        """`(vectors, counts, row)` of the block holding a position"""
+        if position < self.compacted_rows:
+            return self.matrix, self.counts, position
+        position -= self.compacted_rows
+        for vectors, counts in self._tail:
+            if position < vectors.shape[0]:
+                return vectors, counts, position
+            position -= vectors.shape[0]
+        raise IndexError(position)
+
+
+class SemanticMatcher:
+    """A fitted TF-IDF vectorizer plus the vectors of every profile and open project.
+
+    With `ann_depth` set, `nearest` searches an impact index keeping that
+    many postings per term instead of scoring every document.
+    """
+
+    def __init__(self, vectorizer, vectors=None, ann_depth=0):
+        self.vectorizer = vectorizer
+        self.vectors = vectors or {
+            kind: DocumentVectors(feature_count(vectorizer), keep_counts=isinstance(vectorizer, HashingTfidf))
+            for kind in TEXT_FIELDS
+        }
+        self.ann_depth = ann_depth
+        self.synced_at = None
+        self._lock = threading.RLock()
+        # kind -> (compacted matrix, its impact index)
+        self._ann = {}
+
+    @classmethod
+    def fit(cls, rows_by_kind, featurizer='tfidf'):
+        """Fit the vocabulary (or document frequencies) on every document in `{kind: rows}` and vectorize them"""
+        vectorizer = FEATURIZERS[featurizer]()
+        if not isinstance(vectorizer, HashingTfidf):
+            # Hashing counts document frequencies as sync adds each document
+            vectorizer.fit([document_text(kind, row) for kind, rows in rows_by_kind.items() for row in rows])
+        matcher = cls(vectorizer)
+        matcher.sync(rows_by_kind)
+        return matcher
+
+    @classmethod
+    def load(cls, path, ann_depth=0):
+        state = joblib.load(path)
+        return cls(state['vectorizer'], state['vectors'], ann_depth)
+
+    def save(self, path):
+        """Write the vectorizer and vectors; readers never see a partial file"""
+        with self._lock:
+            tmp_path = f'{path}.tmp'
+            joblib.dump({'vectorizer': self.vectorizer, 'vectors': self.vectors}, tmp_path)
+            os.replace(tmp_path, path)
+
+    def sync(self, rows_by_kind):
+        """Match the stored vectors to `{kind: rows}`; returns how many documents were transformed.
+
+        Rows written since the last sync are compacted, and vectors are
+        reweighed once document frequencies have changed, so documents left
+        untouched by single-row upserts catch up here.
+        """
+        with self._lock:
+            transformed = sum(
+                self.vectors[kind].update(self.vectorizer, self._docs(kind, rows), remove_missing=True)
+                for kind, rows in rows_by_kind.items()
+            )
+            for vectors in self.vectors.values():
+                vectors.compact()
+                vectors.reweigh(self.vectorizer)
+            self.synced_at = time.monotonic()
+            return transformed
+
+    def upsert(self, kind, row):
+        """Revectorize one profile or project row after a write, under the updated document frequencies.
+
+        Costs the row's own size: it is appended to the kind's tail and its
+        old vector zeroed in place.
+        """
+        with self._lock:
+            if kind == 'project' and row.get('status', 'open') != 'open':
+                self.vectors[kind].remove(self.vectorizer, row['id'])
+            else:
+                self.vectors[kind].update(self.vectorizer, self._docs(kind, [row]))
+
+    def remove(self, kind, entity_id):
+        with self._lock:
+            self.vectors[kind].remove(self.vectorizer, entity_id)
+
+    def similarities(self, kind, query_kind, query_row, tags=None):
+        """Ids and cosine similarities (0-1) of `kind` documents sharing a term with a query row.
+
+        `tags` restricts projects to the given creator types.
+        """
+        query = self.vectorizer.transform([document_text(query_kind, query_row)])
+        with self._lock:
+            vectors = self.vectors[kind]
+            scores = vectors.scores(query)
+            mask = scores > 0
+            if tags is not None:
+                mask &= vectors.tag_mask(tags)
+            return [vectors.ids[i] for i in np.flatnonzero(mask)], scores[mask]
+
+    def nearest(self, kind, query_kind, query_row, n, tags=None):
+        """Ids and cosine similarities of the `n` `kind` documents most similar to a query row, best first"""
+        query = self.vectorizer.transform([document_text(query_kind, query_row)])
+        with self._lock:
+            vectors = self.vectors[kind]
+            mask = vectors.tag_mask(tags) if tags is not None else None
+            if self.ann_depth:
+                # The index covers the compacted rows; rows written since are few and scored exactly
+                compacted = vectors.compacted_rows
+                positions, scores = self._ann_index(kind).query(
+                    query, n, mask[:compacted] if mask is not None else None
+                )
+                tail_scores = vectors.tail_scores(query)
+                if mask is not None:
+                    tail_scores = np.where(mask[compacted:], tail_scores, 0)
+                positions = np.concatenate([positions, compacted + np.arange(len(tail_scores))])
+                scores = np.concatenate([scores, tail_scores])
+            else:
+                positions = np.arange(len(vectors.ids))
+                scores = vectors.scores(query)
+                if mask is not None:
+                    scores = np.where(mask, scores, 0)
+            best = top_n(scores, n)
+            best = best[scores[best] > 0]
+            return [vectors.ids[i] for i in positions[best]], scores[best]
+
+    def build_indexes(self):
+        """Build the impact index of every kind now, so searches never build one"""
+        if self.ann_depth:
+            with self._lock:
+                for kind in self.vectors:
+                    self._ann_index(kind)
+
+    def _ann_index(self, kind):
+        """Impact index of the compacted rows; writes only touch the tail, so only sync outdates it"""
+        matrix = self.vectors[kind].matrix
+        built = self._ann.get(kind)
+        if built is None or built[0] is not matrix or built[1].depth != self.ann_depth:
+            built = self._ann[kind] = (matrix, ImpactIndex(matrix, self.ann_depth))
+        return built[1]
+
+    @staticmethod
+    def _docs(kind, rows):
+        id_col = INDEXED_TABLES[kind][1]
+        return [
+            (row[id_col], document_text(kind, row), row.get('creator_type') if kind == 'project' else None)
+            for row in rows
+        ]
+
+
+def top_n_rows(scores, n):
+    """Column positions and values of the `n` highest scores in each row, best first"""
+    if n < scores.shape[1]:
+        positions = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+    else:
+        positions = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    top = np.take_along_axis(scores, positions, axis=1)
+    order = np.argsort(-top, axis=1, kind='stable')
+    return np.take_along_axis(positions, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+
+def blockwise_top_n(queries, candidate_sets, n, memory_mb=256):
+    """Yield `(start, [(positions, scores), ...])` with the top-n of each candidate set per query row.
+
+    Vectors must be L2-normalized (TfidfVectorizer's default), so dot
+    products are cosine similarities. Queries are scored in row blocks sized
+    so the dense scores against every candidate set fit in `memory_mb`; peak
+    memory does not grow with the number of queries.
+    """
+    n_candidates = sum(candidates.shape[0] for candidates in candidate_sets)
+    block_rows = max(1, int(memory_mb * 2 ** 20 // (8 * max(n_candidates, 1))))
+    transposed = [candidates.T.tocsc() for candidates in candidate_sets]
+    for start in range(0, queries.shape[0], block_rows):
+        block = queries[start:start + block_rows]
+        yield start, [top_n_rows((block @ candidates_t).toarray(), n) for candidates_t in transposed]
+
+
+def clean_series(texts):
+    """clean_text for a whole pandas Series at once, with vectorized string operations"""
+    return (
+        texts.fillna('').astype(str).str.lower()
+        .str.replace(r'[^a-z0-9\s]', ' ', regex=True)
+        .str.replace(r'\s+', ' ', regex=True)
+        .str.strip()
+    )
+
+
+def read_chunks(path, columns, chunk_size):
+    import pandas as pd
+    return pd.read_csv(path, usecols=columns, chunksize=chunk_size)
+
+
+def iter_clean_text(path, column, chunk_size):
+    """Cleaned text of one CSV column, read `chunk_size` rows at a time"""
+    for chunk in read_chunks(path, [column], chunk_size):
+        yield from clean_series(chunk[column])
+
+
+def load_candidates(vectorizer, path, text_column, columns, chunk_size):
+    """Candidate rows (only `columns`) and their vectors, transformed chunk by chunk"""
+    import pandas as pd
+    frames, vectors = [], []
+    for chunk in read_chunks(path, columns, chunk_size):
+        frames.append(chunk)
+        vectors.append(vectorizer.transform(clean_series(chunk[text_column])))
+    return pd.concat(frames, ignore_index=True), sparse.vstack(vectors, format='csr')
+
+
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Rank the best project and faculty matches for every student.')
+    parser.add_argument('--students', default=students_path)
+    parser.add_argument('--projects', default=projects_path)
+    parser.add_argument('--faculty', default=faculty_path)
+    parser.add_argument('--top-n', type=int, default=2)
+    parser.add_argument('--memory-mb', type=float, default=256, help='Memory budget for each block of similarities.')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='CSV rows read at a time.')
+    parser.add_argument('--vectorizer', help='Saved semantic model or vectorizer to use instead of fitting one.')
+    parser.add_argument('--featurizer', choices=sorted(FEATURIZERS), default='tfidf')
+    parser.add_argument('--output', help='Write matches to this JSONL file instead of printing them.')
+    args = parser.parse_args(argv)
+
+    if args.vectorizer:
+        vt = joblib.load(args.vectorizer)
+        if isinstance(vt, dict):
+            vt = vt['vectorizer']
+    else:
+        # Fit on a stream of cleaned text; the raw CSVs are never held in memory
+        vt = FEATURIZERS[args.featurizer]()
+        vt.fit(itertools.chain(
+            iter_clean_text(args.students, 'Profile', args.chunk_size),
+            iter_clean_text(args.projects, 'Required_Skills', args.chunk_size),
+            iter_clean_text(args.faculty, 'Expertise', args.chunk_size),
+        ))
+
+    # Every student is compared with every candidate, so candidates stay in memory
+    projects, project_vectors = load_candidates(
+        vt, args.projects, 'Required_Skills', ['Project_ID', 'Title', 'Required_Skills'], args.chunk_size
+    )
+    faculty, faculty_vectors = load_candidates(vt, args.faculty, 'Expertise', ['Name', 'Expertise'], args.chunk_size)
+    project_ids, project_titles = projects['Project_ID'].tolist(), projects['Title'].tolist()
+    project_skills, faculty_names = projects['Required_Skills'].tolist(), faculty['Name'].tolist()
+    faculty_expertise = faculty['Expertise'].tolist()
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else None
+    top_n = args.top_n
+    written = 0
+    try:
+        for students in read_chunks(args.students, ['Student_ID', 'Name', 'Profile'], args.chunk_size):
+            student_vectors = vt.transform(clean_series(students['Profile']))
+            #similarity, one block of students at a time
+            blocks = blockwise_top_n(student_vectors, [project_vectors, faculty_vectors], top_n, args.memory_mb)
+            ids, names, profiles = students['Student_ID'].tolist(), students['Name'].tolist(), students['Profile'].tolist()
+            for start, [(top_projects, project_scores), (top_faculty, faculty_scores)] in blocks:
+                for offset in range(len(top_projects)):
+                    i = start + offset
+                    if output:
+                        output.write(json.dumps({
+                            'student_id': ids[i],
+                            'name': names[i],
+                            'projects': [
+                                {'project_id': project_ids[p], 'title': project_titles[p], 'score': round(float(score), 4)}
+                                for p, score in zip(top_projects[offset], project_scores[offset])
+                            ],
+                            'faculty': [
+                                {'name': faculty_names[f], 'score': round(float(score), 4)}
+                                for f, score in zip(top_faculty[offset], faculty_scores[offset])
+                            ],
+                        }) + '\n')
+                        continue
+                    print(f"\n👩‍🎓 Student: {names[i]} ({profiles[i]})")
+                    print("Top Project Matches:")
+                    for proj_idx, score in zip(top_projects[offset], project_scores[offset]):
+                        print(f"  - {project_titles[proj_idx]} (Skills: {project_skills[proj_idx]}) | Score: {score:.2f}")
+
+                 # --- Faculty ---
+                    print("Top Faculty Matches:")
+                    for j, score in zip(top_faculty[offset], faculty_scores[offset]):
+                        print(f"  - {faculty_names[j]} (Expertise: {faculty_expertise[j]}) | Score: {score:.2f}")
+            written += len(students)
+            if output:
+                output.flush()
+    finally:
+        if output:
+            output.close()
+    if output:
+        print(f"Wrote matches for {written} students to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Opaque cursors and bounded top-K selection for paginated endpoints"""
+import base64
+import heapq
+import json
+
+
+def encode_cursor(key):
+    """Encode a sort key (a tuple of JSON values) as an opaque URL-safe cursor"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor back into its sort key; raises ValueError if it is malformed"""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(key, list):
+        raise ValueError('Invalid cursor')
+    return tuple(key)
+
+
+def parse_limit(value, default=None, maximum=200):
+    """Parse a `limit` query parameter; None means unbounded when there is no default"""
+    if value in (None, ''):
+        return default
+    limit = int(value)
+    if limit < 1:
+        raise ValueError('limit must be at least 1')
+    return min(limit, maximum)
+
+
+def top_k(items, key, limit=None, after=None):
+    """The `limit` smallest items by `key` that sort strictly after `after`.
+
+    Uses a bounded heap, so only `limit` items are kept in memory no matter
+    how many are scanned. Returns `(page, next_cursor)`; next_cursor is None
+    on the last page.
+    """
+    if after is not None:
+        items = (item for item in items if key(item) > after)
+    if limit is None:
+        return sorted(items, key=key), None
+    page = heapq.nsmallest(limit + 1, items, key=key)
+    if len(page) <= limit:
+        return page, None
+    page = page[:limit]
+    return page, encode_cursor(key(page[-1]))
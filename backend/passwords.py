@@ -0,0 +1,113 @@
+"""Password hashing and verification off the request thread.
+
+bcrypt is deliberately slow and CPU-bound, so it runs in a small process
+pool per worker instead of stalling every other request on that worker.
+At most PASSWORD_QUEUE_MAX operations may be queued or running at once;
+beyond that callers get PasswordPoolBusy immediately instead of piling up.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+
+from config import BCRYPT_ROUNDS, PASSWORD_POOL_SIZE, PASSWORD_QUEUE_MAX
+
+
+class PasswordPoolBusy(Exception):
+    pass
+
+
+_executor = None
+_executor_pid = None
+_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(PASSWORD_QUEUE_MAX)
+_stats = {
+    op: {'count': 0, 'seconds': 0.0, 'work_seconds': 0.0, 'max_seconds': 0.0}
+    for op in ('hash', 'verify')
+}
+_stats_lock = threading.Lock()
+_rejected = 0
+
+
+def _hash(password, rounds):
+    started = time.perf_counter()
+    hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+    return hashed, time.perf_counter() - started
+
+
+def _verify(password, password_hash):
+    started = time.perf_counter()
+    ok = bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+    return ok, time.perf_counter() - started
+
+
+def _get_executor():
+    """This process's pool, created on first use so it never crosses a fork"""
+    global _executor, _executor_pid
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            # forkserver children start from a clean process, not a copy of a threaded worker
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _executor = ProcessPoolExecutor(PASSWORD_POOL_SIZE, mp_context=multiprocessing.get_context(method))
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _run(op, fn, *args):
+    global _executor, _rejected
+    if not _slots.acquire(blocking=False):
+        with _stats_lock:
+            _rejected += 1
+        raise PasswordPoolBusy('Too many password operations in progress, please retry')
+    started = time.perf_counter()
+    try:
+        if PASSWORD_POOL_SIZE > 0:
+            try:
+                result, work_seconds = _get_executor().submit(fn, *args).result()
+            except BrokenProcessPool:
+                with _lock:
+                    _executor = None
+                raise
+        else:
+            result, work_seconds = fn(*args)
+    finally:
+        _slots.release()
+    elapsed = time.perf_counter() - started
+    with _stats_lock:
+        stats = _stats[op]
+        stats['count'] += 1
+        stats['seconds'] += elapsed
+        stats['work_seconds'] += work_seconds
+        stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+    return result
+
+
+def hash_password(password):
+    return _run('hash', _hash, password, BCRYPT_ROUNDS)
+
+
+def verify_password(password, password_hash):
+    return _run('verify', _verify, password, password_hash)
+
+
+def needs_rehash(password_hash):
+    """Whether a stored hash was made with a different cost than BCRYPT_ROUNDS"""
+    try:
+        return int(password_hash.split('$')[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+def stats():
+    """Operation counts and latencies; `seconds` includes time waiting for the pool"""
+    with _stats_lock:
+        return {
+            **{op: dict(values) for op, values in _stats.items()},
+            'rejected': _rejected,
+            'pool_size': PASSWORD_POOL_SIZE,
+            'queue_max': PASSWORD_QUEUE_MAX,
+        }
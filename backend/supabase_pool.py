@@ -0,0 +1,158 @@
+"""Per-worker Supabase client with a bounded keep-alive connection pool.
+
+supabase-py gives PostgREST a plain httpx session: default pool limits, a
+fixed timeout, no retries. `WorkerClient` builds the real client lazily in
+each process, so under gunicorn every worker opens its own connections
+after the fork instead of inheriting the master's sockets, and replaces
+that session with one configured from SUPABASE_* settings. Failed
+connections, and 502/503/504 responses or dropped connections on reads,
+are retried with exponential backoff. HTTP/2 is used when SUPABASE_HTTP2
+is set and the optional `h2` package is installed.
+"""
+import importlib.util
+import logging
+import os
+import random
+import threading
+import time
+
+import httpx
+
+from config import (SUPABASE_CONNECT_TIMEOUT, SUPABASE_HTTP2, SUPABASE_KEEPALIVE_EXPIRY, SUPABASE_MAX_CONNECTIONS,
+                    SUPABASE_MAX_KEEPALIVE, SUPABASE_RETRIES, SUPABASE_RETRY_BACKOFF, SUPABASE_TIMEOUT)
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Wraps a pooled transport: retries with backoff and counts requests in flight"""
+
+    def __init__(self, transport, retries=SUPABASE_RETRIES, backoff=SUPABASE_RETRY_BACKOFF):
+        self.transport = transport
+        self.retries = retries
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self._counts = {'requests': 0, 'in_flight': 0, 'max_in_flight': 0, 'retries': 0, 'errors': 0}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counts[name] += amount
+            if name == 'in_flight':
+                self._counts['max_in_flight'] = max(self._counts['max_in_flight'], self._counts['in_flight'])
+
+    def handle_request(self, request):
+        idempotent = request.method in IDEMPOTENT_METHODS
+        self._count('requests')
+        self._count('in_flight')
+        try:
+            attempt = 0
+            while True:
+                try:
+                    response = self.transport.handle_request(request)
+                except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                    # The request never reached the server, so even writes are safe to resend
+                    if attempt >= self.retries:
+                        self._count('errors')
+                        raise
+                except (httpx.ReadTimeout, httpx.RemoteProtocolError, httpx.ReadError):
+                    if not idempotent or attempt >= self.retries:
+                        self._count('errors')
+                        raise
+                else:
+                    if not (idempotent and response.status_code in RETRY_STATUSES and attempt < self.retries):
+                        return response
+                    response.close()
+                attempt += 1
+                self._count('retries')
+                # Full jitter keeps workers that failed together from retrying together
+                time.sleep(random.uniform(0, self.backoff * 2 ** (attempt - 1)))
+        finally:
+            self._count('in_flight', -1)
+
+    def close(self):
+        self.transport.close()
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts)
+        # httpcore keeps no counters of its own; its connection list is the only view of the pool
+        connections = list(getattr(getattr(self.transport, '_pool', None), 'connections', []))
+        counts['connections'] = len(connections)
+        counts['idle_connections'] = sum(1 for connection in connections if connection.is_idle())
+        return counts
+
+
+def http2_available():
+    return importlib.util.find_spec('h2') is not None
+
+
+def build_client(url, key):
+    """A Supabase client whose PostgREST session uses the configured pool, timeouts and retries"""
+    # supabase-py also pulls in its auth, storage and realtime clients; only load them once a query needs them
+    from postgrest.utils import SyncClient
+    from supabase import create_client
+
+    client = create_client(url, key)
+    http2 = SUPABASE_HTTP2 and http2_available()
+    if SUPABASE_HTTP2 and not http2:
+        logger.warning('SUPABASE_HTTP2 is set but the h2 package is not installed; using HTTP/1.1')
+    transport = RetryTransport(httpx.HTTPTransport(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=SUPABASE_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_MAX_KEEPALIVE,
+            keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY,
+        ),
+    ))
+    default_session = client.postgrest.session
+    # PostgREST builders read `session` on every `from_()`, so swapping it covers every table query
+    client.postgrest.session = SyncClient(
+        base_url=default_session.base_url,
+        headers=default_session.headers,
+        timeout=httpx.Timeout(SUPABASE_TIMEOUT, connect=SUPABASE_CONNECT_TIMEOUT),
+        transport=transport,
+    )
+    default_session.close()
+    return client, transport
+
+
+class WorkerClient:
+    """Supabase client of the current process, built on first use and rebuilt after a fork"""
+
+    def __init__(self, url, key):
+        self.url = url
+        self.key = key
+        self._client = None
+        self._transport = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def client(self):
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    # An inherited client is dropped, not closed: its sockets still belong to the parent
+                    self._client, self._transport = build_client(self.url, self.key)
+                    self._pid = pid
+        return self._client
+
+    def table(self, table_name):
+        return self.client().table(table_name)
+
+    def __getattr__(self, name):
+        return getattr(self.client(), name)
+
+    def pool_stats(self):
+        """Connection pool use of this worker; empty until its first query"""
+        if self._pid != os.getpid():
+            return {}
+        return {
+            **self._transport.stats(),
+            'max_connections': SUPABASE_MAX_CONNECTIONS,
+            'max_keepalive_connections': SUPABASE_MAX_KEEPALIVE,
+            'http2': SUPABASE_HTTP2 and http2_available(),
+        }
@@ -0,0 +1,144 @@
+"""Indexed explore returns exactly what scoring every candidate pairwise returns"""
+import random
+
+import pytest
+
+import benchmark
+import match_store
+import matching
+from fake_supabase import FakeSupabase
+
+# Token fields of each table, which the index normalizes like calc_match_percent
+MESSY_FIELDS = {
+    'student_profiles': ['skills', 'interests'],
+    'faculty_profiles': ['expertise', 'research_areas'],
+    'industry_profiles': ['expertise', 'mentoring_focus'],
+    'projects': ['required_skills', 'required_expertise'],
+}
+
+
+def messy(values, rng):
+    """The same tokens with mixed casing, padding, duplicates, blanks and None entries"""
+    out = []
+    for value in values or []:
+        value = rng.choice([value, value.upper(), value.title(), f'  {value} ', f'{value.capitalize()}\t'])
+        out.append(value)
+        if rng.random() < 0.2:
+            out.append(value.swapcase())
+    for extra in (None, '', '   '):
+        if rng.random() < 0.2:
+            out.insert(rng.randrange(len(out) + 1), extra)
+    return out
+
+
+@pytest.fixture
+def campus():
+    rng = random.Random(11)
+    tables = benchmark.generate_campus(250, seed=11)
+    for table, fields in MESSY_FIELDS.items():
+        for row in tables[table]:
+            for field in fields:
+                roll = rng.random()
+                if roll < 0.05:
+                    row[field] = None
+                elif roll < 0.1:
+                    row[field] = []
+                else:
+                    row[field] = messy(row[field], rng)
+    fake = FakeSupabase(tables)
+    return tables, benchmark.load_app(fake)
+
+
+def baseline(tables, user_id):
+    """Every candidate with a match above 0, scored pairwise like the original explore loop"""
+    user_type = next(u['user_type'] for u in tables['users'] if u['id'] == user_id)
+    profile = next(p for p in tables[f'{user_type}_profiles'] if p['user_id'] == user_id)
+    results = set()
+    for kind, scorer, _, creator_types in matching.MATCH_TARGETS[user_type]:
+        if kind == 'project':
+            candidates = [p for p in tables['projects']
+                          if p['status'] == 'open' and p['creator_type'] in creator_types]
+        else:
+            candidates = tables[f'{kind}_profiles']
+        for candidate in candidates:
+            match = scorer(profile, candidate)
+            if match['match'] > 0:
+                entity_id = candidate['id'] if kind == 'project' else candidate['user_id']
+                results.add((kind, entity_id, match['match'], tuple(sorted(match['why']))))
+    return results
+
+
+def explore_all(client, user_id, min_score=1):
+    results, cursor, total = [], None, None
+    while True:
+        response = client.get(f'/api/explore?user_id={user_id}&limit=100&min_score={min_score}'
+                              + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200, response.json
+        results += response.json['results']
+        total = response.json['total'] if total is None else total
+        cursor = response.json['next_cursor']
+        if not cursor:
+            return results, total
+
+
+def as_set(results):
+    return {
+        (r['type'], r['project']['id'] if r['type'] == 'project' else r['profile']['user_id'],
+         r['match'], tuple(sorted(r['why'])))
+        for r in results
+    }
+
+
+def assert_matches_baseline(tables, client, user_ids):
+    for user_id in user_ids:
+        results, total = explore_all(client, user_id)
+        expected = baseline(tables, user_id)
+        assert as_set(results) == expected
+        assert total == len(expected) == len(results)
+        scores = [r['match'] for r in results]
+        assert scores == sorted(scores, reverse=True)
+
+
+def test_explore_matches_pairwise_scorers(campus):
+    tables, app = campus
+    user_ids = [p['user_id'] for kind in ('student', 'faculty', 'industry') for p in tables[f'{kind}_profiles']]
+    assert_matches_baseline(tables, app.app.test_client(), user_ids)
+
+
+def test_explore_matches_after_messy_writes(campus):
+    tables, app = campus
+    client = app.app.test_client()
+    # Build the index, then change it through the write endpoints
+    client.get(f"/api/explore?user_id={tables['student_profiles'][0]['user_id']}")
+
+    faculty = tables['faculty_profiles'][0]['user_id']
+    response = client.post('/api/projects', json={
+        'title': 'Messy', 'creator_id': faculty, 'creator_type': 'faculty',
+        'required_skills': [' PYTHON', None, 'Machine Learning ', ''], 'required_expertise': None,
+    })
+    assert response.status_code == 201
+    project = next(p for p in tables['projects'] if p['status'] == 'open' and p['creator_type'] == 'student')
+    response = client.put(f"/api/projects/{project['id']}", json={'required_skills': ['  SQL', 'sql', None, 'Java']})
+    assert response.status_code == 200
+
+    user_ids = [tables['student_profiles'][i]['user_id'] for i in range(20)]
+    user_ids += [p['user_id'] for p in tables['faculty_profiles'][:10]]
+    assert_matches_baseline(tables, client, user_ids)
+
+
+@pytest.mark.parametrize('stored', [False, True])
+def test_explore_total_counts_only_matches_above_min_score(campus, monkeypatch, stored):
+    tables, app = campus
+    if stored:
+        # A small top-K, so some users' matches above min_score run past the stored ones
+        tables['match_scores'] = []
+        match_store.MatchRecomputer(FakeSupabase(tables), top_k=5).run()
+        monkeypatch.setattr(app, 'MATCH_SCORES_ENABLED', True)
+    client = app.app.test_client()
+    user_ids = [p['user_id'] for kind in ('student', 'faculty', 'industry') for p in tables[f'{kind}_profiles'][:15]]
+    for user_id in user_ids:
+        expected = baseline(tables, user_id)
+        for min_score in (20, 40, 60):
+            results, total = explore_all(client, user_id, min_score)
+            assert as_set(results) == {match for match in expected if match[2] >= min_score}
+            assert total == len(results)
@@ -0,0 +1,128 @@
+"""Stored match lists patched on writes agree with a full MatchRecomputer run"""
+import copy
+import random
+
+import pytest
+
+import benchmark
+import match_store
+from db import fetch_in
+from fake_supabase import FakeSupabase
+from match_index import INDEXED_TABLES, MatchIndex
+
+TOP_K = 10
+
+
+def recomputed(tables):
+    """match_scores rows from recomputing every user of a copy of `tables`"""
+    tables = copy.deepcopy(tables)
+    tables['match_scores'] = []
+    tables['match_fingerprints'] = []
+    match_store.MatchRecomputer(FakeSupabase(tables), top_k=TOP_K).run()
+    return tables['match_scores']
+
+
+def comparable(records):
+    return {
+        record['user_id']: (
+            record['match_count'],
+            [(m['type'], m['id'], m['match'], sorted(m['why'])) for m in record['matches']],
+        )
+        for record in records
+    }
+
+
+@pytest.fixture
+def campus(monkeypatch):
+    tables = benchmark.generate_campus(400, seed=7)
+    tables['match_scores'] = []
+    fake = FakeSupabase(tables)
+    match_store.MatchRecomputer(fake, top_k=TOP_K).run()
+    app = benchmark.load_app(fake)
+    monkeypatch.setattr(app, 'MATCH_SCORES_ENABLED', True)
+    monkeypatch.setattr(app, 'MATCH_FAN_OUT', True)
+    monkeypatch.setattr(app, 'MATCH_TOP_K', TOP_K)
+    # Build this worker's index before any write
+    app.match_index.ensure_built(app.supabase)
+    return tables, fake, app
+
+
+def wait_for_fan_out(app):
+    if app.fan_out_executor is not None:
+        app.fan_out_executor.submit(lambda: None).result()
+
+
+def open_project(tables, creator_type):
+    return next(p for p in tables['projects'] if p['status'] == 'open' and p['creator_type'] == creator_type)
+
+
+def test_project_writes_match_recompute(campus):
+    tables, fake, app = campus
+    client = app.app.test_client()
+    rng = random.Random(1)
+    faculty = tables['faculty_profiles'][0]['user_id']
+
+    response = client.post('/api/projects', json={
+        'title': 'New project', 'creator_id': faculty, 'creator_type': 'faculty',
+        'required_skills': ['python', 'machine learning', 'sql'], 'required_expertise': ['statistics'],
+    })
+    assert response.status_code == 201
+    wait_for_fan_out(app)
+    assert comparable(tables['match_scores']) == comparable(recomputed(tables))
+
+    for creator_type in ('faculty', 'student'):
+        project = open_project(tables, creator_type)
+        response = client.put(f"/api/projects/{project['id']}",
+                              json={'required_skills': rng.sample(benchmark.SKILLS[:10], 3)})
+        assert response.status_code == 200
+        wait_for_fan_out(app)
+        assert comparable(tables['match_scores']) == comparable(recomputed(tables))
+
+    response = client.put(f"/api/projects/{open_project(tables, 'industry')['id']}", json={'status': 'closed'})
+    assert response.status_code == 200
+    wait_for_fan_out(app)
+    assert comparable(tables['match_scores']) == comparable(recomputed(tables))
+
+    response = client.delete(f"/api/projects/{open_project(tables, 'faculty')['id']}")
+    assert response.status_code == 200
+    wait_for_fan_out(app)
+    assert comparable(tables['match_scores']) == comparable(recomputed(tables))
+
+
+def test_update_after_another_worker_wrote_the_row(campus):
+    """The pre-write row comes from Supabase, not from this worker's index"""
+    tables, fake, app = campus
+    project = open_project(tables, 'faculty')
+    before = copy.deepcopy(project)
+
+    # Another worker edits the project and patches the stored lists with its own index
+    changed = fake.table('projects').update({'required_skills': ['python', 'deep learning']}) \
+        .eq('id', project['id']).execute().data[0]
+    other_index = MatchIndex()
+    other_index.ensure_built(fake)
+    other_index.upsert('project', changed)
+
+    def load_rows(kind, ids):
+        table, id_col, _ = INDEXED_TABLES[kind]
+        return fetch_in(fake, table, id_col, ids)
+
+    match_store.MatchFanOut(fake, other_index, load_rows, top_k=TOP_K).apply('project', project['id'], changed, before)
+    assert comparable(tables['match_scores']) == comparable(recomputed(tables))
+
+    # This worker's index still has the original skills when it writes the row again
+    response = app.app.test_client().put(f"/api/projects/{project['id']}", json={'required_skills': ['sql', 'java']})
+    assert response.status_code == 200
+    wait_for_fan_out(app)
+    assert comparable(tables['match_scores']) == comparable(recomputed(tables))
+
+
+def test_new_profile_matches_recompute(campus):
+    tables, fake, app = campus
+    tables['users'].append({'id': 'new-student', 'email': 'new@example.com', 'full_name': 'New', 'user_type': 'student'})
+
+    response = app.app.test_client().post('/api/profile/student', json={
+        'user_id': 'new-student', 'skills': ['python', 'react', 'sql'], 'interests': ['nlp'],
+    })
+    assert response.status_code == 201
+    wait_for_fan_out(app)
+    assert comparable(tables['match_scores']) == comparable(recomputed(tables))
@@ -0,0 +1,53 @@
+"""Background refresh of the match index"""
+import threading
+import time
+
+import benchmark
+from fake_supabase import FakeSupabase
+from match_index import MatchIndex
+
+
+class GatedSupabase(FakeSupabase):
+    """Holds every query until `gate` is set"""
+
+    def __init__(self, tables):
+        super().__init__(tables)
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def table(self, table_name):
+        self.gate.wait()
+        return super().table(table_name)
+
+
+def wait_for_refresh(index, timeout=10):
+    deadline = time.monotonic() + timeout
+    while index._journal is not None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_stale_index_serves_old_contents_until_refresh_swaps_in():
+    tables = benchmark.generate_campus(200, seed=3)
+    client = GatedSupabase(tables)
+    index = MatchIndex(ttl=0)
+    index.ensure_built(client)
+    project = next(p for p in tables['projects'] if p['status'] == 'open')
+    assert index.tokens('project', project['id']) is not None
+
+    # Another worker closes the project; this worker's refresh is held up
+    client.table('projects').update({'status': 'closed'}).eq('id', project['id']).execute()
+    client.gate.clear()
+    started = time.monotonic()
+    index.ensure_built(client)
+    assert time.monotonic() - started < 1
+    assert index.tokens('project', project['id']) is not None
+
+    # A write made during the refresh survives the swap
+    student = tables['student_profiles'][0]
+    index.upsert('student', {**student, 'skills': ['brand new skill']})
+    client.gate.set()
+    wait_for_refresh(index)
+
+    assert index.tokens('project', project['id']) is None
+    assert index.tokens('student', student['user_id'])['skills'] == {'brand new skill'}
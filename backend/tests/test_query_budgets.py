@@ -0,0 +1,70 @@
+"""Valid requests stay within their route's query budget, with and without stored matches"""
+import pytest
+
+import benchmark
+import match_store
+from fake_supabase import FakeSupabase
+
+TOP_K = 10
+
+
+@pytest.fixture(params=['stored', 'missing'])
+def campus(request, monkeypatch):
+    tables = benchmark.generate_campus(300, seed=5)
+    tables['match_scores'] = []
+    fake = FakeSupabase(tables)
+    if request.param == 'stored':
+        match_store.MatchRecomputer(fake, top_k=TOP_K).run()
+    app = benchmark.load_app(fake)
+    monkeypatch.setattr(app, 'MATCH_SCORES_ENABLED', True)
+    monkeypatch.setattr(app, 'MATCH_TOP_K', TOP_K)
+    app.app.config.update(TESTING=True, QUERY_BUDGET_MODE='raise')
+    return tables, app
+
+
+def sample_users(tables, per_type=5):
+    """Users of every type, mentors picked among those who own projects"""
+    creators = {p['creator_id'] for p in tables['projects']}
+    users = []
+    for user_type in ('student', 'faculty', 'industry'):
+        ids = [u['id'] for u in tables['users'] if u['user_type'] == user_type]
+        if user_type != 'student':
+            ids = [user_id for user_id in ids if user_id in creators] or ids
+        users += ids[:per_type]
+    return users
+
+
+def get_ok(client, path):
+    response = client.get(path)
+    assert response.status_code == 200, (path, response.json)
+    return response.json
+
+
+def test_read_endpoints_within_budget(campus):
+    tables, app = campus
+    client = app.app.test_client()
+    for user_id in sample_users(tables):
+        get_ok(client, f'/api/stats/dashboard/{user_id}')
+        page = get_ok(client, f'/api/explore?user_id={user_id}')
+        if page['next_cursor']:
+            get_ok(client, f'/api/explore?user_id={user_id}&cursor={page["next_cursor"]}')
+        get_ok(client, f'/api/projects/user/{user_id}?with_stats=true')
+        get_ok(client, f'/api/applications/user/{user_id}')
+
+    page = get_ok(client, '/api/projects?limit=20')
+    get_ok(client, f'/api/projects?limit=20&cursor={page["next_cursor"]}')
+    for project_id in list({a['project_id'] for a in tables['applications']})[:10]:
+        get_ok(client, f'/api/projects/{project_id}/stats')
+        get_ok(client, f'/api/applications/project/{project_id}')
+
+
+def test_dashboard_counts_received_applications(campus):
+    tables, app = campus
+    client = app.app.test_client()
+    for user_id in sample_users(tables):
+        user_type = next(u['user_type'] for u in tables['users'] if u['id'] == user_id)
+        if user_type == 'student':
+            continue
+        owned = {p['id'] for p in tables['projects'] if p['creator_id'] == user_id}
+        expected = sum(1 for a in tables['applications'] if a['project_id'] in owned)
+        assert get_ok(client, f'/api/stats/dashboard/{user_id}')['data']['applications'] == expected
@@ -0,0 +1,121 @@
+"""A hashing semantic model updated row by row agrees with one fitted from scratch"""
+import copy
+
+import numpy as np
+import pytest
+
+import benchmark
+import model
+from match_index import INDEXED_TABLES
+from model import TEXT_FIELDS, SemanticMatcher
+
+
+def text_rows(tables):
+    return {
+        kind: [row for row in tables[INDEXED_TABLES[kind][0]] if kind != 'project' or row['status'] == 'open']
+        for kind in TEXT_FIELDS
+    }
+
+
+def fitted(rows_by_kind):
+    return SemanticMatcher.fit(rows_by_kind, 'hashing')
+
+
+def vectors_by_id(matcher, kind):
+    vectors = matcher.vectors[kind]
+    vectors.compact()
+    return {entity_id: vectors.matrix[i].toarray().ravel() for i, entity_id in enumerate(vectors.ids)}
+
+
+@pytest.fixture
+def tables():
+    return benchmark.generate_campus(200, seed=3)
+
+
+def write_some(tables, matcher):
+    """Edit, add, close and remove rows, upserting each one into `matcher` like record_write does"""
+    student = tables['student_profiles'][0]
+    student['bio'] = 'Quantum annealing and zebrafish genomics'
+    matcher.upsert('student', student)
+
+    project = copy.deepcopy(tables['projects'][0])
+    project.update(id='prj-new', title='Zebrafish imaging', description='Brand new wording', status='open')
+    tables['projects'].append(project)
+    matcher.upsert('project', project)
+
+    closed = next(p for p in tables['projects'][1:] if p['status'] == 'open')
+    closed['status'] = 'closed'
+    matcher.upsert('project', closed)
+
+    removed = tables['faculty_profiles'].pop()
+    matcher.remove('faculty', removed['user_id'])
+
+
+def test_upserts_keep_document_frequencies(tables):
+    matcher = fitted(text_rows(tables))
+    write_some(tables, matcher)
+    student = tables['student_profiles'][1]
+    student['bio'] = 'Zebrafish genomics'
+    matcher.upsert('student', student)
+    reference = fitted(text_rows(tables))
+
+    assert matcher.vectorizer.n_docs == reference.vectorizer.n_docs
+    assert np.array_equal(matcher.vectorizer.df, reference.vectorizer.df)
+    # The written row is weighed with the updated frequencies, so its new terms do not keep the maximum idf
+    assert np.allclose(
+        vectors_by_id(matcher, 'student')[student['user_id']], vectors_by_id(reference, 'student')[student['user_id']]
+    )
+
+
+def test_sync_reweighs_untouched_rows(tables):
+    matcher = fitted(text_rows(tables))
+    write_some(tables, matcher)
+    assert matcher.sync(text_rows(tables)) == 0
+    reference = fitted(text_rows(tables))
+
+    for kind in TEXT_FIELDS:
+        ours, theirs = vectors_by_id(matcher, kind), vectors_by_id(reference, kind)
+        assert ours.keys() == theirs.keys()
+        for entity_id, vector in theirs.items():
+            assert np.allclose(ours[entity_id], vector)
+
+
+@pytest.mark.parametrize('featurizer', ['tfidf', 'hashing'])
+@pytest.mark.parametrize('ann_depth', [0, 50])
+def test_writes_do_not_copy_vectors(tables, featurizer, ann_depth):
+    matcher = SemanticMatcher.fit(text_rows(tables), featurizer)
+    matcher.ann_depth = ann_depth
+    student = tables['student_profiles'][2]
+    matcher.nearest('project', 'student', student, 10, tags=['faculty', 'industry'])
+    compacted = {kind: vectors.matrix for kind, vectors in matcher.vectors.items()}
+    write_some(tables, matcher)
+    assert all(matcher.vectors[kind].matrix is matrix for kind, matrix in compacted.items())
+
+    # Searching the tail and the zeroed rows finds what searching them compacted finds
+    reference = SemanticMatcher(matcher.vectorizer, copy.deepcopy(matcher.vectors), ann_depth)
+    for vectors in reference.vectors.values():
+        vectors.compact()
+    for query in tables['student_profiles'][:20]:
+        for tags in (None, ['faculty', 'industry'], ['student']):
+            ids, scores = matcher.nearest('project', 'student', query, 10, tags=tags)
+            expected_ids, expected_scores = reference.nearest('project', 'student', query, 10, tags=tags)
+            assert np.allclose(scores, expected_scores)
+            assert set(ids) == set(expected_ids) or len(set(np.round(scores, 9))) < len(scores)
+            ids, scores = matcher.similarities('project', 'student', query, tags=tags)
+            expected_ids, expected_scores = reference.similarities('project', 'student', query, tags=tags)
+            assert dict(zip(ids, np.round(scores, 9))) == dict(zip(expected_ids, np.round(expected_scores, 9)))
+
+
+def test_searches_after_writes_do_not_rebuild_the_ann_index(tables, monkeypatch):
+    matcher = SemanticMatcher.fit(text_rows(tables), 'hashing')
+    matcher.ann_depth = 50
+    matcher.build_indexes()
+
+    def rebuilt(*args):
+        raise AssertionError('impact index built on the search path')
+
+    monkeypatch.setattr(model, 'ImpactIndex', rebuilt)
+    write_some(tables, matcher)
+    for query in tables['student_profiles'][:5]:
+        for kind in TEXT_FIELDS:
+            matcher.nearest(kind, 'student', query, 10)
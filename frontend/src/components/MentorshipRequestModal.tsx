@@ -9,6 +9,7 @@ interface MentorshipRequestModalProps {
   recipientName: string;
   recipientType: 'student' | 'faculty' | 'industry';
   requestType: 'student_to_mentor' | 'mentor_to_student';
+  onSent?: () => void;
 }
 
 export default function MentorshipRequestModal({
@@ -17,7 +18,8 @@ export default function MentorshipRequestModal({
   recipientId,
   recipientName,
   recipientType,
-  requestType
+  requestType,
+  onSent
 }: MentorshipRequestModalProps) {
   const [message, setMessage] = useState('');
   const [loading, setLoading] = useState(false);
@@ -45,6 +47,7 @@ export default function MentorshipRequestModal({
 
       if (response.data.status === 'success') {
         setSuccess(true);
+        onSent?.();
         setTimeout(() => {
           onClose();
           setMessage('');
@@ -1,5 +1,5 @@
-import React, { useState, useEffect } from 'react';
-import { getProjects } from '../services/api';
+import React, { useState, useEffect, useRef } from 'react';
+import { getProjects, getProjectDomains, checkExistingApplications } from '../services/api';
 import { useAuth } from '../contexts/AuthContext';
 import { useNavigate } from 'react-router-dom';
 
@@ -19,70 +19,101 @@ interface Project {
   created_at: string;
 }
 
+// Columns the project cards render
+const LIST_FIELDS = 'title,description,creator_type,project_type,domain,required_skills,student_count_needed,duration,status';
+const PAGE_SIZE = 24;
+const GUEST_PAGE_SIZE = 6;
+// Milliseconds to wait after the last keystroke before searching
+const SEARCH_DELAY = 300;
+
 const BrowseProjects: React.FC = () => {
   const { user } = useAuth();
   const navigate = useNavigate();
   const [projects, setProjects] = useState<Project[]>([]);
-  const [filteredProjects, setFilteredProjects] = useState<Project[]>([]);
+  const [domains, setDomains] = useState<string[]>([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [totalProjects, setTotalProjects] = useState<number | null>(null);
   const [searchTerm, setSearchTerm] = useState('');
   const [selectedDomain, setSelectedDomain] = useState('all');
   const [selectedCreatorType, setSelectedCreatorType] = useState('all');
+  // Project id -> the user's application to it, or null
+  const [applications, setApplications] = useState<Record<string, any>>({});
+  // Only the newest first-page request may replace the list
+  const latestRequest = useRef(0);
 
   useEffect(() => {
-    fetchProjects();
+    getProjectDomains()
+      .then(response => setDomains(response.data.data))
+      .catch(error => console.error('Error fetching domains:', error));
   }, []);
 
   useEffect(() => {
-    filterProjects();
-  }, [searchTerm, selectedDomain, selectedCreatorType, projects]);
+    // The server filters and pages, so any filter change starts again from the first page
+    const timer = setTimeout(fetchProjects, searchTerm ? SEARCH_DELAY : 0);
+    return () => clearTimeout(timer);
+  }, [searchTerm, selectedDomain, selectedCreatorType]);
+
+  const filterParams = () => ({
+    status: 'open',
+    fields: LIST_FIELDS,
+    search: searchTerm.trim() || undefined,
+    domain: selectedDomain !== 'all' ? selectedDomain : undefined,
+    creator_type: selectedCreatorType !== 'all' ? selectedCreatorType : undefined,
+  });
 
   const fetchProjects = async () => {
+    const requestId = ++latestRequest.current;
     try {
-      const response = await getProjects({ status: 'open' });
-      const allProjects = response.data.data;
-      
-      // For guests, show only 6 projects
-      if (!user) {
-        setProjects(allProjects.slice(0, 6));
-      } else {
-        setProjects(allProjects);
-      }
-      setLoading(false);
+      // Guests only get a preview page
+      const response = await getProjects({
+        ...filterParams(),
+        limit: user ? PAGE_SIZE : GUEST_PAGE_SIZE,
+      });
+      if (requestId !== latestRequest.current) return;
+      setProjects(response.data.data);
+      setTotalProjects(response.data.total);
+      setNextCursor(user ? response.data.next_cursor : null);
+      checkApplied(response.data.data);
     } catch (error) {
       console.error('Error fetching projects:', error);
+    } finally {
       setLoading(false);
     }
   };
 
-  const filterProjects = () => {
-    let filtered = projects;
-
-    // Search filter
-    if (searchTerm) {
-      filtered = filtered.filter(project =>
-        project.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        project.description.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        project.domain?.toLowerCase().includes(searchTerm.toLowerCase())
-      );
-    }
-
-    // Domain filter
-    if (selectedDomain !== 'all') {
-      filtered = filtered.filter(project => project.domain === selectedDomain);
-    }
-
-    // Creator type filter
-    if (selectedCreatorType !== 'all') {
-      filtered = filtered.filter(project => project.creator_type === selectedCreatorType);
+  const loadMoreProjects = async () => {
+    if (!nextCursor) return;
+    const requestId = latestRequest.current;
+    setLoadingMore(true);
+    try {
+      const response = await getProjects({
+        ...filterParams(),
+        limit: PAGE_SIZE,
+        cursor: nextCursor,
+      });
+      // Filters changed while this page was loading
+      if (requestId !== latestRequest.current) return;
+      setProjects(prev => [...prev, ...response.data.data]);
+      setNextCursor(response.data.next_cursor);
+      checkApplied(response.data.data);
+    } catch (error) {
+      console.error('Error loading more projects:', error);
+    } finally {
+      setLoadingMore(false);
     }
-
-    setFilteredProjects(filtered);
   };
 
-  const getUniqueValues = (key: keyof Project) => {
-    const values = projects.map(p => p[key]).filter(Boolean);
-    return Array.from(new Set(values));
+  // One bulk check per page of cards instead of one request per card
+  const checkApplied = async (page: Project[]) => {
+    if (!user || page.length === 0) return;
+    try {
+      const response = await checkExistingApplications(user.id, page.map(project => project.id));
+      setApplications(prev => ({ ...prev, ...response.data.data }));
+    } catch (error) {
+      console.error('Error checking applications:', error);
+    }
   };
 
   const getProjectTypeLabel = (type: string) => {
@@ -195,7 +226,7 @@ const BrowseProjects: React.FC = () => {
           <p className="text-xl text-blue-100">
             {user 
               ? `Discover exciting opportunities to collaborate and learn`
-              : `Sign up to see all ${projects.length}+ projects and apply`
+              : `Sign up to see all ${totalProjects ?? projects.length}+ projects and apply`
             }
           </p>
         </div>
@@ -229,8 +260,8 @@ const BrowseProjects: React.FC = () => {
                 className="w-full px-4 py-3 border border-gray-200 rounded-xl focus:outline-none focus:ring-2 focus:ring-blue-500 transition-all"
               >
                 <option value="all">All Domains</option>
-                {getUniqueValues('domain').map(domain => (
-                  <option key={String(domain)} value={domain}>{domain}</option>
+                {domains.map(domain => (
+                  <option key={domain} value={domain}>{domain}</option>
                 ))}
               </select>
             </div>
@@ -279,14 +310,15 @@ const BrowseProjects: React.FC = () => {
         {/* Results Count */}
         <div className="flex justify-between items-center mb-6">
           <p className="text-gray-600">
-            Showing <span className="font-semibold text-gray-900">{filteredProjects.length}</span> projects
+            Showing <span className="font-semibold text-gray-900">{projects.length}</span>
+            {totalProjects !== null && <> of <span className="font-semibold text-gray-900">{totalProjects}</span></>} projects
           </p>
         </div>
 
         {/* Projects Grid */}
-        {filteredProjects.length > 0 ? (
+        {projects.length > 0 ? (
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6 mb-8">
-            {filteredProjects.map((project) => (
+            {projects.map((project) => (
               <div
                 key={project.id}
                 className="bg-white rounded-2xl shadow-lg hover:shadow-2xl transition-all duration-200 overflow-hidden cursor-pointer transform hover:-translate-y-1"
@@ -299,7 +331,7 @@ const BrowseProjects: React.FC = () => {
                       {getCreatorIcon(project.creator_type)} {getProjectTypeLabel(project.project_type)}
                     </span>
                     <span className="px-3 py-1 bg-white/20 backdrop-blur-sm rounded-full text-xs font-semibold text-white">
-                      {project.status}
+                      {applications[project.id] ? 'applied' : project.status}
                     </span>
                   </div>
                 </div>
@@ -372,6 +404,19 @@ const BrowseProjects: React.FC = () => {
           </div>
         )}
 
+        {/* Load More */}
+        {user && nextCursor && (
+          <div className="text-center mb-8">
+            <button
+              onClick={loadMoreProjects}
+              disabled={loadingMore}
+              className="px-8 py-3 bg-white border border-gray-200 text-gray-700 rounded-xl font-semibold hover:shadow-lg transition-all duration-200 disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : 'Load More Projects'}
+            </button>
+          </div>
+        )}
+
         {/* Guest CTA at bottom */}
         {!user && (
           <div className="bg-white rounded-2xl shadow-lg p-8 text-center">
@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Search, Users, TrendingUp, Filter } from 'lucide-react';
-import { getExploreMatches } from '../services/api';
+import { getExploreMatches, checkExistingApplications, checkMentorshipRequestsExist } from '../services/api';
 import MentorshipRequestModal from '../components/MentorshipRequestModal';
 
 interface MatchResult {
@@ -22,11 +22,19 @@ interface MatchResult {
   };
 }
 
+const PAGE_SIZE = 20;
+
 export default function ExplorePage() {
   const navigate = useNavigate();
   const [results, setResults] = useState<MatchResult[]>([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
+  const [total, setTotal] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  // Project id -> the user's application, recipient id -> their pending request (null when there is none)
+  const [applications, setApplications] = useState<Record<string, any>>({});
+  const [pendingRequests, setPendingRequests] = useState<Record<string, any>>({});
   
   // Filter state
   const [filters, setFilters] = useState({
@@ -97,9 +105,13 @@ export default function ExplorePage() {
     setFilteredResults(filtered);
   }, [results, filters]);
 
-  const fetchMatches = async () => {
+  const fetchMatches = async (cursor?: string) => {
     try {
-      setLoading(true);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
       setError('');
       
       const userStr = localStorage.getItem('user');
@@ -114,10 +126,13 @@ export default function ExplorePage() {
         return;
       }
       
-      const response = await getExploreMatches(userData.id);
+      const response = await getExploreMatches(userData.id, { limit: PAGE_SIZE, cursor });
       
       if (response.data.status === 'success') {
-        setResults(response.data.results);
+        setResults(prev => cursor ? [...prev, ...response.data.results] : response.data.results);
+        setTotal(response.data.total);
+        setNextCursor(response.data.next_cursor);
+        checkExisting(userData.id, response.data.results);
       } else {
         setError(response.data.message || 'Failed to load matches');
       }
@@ -126,6 +141,23 @@ export default function ExplorePage() {
       setError(err.response?.data?.message || 'Failed to load matches. Make sure backend is running.');
     } finally {
       setLoading(false);
+      setLoadingMore(false);
+    }
+  };
+
+  // One bulk check per page of cards instead of one request per card
+  const checkExisting = async (userId: string, page: MatchResult[]) => {
+    const projectIds = page.filter(r => r.type === 'project' && r.project?.id).map(r => r.project.id);
+    const recipientIds = page.filter(r => r.type !== 'project' && r.profile?.user_id).map(r => r.profile.user_id);
+    try {
+      const [applied, requested] = await Promise.all([
+        projectIds.length ? checkExistingApplications(userId, projectIds) : null,
+        recipientIds.length ? checkMentorshipRequestsExist(userId, recipientIds) : null,
+      ]);
+      if (applied) setApplications(prev => ({ ...prev, ...applied.data.data }));
+      if (requested) setPendingRequests(prev => ({ ...prev, ...requested.data.data }));
+    } catch (err) {
+      console.error('Error checking existing applications and requests:', err);
     }
   };
 
@@ -173,7 +205,7 @@ export default function ExplorePage() {
         <div className="text-center text-red-600">
           <p className="text-lg font-semibold mb-2">{error}</p>
           <button 
-            onClick={fetchMatches}
+            onClick={() => fetchMatches()}
             className="mt-4 px-4 py-2 bg-blue-600 text-white rounded-lg hover:bg-blue-700"
           >
             Try Again
@@ -267,7 +299,11 @@ export default function ExplorePage() {
         {/* Results Count */}
         <div className="mb-6 flex items-center gap-2 text-gray-700">
           <Users className="w-5 h-5" />
-          <span className="font-medium">{filteredResults.length} matches found</span>
+          <span className="font-medium">
+            {filteredResults.length === results.length
+              ? `Showing ${results.length} of ${total} matches`
+              : `${filteredResults.length} of ${results.length} loaded matches shown`}
+          </span>
         </div>
 
         {/* Results Grid */}
@@ -382,12 +418,21 @@ export default function ExplorePage() {
                         >
                           View Profile
                         </button>
-                        <button 
-                          onClick={() => handleMentorshipAction(result)}
-                          className="flex-1 bg-green-600 hover:bg-green-700 text-white px-4 py-2 rounded-lg text-sm font-medium transition-colors"
-                        >
-                          {result.type === 'student' ? 'Offer Mentorship' : 'Request Mentorship'}
-                        </button>
+                        {pendingRequests[result.profile?.user_id] ? (
+                          <button
+                            disabled
+                            className="flex-1 bg-gray-200 text-gray-600 px-4 py-2 rounded-lg text-sm font-medium cursor-not-allowed"
+                          >
+                            Request Pending
+                          </button>
+                        ) : (
+                          <button 
+                            onClick={() => handleMentorshipAction(result)}
+                            className="flex-1 bg-green-600 hover:bg-green-700 text-white px-4 py-2 rounded-lg text-sm font-medium transition-colors"
+                          >
+                            {result.type === 'student' ? 'Offer Mentorship' : 'Request Mentorship'}
+                          </button>
+                        )}
                       </div>
                     </div>
                   </>
@@ -470,12 +515,21 @@ export default function ExplorePage() {
                         >
                           View Details
                         </button>
-                        <button 
-                          onClick={() => handleApplyToProject(result.project?.id)}
-                          className="flex-1 bg-green-600 hover:bg-green-700 text-white px-4 py-2 rounded-lg text-sm font-medium transition-colors"
-                        >
-                          Apply to Project
-                        </button>
+                        {applications[result.project?.id] ? (
+                          <button
+                            disabled
+                            className="flex-1 bg-gray-200 text-gray-600 px-4 py-2 rounded-lg text-sm font-medium cursor-not-allowed"
+                          >
+                            Applied
+                          </button>
+                        ) : (
+                          <button 
+                            onClick={() => handleApplyToProject(result.project?.id)}
+                            className="flex-1 bg-green-600 hover:bg-green-700 text-white px-4 py-2 rounded-lg text-sm font-medium transition-colors"
+                          >
+                            Apply to Project
+                          </button>
+                        )}
                       </div>
                     </div>
                   </>
@@ -484,6 +538,19 @@ export default function ExplorePage() {
             ))}
           </div>
         )}
+
+        {/* Load More */}
+        {nextCursor && (
+          <div className="mt-8 text-center">
+            <button
+              onClick={() => fetchMatches(nextCursor)}
+              disabled={loadingMore}
+              className="px-6 py-2 bg-white border border-gray-300 text-gray-700 rounded-lg hover:bg-gray-50 disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : 'Load More'}
+            </button>
+          </div>
+        )}
       </div>
 
       {/* Mentorship Request Modal */}
@@ -494,6 +561,7 @@ export default function ExplorePage() {
         recipientName={mentorshipModal.recipientName}
         recipientType={mentorshipModal.recipientType}
         requestType={mentorshipModal.requestType}
+        onSent={() => setPendingRequests(prev => ({ ...prev, [mentorshipModal.recipientId]: true }))}
       />
     </div>
   );
@@ -22,27 +22,52 @@ interface MentorshipRequest {
   };
 }
 
+type Direction = 'received' | 'sent';
+type StatusCounts = Record<Direction, { total: number; pending: number; accepted: number; rejected: number; cancelled: number }>;
+
+const PAGE_SIZE = 20;
+
 export default function MentorshipRequestsPage() {
-  const [sentRequests, setSentRequests] = useState<MentorshipRequest[]>([]);
-  const [receivedRequests, setReceivedRequests] = useState<MentorshipRequest[]>([]);
+  const [sentRequests, setSentRequests] = useState<MentorshipRequest[] | null>(null);
+  const [receivedRequests, setReceivedRequests] = useState<MentorshipRequest[] | null>(null);
+  const [nextCursors, setNextCursors] = useState<Record<Direction, string | null>>({ received: null, sent: null });
+  const [counts, setCounts] = useState<StatusCounts | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
-  const [activeTab, setActiveTab] = useState<'received' | 'sent'>('received');
+  const [activeTab, setActiveTab] = useState<Direction>('received');
   const [successMessage, setSuccessMessage] = useState('');
 
   useEffect(() => {
-    fetchRequests();
+    fetchRequests('received');
   }, []);
 
-  const fetchRequests = async () => {
+  useEffect(() => {
+    // Each tab is fetched the first time it is opened
+    if (activeTab === 'sent' && sentRequests === null) {
+      fetchRequests('sent');
+    }
+  }, [activeTab]);
+
+  const fetchRequests = async (direction: Direction, cursor?: string) => {
     try {
-      setLoading(true);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
       const userData = JSON.parse(localStorage.getItem('user') || '{}');
-      const response = await getUserMentorshipRequests(userData.id);
+      const response = await getUserMentorshipRequests(userData.id, { direction, limit: PAGE_SIZE, cursor });
       
       if (response.data.status === 'success') {
-        setSentRequests(response.data.data.sent || []);
-        setReceivedRequests(response.data.data.received || []);
+        const page: MentorshipRequest[] = response.data.data[direction] || [];
+        const setRequests = direction === 'sent' ? setSentRequests : setReceivedRequests;
+        setRequests(prev => (cursor ? [...(prev || []), ...page] : page));
+        setNextCursors(prev => ({ ...prev, [direction]: response.data.next_cursor }));
+        // Only first pages carry counts
+        if (response.data.counts) {
+          setCounts(response.data.counts);
+        }
       } else {
         setError('Failed to load requests');
       }
@@ -51,6 +76,7 @@ export default function MentorshipRequestsPage() {
       setError('Failed to load mentorship requests');
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -67,7 +93,7 @@ export default function MentorshipRequestsPage() {
         );
         
         // Refresh the list
-        fetchRequests();
+        fetchRequests('received');
         
         // Clear message after 3 seconds
         setTimeout(() => setSuccessMessage(''), 3000);
@@ -89,6 +115,10 @@ export default function MentorshipRequestsPage() {
     );
   }
 
+  const receivedList = receivedRequests || [];
+  const sentList = sentRequests || [];
+  const activeCursor = nextCursors[activeTab];
+
   const renderRequest = (request: MentorshipRequest, isReceived: boolean) => {
     const otherUser = isReceived ? request.requester : request.recipient;
     const isPending = request.status === 'pending';
@@ -211,7 +241,7 @@ export default function MentorshipRequestsPage() {
                   : 'text-gray-500 hover:text-gray-700'
               }`}
             >
-              Received ({receivedRequests.filter(r => r.status === 'pending').length})
+              Received ({counts ? counts.received.pending : 0})
             </button>
             <button
               onClick={() => setActiveTab('sent')}
@@ -221,7 +251,7 @@ export default function MentorshipRequestsPage() {
                   : 'text-gray-500 hover:text-gray-700'
               }`}
             >
-              Sent ({sentRequests.length})
+              Sent ({counts ? counts.sent.total : 0})
             </button>
           </div>
         </div>
@@ -232,7 +262,7 @@ export default function MentorshipRequestsPage() {
             <p className="text-red-600">{error}</p>
           </div>
         ) : activeTab === 'received' ? (
-          receivedRequests.length === 0 ? (
+          receivedList.length === 0 ? (
             <div className="text-center py-12 bg-white rounded-lg shadow">
               <Mail className="w-16 h-16 text-gray-400 mx-auto mb-4" />
               <h3 className="text-lg font-medium text-gray-900 mb-2">No requests received</h3>
@@ -242,11 +272,11 @@ export default function MentorshipRequestsPage() {
             </div>
           ) : (
             <div>
-              {receivedRequests.map(request => renderRequest(request, true))}
+              {receivedList.map(request => renderRequest(request, true))}
             </div>
           )
         ) : (
-          sentRequests.length === 0 ? (
+          sentList.length === 0 ? (
             <div className="text-center py-12 bg-white rounded-lg shadow">
               <Mail className="w-16 h-16 text-gray-400 mx-auto mb-4" />
               <h3 className="text-lg font-medium text-gray-900 mb-2">No requests sent</h3>
@@ -256,10 +286,23 @@ export default function MentorshipRequestsPage() {
             </div>
           ) : (
             <div>
-              {sentRequests.map(request => renderRequest(request, false))}
+              {sentList.map(request => renderRequest(request, false))}
             </div>
           )
         )}
+
+        {/* Load More */}
+        {!error && activeCursor && (
+          <div className="text-center">
+            <button
+              onClick={() => fetchRequests(activeTab, activeCursor)}
+              disabled={loadingMore}
+              className="px-6 py-2 bg-white border border-gray-200 text-gray-700 rounded-lg text-sm font-medium hover:shadow transition-colors disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : 'Load More'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { getUserProjects, getProjectStats, deleteProject } from '../services/api';
+import { getUserProjects, deleteProject } from '../services/api';
 import { useAuth } from '../contexts/AuthContext';
 import { useNavigate } from 'react-router-dom';
 
@@ -14,6 +14,7 @@ interface Project {
   created_at: string;
   duration: string;
   student_count_needed: number;
+  application_stats?: ProjectStats;
 }
 
 interface ProjectStats {
@@ -39,14 +40,18 @@ const MyProjects: React.FC = () => {
 
   const fetchProjects = async () => {
     try {
-      const response = await getUserProjects(user!.id);
-      const userProjects = response.data.data;
+      // Application stats come back with the projects in the same request
+      const response = await getUserProjects(user!.id, { with_stats: true });
+      const userProjects: Project[] = response.data.data;
       setProjects(userProjects);
       
-      // Fetch stats for each project
-      userProjects.forEach((project: Project) => {
-        fetchProjectStats(project.id);
+      const stats: { [key: string]: ProjectStats } = {};
+      userProjects.forEach(project => {
+        if (project.application_stats) {
+          stats[project.id] = project.application_stats;
+        }
       });
+      setProjectStats(stats);
       
       setLoading(false);
     } catch (error) {
@@ -55,15 +60,6 @@ const MyProjects: React.FC = () => {
     }
   };
 
-  const fetchProjectStats = async (projectId: string) => {
-    try {
-      const response = await getProjectStats(projectId);
-      setProjectStats(prev => ({ ...prev, [projectId]: response.data.data }));
-    } catch (error) {
-      console.error('Error fetching project stats:', error);
-    }
-  };
-
   const handleDeleteProject = async (projectId: string, projectTitle: string) => {
     if (!window.confirm(`Are you sure you want to delete "${projectTitle}"? This action cannot be undone.`)) {
       return;
@@ -37,6 +37,8 @@ interface Application {
   };
 }
 
+const PAGE_SIZE = 50;
+
 const ReceivedApplications: React.FC = () => {
   const { user } = useAuth();
   const navigate = useNavigate();
@@ -45,6 +47,8 @@ const ReceivedApplications: React.FC = () => {
   const [applications, setApplications] = useState<Application[]>([]);
   const [loading, setLoading] = useState(true);
   const [updating, setUpdating] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     if (user) {
@@ -75,12 +79,16 @@ const ReceivedApplications: React.FC = () => {
     }
   };
 
-  const fetchApplications = async (projectId: string) => {
+  const fetchApplications = async (projectId: string, cursor?: string) => {
+    if (cursor) setLoadingMore(true);
     try {
-      const response = await getProjectApplications(projectId);
-      setApplications(response.data.data);
+      const response = await getProjectApplications(projectId, { limit: PAGE_SIZE, cursor });
+      setApplications(prev => cursor ? [...prev, ...response.data.data] : response.data.data);
+      setNextCursor(response.data.next_cursor);
     } catch (error) {
       console.error('Error fetching applications:', error);
+    } finally {
+      setLoadingMore(false);
     }
   };
 
@@ -88,8 +96,8 @@ const ReceivedApplications: React.FC = () => {
     setUpdating(applicationId);
     try {
       await updateApplicationStatus(applicationId, newStatus);
-      // Refresh applications
-      fetchApplications(selectedProject);
+      // Update in place so pages already loaded stay loaded
+      setApplications(prev => prev.map(a => a.id === applicationId ? { ...a, status: newStatus } : a));
     } catch (error) {
       console.error('Error updating status:', error);
     } finally {
@@ -493,6 +501,19 @@ const ReceivedApplications: React.FC = () => {
                     </div>
                   </div>
                 ))}
+
+                {/* Load More */}
+                {nextCursor && (
+                  <div className="text-center">
+                    <button
+                      onClick={() => fetchApplications(selectedProject, nextCursor)}
+                      disabled={loadingMore}
+                      className="px-8 py-3 bg-white border border-gray-200 text-gray-700 rounded-xl font-semibold hover:shadow-lg transition-all duration-200 disabled:opacity-50"
+                    >
+                      {loadingMore ? 'Loading...' : 'Load More Applications'}
+                    </button>
+                  </div>
+                )}
               </div>
             )}
           </>
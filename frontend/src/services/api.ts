@@ -61,38 +61,51 @@ export const checkProfileExists = (userType: string, userId: string) => api.get(
 // ============================================
 // EXPLORE / MATCHING API
 // ============================================
-export const getExploreMatches = (userId: string) => api.get(`/explore?user_id=${userId}`);
+export const getExploreMatches = (userId: string, params?: { limit?: number; min_score?: number; cursor?: string }) =>
+  api.get('/explore', { params: { user_id: userId, ...params } });
 
 // ============================================
 // PROJECT API
 // ============================================
 export const createProject = (data: any) => api.post('/projects', data);
 export const getProjects = (params?: any) => api.get('/projects', { params });
+export const getProjectDomains = () => api.get('/projects/domains');
 export const getProject = (projectId: string) => api.get(`/projects/${projectId}`);
-export const getUserProjects = (userId: string) => api.get(`/projects/user/${userId}`);
+export const getUserProjects = (userId: string, params?: { with_stats?: boolean }) =>
+  api.get(`/projects/user/${userId}`, { params });
 export const getProjectOwner = (projectId: string) => api.get(`/projects/${projectId}/owner`);
 export const updateProject = (projectId: string, data: any) => api.put(`/projects/${projectId}`, data);
 export const deleteProject = (projectId: string) => api.delete(`/projects/${projectId}`);
 export const getProjectStats = (projectId: string) => api.get(`/projects/${projectId}/stats`);
+export const getProjectsStats = (params: { creator_id?: string; project_ids?: string[] }) =>
+  api.post('/projects/stats', params);
 
 // ============================================
 // APPLICATION API
 // ============================================
 export const createApplication = (data: any) => api.post('/applications', data);
 export const getUserApplications = (userId: string) => api.get(`/applications/user/${userId}`);
-export const getProjectApplications = (projectId: string) => api.get(`/applications/project/${projectId}`);
+export const getProjectApplications = (projectId: string, params?: { status?: string; limit?: number; cursor?: string }) =>
+  api.get(`/applications/project/${projectId}`, { params });
 export const updateApplicationStatus = (applicationId: string, status: string) => api.put(`/applications/${applicationId}/status`, { status });
 export const checkExistingApplication = (projectId: string, userId: string) => api.get(`/applications/check/${projectId}/${userId}`);
+export const checkExistingApplications = (userId: string, projectIds: string[]) =>
+  api.post('/applications/check', { user_id: userId, project_ids: projectIds });
 
 // ============================================
 // MENTORSHIP REQUEST API
 // ============================================
 export const createMentorshipRequest = (data: any) => api.post('/mentorship-requests', data);
-export const getUserMentorshipRequests = (userId: string) => api.get(`/mentorship-requests/user/${userId}`);
+export const getUserMentorshipRequests = (
+  userId: string,
+  params?: { direction?: 'sent' | 'received' | 'all'; status?: string; limit?: number; cursor?: string }
+) => api.get(`/mentorship-requests/user/${userId}`, { params });
 export const updateMentorshipRequestStatus = (requestId: string, status: string) => 
   api.put(`/mentorship-requests/${requestId}/status`, { status });
 export const checkMentorshipRequestExists = (requesterId: string, recipientId: string) => 
   api.get(`/mentorship-requests/check/${requesterId}/${recipientId}`);
+export const checkMentorshipRequestsExist = (requesterId: string, recipientIds: string[]) =>
+  api.post('/mentorship-requests/check', { requester_id: requesterId, recipient_ids: recipientIds });
 
 // ============================================
 // DASHBOARD STATS API